@@ -0,0 +1,286 @@
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, TextIO, Tuple
+import numpy as np
+from constants import *
+from metrics import StageRing
+
+
+class AllocationBudgetExceeded(AssertionError):
+    """Raised by AllocationTracker.assert_budgets() when a stage is over budget."""
+
+
+class GCMonitor:
+    """
+    Times garbage collector pauses through gc.callbacks.
+
+    Each pause is attributed to the frame stage that was running, since a
+    collection is triggered by whatever code happens to allocate next.
+    """
+    def __init__(self) -> None:
+        self.pauses: List[Tuple[int, int, int, str]] = []  # (generation, ns, collected, stage)
+        self.stage = "idle"
+        self.started_at = 0
+
+    def install(self) -> None:
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self) -> None:
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self.started_at = time.perf_counter_ns()
+        else:
+            self.pauses.append((info["generation"], time.perf_counter_ns() - self.started_at,
+                                info["collected"], self.stage))
+
+    def stats(self) -> Dict[int, Dict[str, float]]:
+        """
+        Pause statistics per generation, in milliseconds.
+
+        Returns:
+            Dict[int, Dict[str, float]]: count, total, p99 and max per generation.
+        """
+        result = {}
+        for generation in range(3):
+            durations = np.array([ns for gen, ns, _, _ in self.pauses if gen == generation], dtype=np.float64) / 1e6
+            if len(durations):
+                result[generation] = {"count": len(durations), "total": float(durations.sum()),
+                                      "p99": float(np.percentile(durations, 99)), "max": float(durations.max())}
+        return result
+
+
+class AllocationTracker:
+    """
+    Per-stage allocation profiling with tracemalloc.
+
+    For each stage it records the transient high-water mark (peak bytes
+    above the stage's starting point) and the bytes still held at its end.
+    Every `snapshot_interval` frames the whole frame is diffed by call site
+    to find where retained memory comes from.
+
+    tracemalloc only sees the Python allocator and libraries that report to
+    it (NumPy does); pixel buffers SDL allocates for Surfaces are invisible.
+    It is also process-wide, so background threads (startup loaders, the
+    analytics writer) are charged to whichever stage is running.
+
+    It is driven by FrameMetrics (attach with `metrics.allocations = tracker`),
+    so the stages are the same laps as the timing spans. Tracing slows the
+    loop down considerably, so it is meant for profiling runs and tests.
+    """
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, snapshot_interval: int = ALLOC_SNAPSHOT_INTERVAL,
+                 trace_depth: int = ALLOC_TRACE_DEPTH, capacity: int = METRICS_CAPACITY) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            budgets (Dict[str, int]): Max transient bytes per stage (p95 over frames).
+            snapshot_interval (int): Frames between call-site snapshots (0 disables them).
+            trace_depth (int): Stack frames stored per allocation.
+            capacity (int): Frames kept per stage.
+        """
+        self.budgets = ALLOCATION_BUDGETS if budgets is None else budgets
+        self.snapshot_interval = snapshot_interval
+        self.trace_depth = trace_depth
+        self.capacity = capacity
+        self.gc = GCMonitor()
+        self.transient: Dict[str, StageRing] = {}
+        self.retained: Dict[str, StageRing] = {}
+        self.sites_bytes: Counter = Counter()
+        self.sites_count: Counter = Counter()
+        self.sampled_frames = 0
+        self.frames = 0
+        self.stage_start = 0
+        self.frame_start = 0
+        self.frame_peak = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> "AllocationTracker":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_depth)
+        self.gc.install()
+        return self
+
+    def stop(self) -> None:
+        self.gc.uninstall()
+        tracemalloc.stop()
+
+    def _record(self, rings: Dict[str, StageRing], stage: str, value: int) -> None:
+        ring = rings.get(stage)
+        if ring is None:
+            ring = rings[stage] = StageRing(self.capacity)
+        ring.add(value)
+
+    def begin_frame(self) -> None:
+        # Frame 0 is skipped: it allocates the stage rings themselves
+        if self.snapshot_interval and self.frames and self.frames % self.snapshot_interval == 0:
+            self.snapshot = tracemalloc.take_snapshot()
+        # Read after the snapshot so its own memory is part of the baseline
+        self.frame_start = self.stage_start = tracemalloc.get_traced_memory()[0]
+        self.frame_peak = 0
+        tracemalloc.reset_peak()
+        self.gc.stage = "events"
+
+    def lap(self, stage: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self._record(self.transient, stage, peak - self.stage_start)
+        self._record(self.retained, stage, current - self.stage_start)
+        self.frame_peak = max(self.frame_peak, peak - self.frame_start)
+        self.stage_start = current
+        self.gc.stage = stage  # Collections from here on are charged to the next lap's stage
+        tracemalloc.reset_peak()
+
+    def end_frame(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        self._record(self.transient, "frame", max(self.frame_peak, peak - self.frame_start))
+        self._record(self.retained, "frame", current - self.frame_start)
+        self.frames += 1
+        if self.snapshot is not None:
+            after = tracemalloc.take_snapshot()
+            ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            for diff in after.filter_traces(ignore).compare_to(self.snapshot.filter_traces(ignore), "traceback"):
+                if diff.size_diff > 0:
+                    # Innermost frame first
+                    site = " <- ".join(f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+                                       for frame in reversed(diff.traceback))
+                    self.sites_bytes[site] += diff.size_diff
+                    self.sites_count[site] += max(0, diff.count_diff)
+            self.sampled_frames += 1
+            self.snapshot = None
+
+    def stage_stats(self, stage: str) -> Dict[str, float]:
+        """
+        Bytes per frame for one stage.
+
+        Returns:
+            Dict[str, float]: transient p50/p95/max and mean retained bytes.
+        """
+        transient = self.transient[stage].window()
+        retained = self.retained[stage].window()
+        p50, p95 = np.percentile(transient, (50, 95))
+        return {"p50": float(p50), "p95": float(p95), "max": float(transient.max()),
+                "retained": float(retained.mean())}
+
+    def top_sites(self, limit: int = 10) -> List[Tuple[str, float, float]]:
+        """Call sites that retained the most memory, as (site, bytes per frame, blocks per frame)."""
+        frames = max(1, self.sampled_frames)
+        return [(site, size / frames, self.sites_count[site] / frames)
+                for site, size in self.sites_bytes.most_common(limit)]
+
+    def check_budgets(self) -> List[str]:
+        """
+        Compares each budgeted stage's p95 transient bytes with its budget.
+
+        Returns:
+            List[str]: One message per stage over budget (empty if all fit).
+        """
+        violations = []
+        for stage, budget in self.budgets.items():
+            if stage in self.transient:
+                p95 = self.stage_stats(stage)["p95"]
+                if p95 > budget:
+                    violations.append(f"{stage}: p95 {p95 / 1024:.1f} KiB > budget {budget / 1024:.1f} KiB")
+        return violations
+
+    def assert_budgets(self) -> None:
+        violations = self.check_budgets()
+        if violations:
+            raise AllocationBudgetExceeded("; ".join(violations))
+
+    def report(self, out: TextIO = sys.stderr, limit: int = 10) -> None:
+        """Writes per-stage bytes, GC pauses and the top call sites."""
+        out.write(f"allocations: {self.frames} frames traced\n")
+        out.write(f"{'stage':<16}{'p50 KiB':>10}{'p95 KiB':>10}{'max KiB':>10}{'kept KiB':>10}{'budget':>10}\n")
+        for stage in self.transient:
+            s = self.stage_stats(stage)
+            budget = self.budgets.get(stage)
+            out.write(f"{stage:<16}{s['p50'] / 1024:10.1f}{s['p95'] / 1024:10.1f}{s['max'] / 1024:10.1f}"
+                      f"{s['retained'] / 1024:10.2f}{budget / 1024 if budget else float('nan'):10.1f}\n")
+        for generation, s in self.gc.stats().items():
+            out.write(f"gc gen{generation}: {s['count']} pauses, total {s['total']:.2f} ms, "
+                      f"p99 {s['p99']:.3f} ms, max {s['max']:.3f} ms\n")
+        by_stage = Counter(stage for _, _, _, stage in self.gc.pauses)
+        if by_stage:
+            out.write("gc pauses by stage: " + ", ".join(f"{stage} {n}" for stage, n in by_stage.most_common()) + "\n")
+        if self.sampled_frames:
+            out.write(f"retained per frame by call site ({self.sampled_frames} sampled frames):\n")
+            for site, size, count in self.top_sites(limit):
+                out.write(f"  {size:10.0f} B {count:8.1f} blocks  {site}\n")
+
+
+def main() -> None:
+    # Headless check of the render/logic stages against the declared budgets
+    from frame_clock import FrameClock, ManualTimeSource
+    from game_state import TowerOfHanoiGame
+    from layout import get_layout
+    from metrics import FrameMetrics
+    from particles import ParticleSystem
+    from render_bench import SCENES, camera_frame
+    from ui_renderer import GameRenderer
+
+    parser = argparse.ArgumentParser(description="Per-stage allocation profile of the headless frame loop.")
+    parser.add_argument("scenes", nargs="*", help=f"Scenes to run (default: all of {', '.join(SCENES)})")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    parser.add_argument("--warmup", type=int, default=BENCH_WARMUP_FRAMES)
+    parser.add_argument("--backend", default=RENDER_BACKEND, choices=("surface", "texture"))
+    args = parser.parse_args()
+
+    renderer = GameRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, backend=args.backend, headless=True)
+    layout = get_layout(SCREEN_WIDTH, SCREEN_HEIGHT)
+    failed = False
+    for name in args.scenes or list(SCENES):
+        scene = SCENES[name]
+        renderer.particles = ParticleSystem(seed=BENCH_SEED)
+        time_source = ManualTimeSource()
+        clock = FrameClock(time_source)
+        game = TowerOfHanoiGame(scene.num_disks, clock)
+        subscription = game.events.subscribe(renderer.on_event)
+        scene.setup(game)
+        frames = [camera_frame(i) for i in range(4)]
+
+        metrics = FrameMetrics()
+        tracker = AllocationTracker()
+        for frame in range(args.warmup + args.frames):
+            if frame == args.warmup:
+                # Caches are warm; measure the steady state only
+                tracker.start()
+                metrics.allocations = tracker
+            t = metrics.begin_frame()
+            time_source.advance(1.0 / FPS)
+            clock.tick()
+            renderer.prepare_camera_surface(frames[frame % len(frames)])
+            t = metrics.lap("camera_surface", t)
+            while clock.step():
+                game.step(clock.fixed_dt)
+            if game.game_started and not game.game_won and game.hand_position is not None:
+                x, y = game.hand_position
+                game.update_interaction([(x, y - 10), (x, y + 10), (x, y + 150)], layout)
+            if scene.update is not None:
+                scene.update(game, frame)
+            t = metrics.lap("logic", t)
+            game.events.dispatch()
+            t = metrics.lap("dispatch", t)
+            renderer.render(game)
+            t = metrics.lap("render", t)
+            metrics.end_frame(t)
+        tracker.stop()
+        game.events.unsubscribe(subscription)
+
+        print(f"--- {name}")
+        tracker.report(sys.stdout)
+        violations = tracker.check_budgets()
+        for violation in violations:
+            print(f"OVER BUDGET {violation}")
+        failed = failed or bool(violations)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
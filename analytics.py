@@ -0,0 +1,389 @@
+import os
+import math
+import sys
+import time
+import uuid
+import queue
+import sqlite3
+import platform
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from constants import *
+from events import EventType, GameEvent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    device TEXT NOT NULL,
+    num_disks INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    moves INTEGER,
+    elapsed_time REAL,
+    won INTEGER NOT NULL DEFAULT 0,
+    latency_ms REAL
+);
+CREATE TABLE IF NOT EXISTS moves (
+    session_id TEXT NOT NULL REFERENCES sessions(id),
+    seq INTEGER NOT NULL,
+    disk INTEGER NOT NULL,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    move_time REAL NOT NULL,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_leaderboard ON sessions (num_disks, won, elapsed_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_device ON sessions (device);
+"""
+
+INSERT_SESSION = "INSERT OR REPLACE INTO sessions (id, device, num_disks, started_at) VALUES (?, ?, ?, ?)"
+END_SESSION = "UPDATE sessions SET ended_at = ?, moves = ?, elapsed_time = ?, won = ?, latency_ms = ? WHERE id = ?"
+INSERT_MOVE = ("INSERT OR REPLACE INTO moves (session_id, seq, disk, source, target, valid, move_time, timestamp) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+class AnalyticsStore:
+    """
+    Local SQLite (WAL mode) store for per-session and per-move metrics.
+
+    Writes are only queued by the caller; a background thread batches them
+    into transactions, so recording never blocks the frame loop.
+    """
+    def __init__(self,
+                 path: str,
+                 batch_size: int = ANALYTICS_BATCH_SIZE,
+                 flush_interval: float = ANALYTICS_FLUSH_INTERVAL,
+                 device: Optional[str] = None) -> None:
+        """
+        Initialize the store and start its writer thread.
+
+        Args:
+            path (str): SQLite database file.
+            batch_size (int): Queued writes that trigger an immediate commit.
+            flush_interval (float): Max seconds a queued write waits before commit.
+            device (str): Device name stored with each session; defaults to the host name.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.device = device or platform.node() or "unknown"
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.queue: "queue.SimpleQueue[Tuple[str, Any]]" = queue.SimpleQueue()
+        self.written: int = 0
+        self.batches: int = 0
+        self.errors: int = 0
+        self._read_conn: Optional[sqlite3.Connection] = None
+
+        # Schema is created up front so readers never see a missing table
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="analytics-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- Write API (called from the game loop, never blocks) ---
+
+    def begin_session(self, num_disks: int, started_at: Optional[float] = None) -> str:
+        """
+        Records the start of a game session.
+
+        Args:
+            num_disks (int): Disk count of the session.
+            started_at (float): Wall-clock start time; defaults to now.
+
+        Returns:
+            str: The new session id.
+        """
+        session_id = uuid.uuid4().hex
+        self.queue.put((INSERT_SESSION, (session_id, self.device, num_disks,
+                                         time.time() if started_at is None else started_at)))
+        return session_id
+
+    def record_move(self, session_id: str, seq: int, disk: int, source: int, target: int,
+                    valid: bool, move_time: float, timestamp: float) -> None:
+        """
+        Records a single drop (valid or not).
+
+        Args:
+            session_id (str): Session the move belongs to.
+            seq (int): Move number within the session.
+            disk (int): Disk that was moved.
+            source (int): Tower the disk was picked up from.
+            target (int): Tower the disk was dropped on.
+            valid (bool): Whether the drop was legal.
+            move_time (float): Pickup-to-place time in seconds.
+            timestamp (float): Time of the drop.
+        """
+        self.queue.put((INSERT_MOVE, (session_id, seq, disk, source, target, int(valid), move_time, timestamp)))
+
+    def end_session(self, session_id: str, moves: int, elapsed_time: float, won: bool,
+                    latency_ms: Optional[float] = None, ended_at: Optional[float] = None) -> None:
+        """
+        Records the end of a session.
+
+        Args:
+            session_id (str): Session to close.
+            moves (int): Valid moves made.
+            elapsed_time (float): Game time in seconds.
+            won (bool): Whether the puzzle was solved.
+            latency_ms (float): Optional mean input-to-display latency of the session's moves.
+            ended_at (float): Wall-clock end time; defaults to now.
+        """
+        self.queue.put((END_SESSION, (time.time() if ended_at is None else ended_at, moves, elapsed_time,
+                                      int(won), latency_ms, session_id)))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Blocks until everything queued so far is committed. Not for the frame loop.
+
+        Returns:
+            bool: True if the writer caught up within the timeout.
+        """
+        done = threading.Event()
+        self.queue.put(("__flush__", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Commits pending writes and stops the writer thread."""
+        if self._writer.is_alive():
+            self.queue.put(("__close__", None))
+            self._writer.join(timeout)
+        if self._read_conn is not None:
+            self._read_conn.close()
+            self._read_conn = None
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        pending: List[Tuple[str, Any]] = []
+        deadline = 0.0
+        running = True
+
+        while running:
+            try:
+                timeout = max(0.0, deadline - time.monotonic()) if pending else None
+                sql, params = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                sql, params = "", None
+
+            waiters = []
+            if sql == "__close__":
+                running = False
+            elif sql == "__flush__":
+                waiters.append(params)
+            elif sql:
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append((sql, params))
+                if len(pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            # Drain anything else already queued into the same batch
+            while running and len(pending) < self.batch_size:
+                try:
+                    sql, params = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if sql == "__close__":
+                    running = False
+                elif sql == "__flush__":
+                    waiters.append(params)
+                else:
+                    pending.append((sql, params))
+
+            if pending:
+                self._commit(conn, pending)
+                pending = []
+            for waiter in waiters:
+                waiter.set()
+
+        conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, pending: List[Tuple[str, Any]]) -> None:
+        try:
+            with conn:
+                # Consecutive writes of the same statement become one executemany
+                start = 0
+                for i in range(1, len(pending) + 1):
+                    if i == len(pending) or pending[i][0] != pending[start][0]:
+                        conn.executemany(pending[start][0], [params for _, params in pending[start:i]])
+                        start = i
+            self.written += len(pending)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Analytics write failed: {e}", file=sys.stderr)
+
+    # --- Queries (read connection of the calling thread) ---
+
+    def _reader(self) -> sqlite3.Connection:
+        if self._read_conn is None:
+            self._read_conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            self._read_conn.row_factory = sqlite3.Row
+        return self._read_conn
+
+    def leaderboard(self, num_disks: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Fastest solved sessions for a disk count.
+
+        Args:
+            num_disks (int): Disk count to rank.
+            limit (int): Number of entries to return.
+
+        Returns:
+            List[Dict[str, Any]]: Rows with device, elapsed_time, moves and ended_at.
+        """
+        rows = self._reader().execute(
+            "SELECT device, elapsed_time, moves, ended_at FROM sessions "
+            "WHERE num_disks = ? AND won = 1 ORDER BY elapsed_time LIMIT ?",
+            (num_disks, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def percentiles(self, num_disks: int, quantiles: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[float, float]:
+        """
+        Solve-time percentiles for a disk count (nearest-rank, index-only scans).
+
+        Args:
+            num_disks (int): Disk count to summarize.
+            quantiles (Sequence[float]): Quantiles in the range 0..1.
+
+        Returns:
+            Dict[float, float]: Solve time in seconds per quantile; empty if no data.
+        """
+        conn = self._reader()
+        count = conn.execute("SELECT COUNT(*) FROM sessions WHERE num_disks = ? AND won = 1",
+                             (num_disks,)).fetchone()[0]
+        result: Dict[float, float] = {}
+        if count == 0:
+            return result
+        for q in quantiles:
+            offset = min(count - 1, max(0, math.ceil(q * count) - 1))
+            result[q] = conn.execute(
+                "SELECT elapsed_time FROM sessions WHERE num_disks = ? AND won = 1 "
+                "ORDER BY elapsed_time LIMIT 1 OFFSET ?", (num_disks, offset)).fetchone()[0]
+        return result
+
+    def device_breakdown(self) -> List[Dict[str, Any]]:
+        """
+        Per-device session counts, solve rate, move time and latency.
+
+        Returns:
+            List[Dict[str, Any]]: One row per device.
+        """
+        rows = self._reader().execute(
+            "SELECT s.device, COUNT(DISTINCT s.id) AS sessions, AVG(s.won) AS win_rate, "
+            "AVG(s.latency_ms) AS latency_ms, "
+            "(SELECT AVG(m.move_time) FROM moves m JOIN sessions s2 ON s2.id = m.session_id "
+            " WHERE s2.device = s.device AND m.valid = 1) AS move_time, "
+            "(SELECT AVG(1 - m.valid) FROM moves m JOIN sessions s2 ON s2.id = m.session_id "
+            " WHERE s2.device = s.device) AS invalid_rate "
+            "FROM sessions s GROUP BY s.device ORDER BY sessions DESC").fetchall()
+        return [dict(row) for row in rows]
+
+
+class SessionRecorder:
+    """
+    Event bus subscriber that turns game events into analytics records.
+    """
+    def __init__(self, store: AnalyticsStore, game: Any) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            store (AnalyticsStore): Where records are queued.
+            game (TowerOfHanoiGame): Game whose events are recorded (read for disk count and moves).
+        """
+        self.store = store
+        self.game = game
+        self.session_id: Optional[str] = None
+        self.move_seq: int = 0
+        self.undisplayed_moves: int = 0  # Moves dispatched this frame, not yet on screen
+        self.latency_total: float = 0.0
+        self.latency_count: int = 0
+
+    def on_event(self, event: GameEvent) -> None:
+        if event.kind == EventType.GAME_START:
+            self.end_session(won=False)
+            self.session_id = self.store.begin_session(self.game.num_disks)
+            self.move_seq = 0
+            self.undisplayed_moves = 0
+            self.latency_total, self.latency_count = 0.0, 0
+        elif self.session_id is None:
+            return
+        elif event.kind in (EventType.DROP_VALID, EventType.DROP_INVALID):
+            self.move_seq += 1
+            self.store.record_move(self.session_id, self.move_seq, event.disk, event.source, event.tower,
+                                   event.kind == EventType.DROP_VALID, event.duration, time.time())
+            self.undisplayed_moves += 1
+        elif event.kind == EventType.WIN:
+            self.end_session(won=True, elapsed_time=event.duration)
+        elif event.kind == EventType.RESET:
+            self.end_session(won=False)
+
+    def frame_displayed(self, latency_ms: float) -> None:
+        """
+        Attributes a frame's input-to-display latency to the moves it showed.
+
+        Called by the game loop once the frame is on screen; the moves whose
+        events were dispatched in that frame are the ones the frame displayed.
+
+        Args:
+            latency_ms (float): Camera read to display update, in milliseconds.
+        """
+        if self.undisplayed_moves:
+            self.latency_total += latency_ms * self.undisplayed_moves
+            self.latency_count += self.undisplayed_moves
+            self.undisplayed_moves = 0
+
+    def end_session(self, won: bool, elapsed_time: Optional[float] = None) -> None:
+        """Closes the active session, if any (abandoned sessions are stored with won=0)."""
+        if self.session_id is None:
+            return
+        if elapsed_time is None:
+            elapsed_time = self.game.elapsed_time
+        latency_ms = self.latency_total / self.latency_count if self.latency_count else None
+        self.store.end_session(self.session_id, self.game.moves, elapsed_time, won, latency_ms)
+        self.session_id = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the local Tower of Hanoi analytics store.")
+    parser.add_argument("--db", default=os.path.join(DATA_DIR, ANALYTICS_DB_FILE), help="Database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    board = sub.add_parser("leaderboard", help="Fastest solves for a disk count")
+    board.add_argument("--disks", type=int, default=3)
+    board.add_argument("--limit", type=int, default=10)
+    pct = sub.add_parser("percentiles", help="Solve-time percentiles for a disk count")
+    pct.add_argument("--disks", type=int, default=3)
+    sub.add_parser("devices", help="Per-device breakdown")
+    args = parser.parse_args()
+
+    store = AnalyticsStore(args.db)
+    try:
+        if args.command == "leaderboard":
+            for rank, row in enumerate(store.leaderboard(args.disks, args.limit), 1):
+                print(f"{rank:>3}. {row['elapsed_time']:8.2f}s  {row['moves']:>5} moves  {row['device']}")
+        elif args.command == "percentiles":
+            for q, value in store.percentiles(args.disks).items():
+                print(f"p{q * 100:g}: {value:.2f}s")
+        else:
+            for row in store.device_breakdown():
+                print(row)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
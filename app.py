@@ -7,6 +7,7 @@ import os
 from collections import deque
 import mediapipe as mp
 import math
+from backgrounds import get_background
 
 class TowerOfHanoiGame:
     def __init__(self, num_disks=3):
@@ -311,15 +312,10 @@ class TowerOfHanoiGame:
         # Start with a transparent background
         self.screen.fill((0, 0, 0))  # Use solid black for cleaner UI
         
-        # Draw a gradient background for better aesthetics
-        for i in range(self.height):
-            gradient_color = (15, 15, max(10, min(50, 30 + i // 10)), 255)
-            pygame.draw.line(self.screen, gradient_color, (0, i), (self.width, i))
-        
-        # Add a semi-transparent overlay for better UI visibility
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((15, 15, 30, 200))  # Dark blue-black with alpha
-        self.screen.blit(overlay, (0, 0))
+        # Draw a gradient background for better aesthetics, with a
+        # semi-transparent overlay for better UI visibility (cached per size)
+        gradient_stops = ((0.0, (15, 15, 30)), (min(1.0, 200 / self.height), (15, 15, 50)), (1.0, (15, 15, 50)))
+        self.screen.blit(get_background((self.width, self.height), gradient_stops, overlay=(15, 15, 30, 200)), (0, 0))
         
         # Draw title with shadow effect
         title_shadow = self.title_font.render("Tower of Hanoi", True, (30, 30, 50))
@@ -467,13 +463,10 @@ class TowerOfHanoiGame:
             camera_label = self.small_font.render("Camera Preview", True, (200, 200, 200))
             camera_label_rect = camera_label.get_rect(center=camera_bg_rect.center)
             self.screen.blit(camera_label, camera_label_rect)
-        # Start with a transparent background
-        self.screen.fill((0, 0, 0, 0))
-        
-        # Draw a semi-transparent overlay for better UI visibility
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((15, 15, 30, 200))  # Dark blue-black with alpha
-        self.screen.blit(overlay, (0, 0))
+        # Start with a transparent background and a semi-transparent
+        # overlay for better UI visibility (cached per size)
+        flat_stops = ((0.0, (0, 0, 0)), (1.0, (0, 0, 0)))
+        self.screen.blit(get_background((self.width, self.height), flat_stops, overlay=(15, 15, 30, 200)), (0, 0))
         
         # Draw title
         title_text = self.title_font.render("Tower of Hanoi", True, (255, 255, 255))
@@ -0,0 +1,197 @@
+import io
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pygame
+from typing import Any, Callable, Dict, Optional, Tuple
+from constants import *
+
+
+class AssetCache:
+    """
+    Versioned on-disk cache for assets that are slow to build at startup.
+
+    Entries are keyed by a hash of (version, kind, parameters) and stored as
+    .npy files under <root>/v<version>/. A manifest records the SHA-256 of
+    every file, so a truncated or edited file is detected and rebuilt
+    instead of loaded. Bumping ASSET_CACHE_VERSION invalidates everything.
+    """
+    def __init__(self, root: str = ASSET_CACHE_DIR, version: int = ASSET_CACHE_VERSION,
+                 enabled: bool = True) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Cache directory.
+            version (int): Cache format/content version.
+            enabled (bool): If False, everything is built and nothing is stored.
+        """
+        self.version = version
+        self.directory = os.path.join(root, f"v{version}")
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+        self.manifest: Dict[str, Any] = {"entries": {}, "fonts": {}}
+        if enabled:
+            try:
+                with open(self.manifest_path) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                pass  # First launch or unreadable manifest: start empty
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def key(self, kind: str, params: Tuple) -> str:
+        """Stable file key for an asset."""
+        return f"{kind}-{hashlib.sha256(repr((self.version, kind, params)).encode()).hexdigest()[:20]}"
+
+    def clear(self) -> None:
+        """Deletes every cached asset (the --rebuild-cache path)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.manifest = {"entries": {}, "fonts": {}}
+
+    def save_manifest(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    def load_array(self, key: str) -> Optional[np.ndarray]:
+        """
+        Loads a cached array, verifying its content hash.
+
+        Args:
+            key (str): Entry key from key().
+
+        Returns:
+            Optional[np.ndarray]: The array, or None if missing or corrupt.
+        """
+        entry = self.manifest["entries"].get(key)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            return None
+        return np.load(io.BytesIO(data), allow_pickle=False)
+
+    def save_array(self, key: str, array: np.ndarray) -> None:
+        """
+        Stores an array and records its content hash.
+
+        Args:
+            key (str): Entry key from key().
+            array (np.ndarray): Data to store.
+        """
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        data = buffer.getvalue()
+
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = key + ".npy"
+        tmp = os.path.join(self.directory, file_name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(self.directory, file_name))
+
+        self.manifest["entries"][key] = {"file": file_name, "sha256": hashlib.sha256(data).hexdigest()}
+        self.save_manifest()
+
+    def get_array(self, kind: str, params: Tuple, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Returns a cached array, building and storing it on a miss.
+
+        Args:
+            kind (str): Asset kind (e.g. "pcm").
+            params (Tuple): Everything the asset depends on (must have a stable repr).
+            build (Callable): Produces the array on a miss.
+
+        Returns:
+            np.ndarray: The asset.
+        """
+        if not self.enabled:
+            return build()
+        key = self.key(kind, params)
+        array = self.load_array(key)
+        if array is None:
+            self.misses += 1
+            array = build()
+            self.save_array(key, array)
+        else:
+            self.hits += 1
+        return array
+
+    def get_surface(self, kind: str, params: Tuple, build: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """
+        Returns a cached opaque surface, stored as raw RGB pixels.
+
+        Args:
+            kind (str): Asset kind (e.g. "background").
+            params (Tuple): Everything the image depends on.
+            build (Callable): Renders the surface on a miss.
+
+        Returns:
+            pygame.Surface: The image (not converted to the display format).
+        """
+        def build_pixels() -> np.ndarray:
+            surface = build()
+            width, height = surface.get_size()
+            return np.frombuffer(pygame.image.tobytes(surface, "RGB"), dtype=np.uint8).reshape(height, width, 3)
+
+        pixels = self.get_array(kind, params, build_pixels)
+        height, width = pixels.shape[:2]
+        return pygame.image.frombytes(pixels.tobytes(), (width, height), "RGB")
+
+    def get_font_path(self, name: str, bold: bool = False) -> Tuple[Optional[str], bool]:
+        """
+        Resolves a system font without scanning the font list on every launch.
+
+        Args:
+            name (str): Font family name (e.g. "Arial").
+            bold (bool): Whether a bold face is wanted.
+
+        Returns:
+            Tuple[Optional[str], bool]: Font file (None for pygame's default
+            font) and whether bold must be synthesized, as SysFont would do.
+        """
+        key = f"{name.lower()}|{int(bold)}"
+        entry = self.manifest["fonts"].get(key)
+        if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+            self.hits += 1
+            return entry[0], entry[1]
+
+        # Slow path: pygame scans the installed fonts once
+        self.misses += 1
+        path = pygame.font.match_font(name, bold=bold)
+        fake_bold = bold and (path is None or path == pygame.font.match_font(name))
+        if self.enabled:
+            self.manifest["fonts"][key] = [path, fake_bold]
+            self.save_manifest()
+        return path, fake_bold
+
+    def load_font(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        """
+        Equivalent of pygame.font.SysFont(name, size, bold) using the cached font path.
+
+        Args:
+            name (str): Font family name.
+            size (int): Point size.
+            bold (bool): Bold face.
+
+        Returns:
+            pygame.font.Font: The loaded font.
+        """
+        path, fake_bold = self.get_font_path(name, bold)
+        font = pygame.font.Font(path, size)
+        if fake_bold:
+            font.set_bold(True)
+        return font
@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+from typing import Optional, Sequence, Tuple
+from constants import *
+from render_cache import LRUCache
+from asset_cache import AssetCache
+
+Stop = Tuple[float, Tuple[int, int, int]]
+
+_cache = LRUCache(BACKGROUND_CACHE_SIZE)
+
+
+def gradient_rows(height: int, stops: Sequence[Stop]) -> np.ndarray:
+    """
+    Interpolates a vertical multi-stop gradient.
+
+    Args:
+        height (int): Number of rows.
+        stops (Sequence[Stop]): (position, (r, g, b)) pairs, positions in 0..1 ascending.
+
+    Returns:
+        np.ndarray: (height, 3) float array of row colors.
+    """
+    positions = np.array([pos for pos, _ in stops], dtype=np.float64)
+    colors = np.array([color for _, color in stops], dtype=np.float64)
+    y = np.arange(height, dtype=np.float64) / max(1, height)
+    return np.stack([np.interp(y, positions, colors[:, c]) for c in range(3)], axis=1)
+
+
+def make_background(size: Tuple[int, int],
+                    stops: Sequence[Stop],
+                    grid: Optional[Tuple[int, int, int, int]] = None,
+                    grid_spacing: int = GRID_SPACING,
+                    overlay: Optional[Tuple[int, int, int, int]] = None) -> pygame.Surface:
+    """
+    Renders a background with one NumPy broadcast into the surface's packed pixels.
+
+    Args:
+        size (Tuple[int, int]): Surface size (width, height).
+        stops (Sequence[Stop]): Vertical gradient stops.
+        grid (Tuple[int, int, int, int]): Optional RGBA color of a square grid.
+        grid_spacing (int): Grid cell size in pixels.
+        overlay (Tuple[int, int, int, int]): Optional RGBA tint blended over everything.
+
+    Returns:
+        pygame.Surface: The rendered background.
+    """
+    width, height = size
+    rows = gradient_rows(height, stops)
+
+    surface = pygame.Surface(size, 0, 32)
+    shifts = surface.get_shifts()[:3]
+    alpha_mask = surface.get_masks()[3]
+
+    def finish(colors: np.ndarray) -> np.ndarray:
+        # Apply the overlay tint, quantize and pack into the surface's pixel format
+        if overlay is not None:
+            colors = colors + (np.array(overlay[:3], dtype=np.float64) - colors) * (overlay[3] / 255.0)
+        channels = colors.astype(np.uint32)
+        packed = (channels[:, 0] << shifts[0]) | (channels[:, 1] << shifts[1]) | (channels[:, 2] << shifts[2])
+        return packed | np.uint32(alpha_mask)
+
+    pixels = pygame.surfarray.pixels2d(surface)  # (width, height) view of packed pixels
+
+    # One row color broadcast over every column
+    pixels[:] = finish(rows)[np.newaxis, :]
+
+    if grid is not None:
+        # Grid lines only depend on the row color, so they are computed per
+        # row and broadcast too; crossings are blended twice like stacked lines
+        color = np.array(grid[:3], dtype=np.float64)
+        alpha = grid[3] / 255.0
+        lined = rows + (color - rows) * alpha
+        crossed = lined + (color - lined) * alpha
+        pixels[::grid_spacing, :] = finish(lined)[np.newaxis, :]
+        pixels[:, ::grid_spacing] = finish(lined[::grid_spacing])[np.newaxis, :]
+        pixels[::grid_spacing, ::grid_spacing] = finish(crossed[::grid_spacing])[np.newaxis, :]
+
+    del pixels  # Unlock the surface
+    return surface
+
+
+def get_background(size: Tuple[int, int],
+                   stops: Sequence[Stop],
+                   grid: Optional[Tuple[int, int, int, int]] = None,
+                   grid_spacing: int = GRID_SPACING,
+                   overlay: Optional[Tuple[int, int, int, int]] = None,
+                   assets: Optional[AssetCache] = None) -> pygame.Surface:
+    """
+    Cached make_background: built once per size and style.
+
+    Args:
+        assets (AssetCache): Optional on-disk cache, so later launches load
+            the pixels instead of rendering them.
+
+    Returns:
+        pygame.Surface: The shared background surface (do not draw on it).
+    """
+    key = (tuple(size), tuple(stops), grid, grid_spacing, overlay)
+    surface = _cache.get(key)
+    if surface is None:
+        if assets is not None:
+            surface = assets.get_surface("background", key,
+                                         lambda: make_background(size, stops, grid, grid_spacing, overlay))
+        else:
+            surface = make_background(size, stops, grid, grid_spacing, overlay)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _cache.put(key, surface)
+    return surface
@@ -0,0 +1,365 @@
+import os
+import sys
+import json
+import time
+import glob
+import fnmatch
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import deque
+import numpy as np
+import pygame
+from typing import Callable, Dict, List, NamedTuple, Optional
+from constants import *
+from asset_cache import AssetCache
+from frame_clock import FrameClock, ManualTimeSource
+from game_state import TowerOfHanoiGame
+from layout import get_layout
+from render_bench import SCENES, camera_frame, run_scene
+from solver import hanoi_moves, optimal_move_count
+from ui_renderer import GameRenderer
+
+
+class Benchmark(NamedTuple):
+    """
+    One entry of the suite.
+
+    run(context, repeats) returns `repeats` samples, each the time in seconds
+    for one operation of `unit`, or raises SkipBenchmark.
+    """
+    unit: str
+    run: Callable[["Context", int], List[float]]
+
+
+class SkipBenchmark(Exception):
+    """Raised when a benchmark cannot run here (e.g. MediaPipe missing)."""
+
+
+class Context:
+    """Shared state for one run: the headless renderer and options."""
+    def __init__(self, backend: str, size, frames_dir: Optional[str]) -> None:
+        self.renderer = GameRenderer(*size, backend=backend, headless=True)
+        self.backend = "texture" if self.renderer.gpu else "surface"
+        self.size = tuple(size)
+        self.frames_dir = frames_dir
+
+
+def timed(operation: Callable[[], None], ops: int, repeats: int,
+          min_time: float = BENCH_MIN_SAMPLE_TIME) -> List[float]:
+    """
+    Samples the per-op time of a fast operation.
+
+    Calls are batched so each sample takes at least `min_time`, keeping
+    timer resolution and loop overhead out of the result.
+
+    Args:
+        operation (Callable): Work for one call.
+        ops (int): Operations done by one call.
+        repeats (int): Number of samples.
+        min_time (float): Minimum seconds per sample.
+
+    Returns:
+        List[float]: Seconds per operation for each sample.
+    """
+    operation()  # Warm caches
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2
+
+    samples = [elapsed / (calls * ops)]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        samples.append((time.perf_counter() - start) / (calls * ops))
+    return samples
+
+
+# --- Game ---
+
+def bench_pickup_place(context: Context, repeats: int) -> List[float]:
+    game = TowerOfHanoiGame(3, FrameClock(ManualTimeSource()))
+
+    def moves() -> None:
+        # Disk 1 back and forth: four valid moves
+        for source, target in ((0, 2), (2, 1), (1, 2), (2, 0)):
+            game.pickup_disc(source)
+            game.place_disc(target)
+
+    return timed(moves, 4, repeats)
+
+
+def bench_update_interaction(context: Context, repeats: int) -> List[float]:
+    clock = FrameClock(ManualTimeSource())
+    game = TowerOfHanoiGame(3, clock)
+    game.start_game()
+    layout = get_layout(*context.size)
+
+    # Carry the top disk 0 -> 1 -> 2 -> 0: pinch over the source, release over
+    # the target. Every gesture is a real, legal move and the board ends
+    # where it started, so the script can repeat
+    y = context.size[1] / 2
+    script = []
+    for source, target in ((0, 1), (1, 2), (2, 0)):
+        x = layout.tower_x[source]
+        script.append([(x, y - 10), (x, y + 10), (x, y + 150)])  # Pinched
+        x = layout.tower_x[target]
+        script.append([(x, y - 80), (x, y + 80), (x, y + 150)])  # Open
+
+    def gestures() -> None:
+        for landmarks in script:
+            # Set game time directly, past the (strict) cooldown, so no clock
+            # or step work is timed along with the state machine
+            clock.time += ACTION_COOLDOWN + 1e-3
+            game.update_interaction(landmarks, layout)
+
+    return timed(gestures, len(script), repeats)
+
+
+def bench_step(context: Context, repeats: int) -> List[float]:
+    game = TowerOfHanoiGame(3, FrameClock(ManualTimeSource()))
+    game.start_game()
+    game.hand_position = (100, 100)
+    dt = game.clock.fixed_dt
+    return timed(lambda: game.step(dt), 1, repeats)
+
+
+# --- Solver ---
+
+def solver_benchmark(num_disks: int) -> Benchmark:
+    def run(context: Context, repeats: int) -> List[float]:
+        # deque(maxlen=0) drains the generator without storing moves
+        return timed(lambda: deque(hanoi_moves(num_disks), maxlen=0), optimal_move_count(num_disks), repeats)
+    return Benchmark("move", run)
+
+
+# --- Detector ---
+
+def load_frames(frames_dir: Optional[str]) -> List[np.ndarray]:
+    if frames_dir is None:
+        # No hand in these; times the no-detection path only
+        return [camera_frame(i) for i in range(0, 64, 8)]
+    import cv2
+    paths = sorted(p for ext in ("png", "jpg") for p in glob.glob(os.path.join(frames_dir, f"*.{ext}")))
+    if not paths:
+        raise SkipBenchmark(f"no .png/.jpg frames in {frames_dir}")
+    return [cv2.imread(p) for p in paths]
+
+
+def bench_process_frame(context: Context, repeats: int) -> List[float]:
+    try:
+        from hand_detector import HandDetector
+        detector = HandDetector()
+    except Exception as e:
+        raise SkipBenchmark(f"hand detector unavailable: {e}")
+    frames = load_frames(context.frames_dir)
+    detector.warm_up()
+    index = [0]
+
+    def detect() -> None:
+        # A copy, since process_frame draws on the frame
+        detector.process_frame(frames[index[0] % len(frames)].copy())
+        index[0] += 1
+
+    return timed(detect, 1, repeats)
+
+
+# --- Renderer ---
+
+def bench_prepare_camera_surface(context: Context, repeats: int) -> List[float]:
+    frame = camera_frame(0)
+    return timed(lambda: context.renderer.prepare_camera_surface(frame), 1, repeats)
+
+
+def render_benchmark(scene: str) -> Benchmark:
+    def run(context: Context, repeats: int) -> List[float]:
+        # Frame times of a scripted scene (render_bench); one sample per frame
+        times, _ = run_scene(context.renderer, SCENES[scene], frames=max(repeats, BENCH_FRAMES))
+        return [t / 1e3 for t in times]
+    return Benchmark("frame", run)
+
+
+# --- Sound ---
+
+def sound_benchmark(cached: bool) -> Benchmark:
+    def run(context: Context, repeats: int) -> List[float]:
+        from sound import SoundManager
+        samples = []
+        with tempfile.TemporaryDirectory() as root:
+            assets = AssetCache(root) if cached else None
+            if cached:
+                SoundManager(assets)  # Fill the cache
+            for _ in range(repeats):
+                start = time.perf_counter()
+                SoundManager(AssetCache(root) if cached else None)
+                samples.append(time.perf_counter() - start)
+        return samples
+    return Benchmark("startup", run)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "game.pickup_place": Benchmark("move", bench_pickup_place),
+    "game.update_interaction": Benchmark("update", bench_update_interaction),
+    "game.step": Benchmark("step", bench_step),
+    **{f"solver.moves_{n}": solver_benchmark(n) for n in BENCH_SOLVER_DISKS},
+    "detector.process_frame": Benchmark("frame", bench_process_frame),
+    "renderer.prepare_camera_surface": Benchmark("frame", bench_prepare_camera_surface),
+    **{f"renderer.render.{scene}": render_benchmark(scene) for scene in SCENES},
+    "sound.startup_uncached": sound_benchmark(False),
+    "sound.startup_cached": sound_benchmark(True),
+}
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples, dtype=np.float64)
+    median = float(np.median(values))
+    return {"mean": float(values.mean()), "median": median, "stdev": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            "min": float(values.min()), "max": float(values.max()), "ops_per_sec": 1.0 / median if median > 0 else 0.0}
+
+
+def environment(context: Context) -> dict:
+    """Metadata needed to judge whether two result files are comparable."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "backend": context.backend,
+        "size": list(context.size),
+        "commit": commit,
+    }
+
+
+def run(patterns: List[str], repeats: int, context: Context) -> dict:
+    results = {}
+    print(f"{'benchmark':<36}{'median':>14}{'stdev':>12}{'ops/s':>14}")
+    for name, benchmark in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        try:
+            samples = benchmark.run(context, repeats)
+        except SkipBenchmark as e:
+            results[name] = {"unit": benchmark.unit, "skipped": str(e)}
+            print(f"{name:<36}  skipped: {e}")
+            continue
+        stats = summarize(samples)
+        results[name] = {"unit": benchmark.unit, **stats, "samples": samples}
+        print(f"{name:<36}{stats['median'] * 1e6:>11.2f} us{stats['stdev'] * 1e6:>9.2f} us{stats['ops_per_sec']:>14.1f}")
+    return results
+
+
+def bootstrap_ratio(base: List[float], new: List[float], rounds: int = BENCH_BOOTSTRAP_ROUNDS,
+                    confidence: float = BENCH_CONFIDENCE, seed: int = BENCH_SEED):
+    """
+    Confidence interval for median(new) / median(base) by bootstrap resampling.
+
+    Makes no assumption about the timing distribution (which is skewed and
+    often multi-modal), so it is safer than a t-test for benchmark samples.
+
+    Returns:
+        Tuple[float, float, float]: (ratio, low, high).
+    """
+    rng = np.random.default_rng(seed)
+    a, b = np.asarray(base), np.asarray(new)
+    resampled_a = np.median(rng.choice(a, (rounds, len(a))), axis=1)
+    resampled_b = np.median(rng.choice(b, (rounds, len(b))), axis=1)
+    ratios = resampled_b / resampled_a
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(ratios, (tail, 100 - tail))
+    return float(np.median(b) / np.median(a)), float(low), float(high)
+
+
+def compare(base: dict, new: dict, threshold: float = BENCH_REGRESSION_THRESHOLD) -> bool:
+    """
+    Prints a comparison and returns True if any benchmark regressed.
+
+    A change is flagged only when the whole confidence interval of the
+    median ratio lies beyond the threshold, so noise alone does not fail.
+    """
+    for key in ("platform", "python", "cpu_count", "backend", "size"):
+        if base["environment"].get(key) != new["environment"].get(key):
+            print(f"warning: {key} differs ({base['environment'].get(key)} -> {new['environment'].get(key)})")
+
+    regressed = False
+    print(f"{'benchmark':<36}{'change':>9}  {'interval':<18} verdict")
+    for name, after in new["benchmarks"].items():
+        before = base["benchmarks"].get(name)
+        if before is None or "samples" not in before or "samples" not in after:
+            continue
+        ratio, low, high = bootstrap_ratio(before["samples"], after["samples"])
+        if low > 1 + threshold:
+            verdict = "REGRESSION"
+            regressed = True
+        elif high < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = "same"
+        print(f"{name:<36}{(ratio - 1) * 100:>+8.1f}%  [{(low - 1) * 100:+6.1f}, {(high - 1) * 100:+6.1f}]%  {verdict}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Game, solver, detector, renderer and sound benchmarks.")
+    sub = parser.add_subparsers(dest="command")
+
+    run_parser = sub.add_parser("run", help="Run benchmarks (default)")
+    run_parser.add_argument("patterns", nargs="*", help="Glob patterns of benchmarks to run (default: all)")
+    run_parser.add_argument("--repeats", type=int, default=BENCH_REPEATS)
+    run_parser.add_argument("--backend", default=RENDER_BACKEND, choices=("surface", "texture"))
+    run_parser.add_argument("--size", type=int, nargs=2, default=(SCREEN_WIDTH, SCREEN_HEIGHT), metavar=("W", "H"))
+    run_parser.add_argument("--frames-dir", help="Recorded camera frames (.png/.jpg) for the detector benchmark")
+    run_parser.add_argument("--json", help="Write results with environment metadata to this file")
+    run_parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+
+    compare_parser = sub.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=BENCH_REGRESSION_THRESHOLD,
+                                help="Relative slowdown that counts as a regression")
+
+    args = parser.parse_args(sys.argv[1:] if sys.argv[1:2] in (["run"], ["compare"], ["-h"], ["--help"])
+                             else ["run"] + sys.argv[1:])
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        sys.exit(1 if compare(base, new, args.threshold) else 0)
+
+    if args.list:
+        for name, benchmark in BENCHMARKS.items():
+            print(f"{name:<36}per {benchmark.unit}")
+        return
+
+    # Sounds are mono; the mixer format must be set before the renderer calls pygame.init
+    pygame.mixer.pre_init(frequency=44100, size=-16, channels=1)
+    context = Context(args.backend, args.size, args.frames_dir)
+    results = {"environment": environment(context), "benchmarks": run(args.patterns, args.repeats, context)}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+import sys
+import time
+import random
+import socket
+import struct
+import argparse
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from constants import *
+from frame_clock import FrameClock
+
+# Packet: magic, kind, sequence, base sequence, changed-field mask, then the
+# changed fields in field order. A delta holds every field that differs from
+# the last keyframe (its `base`), so a lost delta costs one frame; only a
+# viewer that missed the keyframe waits for the next one.
+HEADER = struct.Struct("<BBHHH")
+MAGIC = 0x48
+KEYFRAME = 1
+DELTA = 2
+
+# Fields, in mask bit order
+FLAGS, NUM_DISKS, TOWERS, HELD, HAND, ELAPSED, MOVES, MESSAGE, COLOR, CLOCK = range(10)
+
+NO_HAND = -32768
+FLAG_NAMES = ("show_play_screen", "game_started", "game_won", "timer_active", "pinch_state")
+
+
+def capture_state(game, previous: Optional[dict] = None) -> dict:
+    """
+    The broadcast fields of a TowerOfHanoiGame, quantized as they are sent
+    (milliseconds, integer pixels) so unchanged values compare equal.
+
+    Tower contents are only copied when board_version moved, which keeps
+    capturing cheap for deep stacks.
+    """
+    flags = 0
+    for bit, name in enumerate(FLAG_NAMES):
+        if getattr(game, name):
+            flags |= 1 << bit
+    board = (id(game), game.board_version)
+    if previous is not None and previous["board"] == board:
+        towers = previous[TOWERS]
+    else:
+        towers = tuple(tuple(tower) for tower in game.towers)
+    hand = game.hand_position
+    return {
+        "board": board,
+        FLAGS: flags,
+        NUM_DISKS: game.num_disks,
+        TOWERS: towers,
+        HELD: (game.disk_in_hand or 0, -1 if game.selected_tower is None else game.selected_tower),
+        HAND: (NO_HAND, NO_HAND) if hand is None else (int(hand[0]), int(hand[1])),
+        ELAPSED: int(game.elapsed_time * 1000),
+        MOVES: game.moves,
+        MESSAGE: (game.action_message, int(game.action_message_time * 1000)),
+        COLOR: tuple(game.pinch_indicator_color),
+        CLOCK: int(game.clock.time * 1000),
+    }
+
+
+def encode_field(field: int, value, state: dict, changed_towers: int = 0b111) -> bytes:
+    if field == FLAGS:
+        return struct.pack("<B", value)
+    if field == NUM_DISKS:
+        return struct.pack("<H", value)
+    if field == TOWERS:
+        # Mask of the towers that follow, then each as count + disk numbers
+        width = "B" if state[NUM_DISKS] < 256 else "H"
+        parts = [struct.pack("<B", changed_towers)]
+        for i, tower in enumerate(value):
+            if changed_towers >> i & 1:
+                parts.append(struct.pack(f"<H{len(tower)}{width}", len(tower), *tower))
+        return b"".join(parts)
+    if field == HELD:
+        return struct.pack("<Hb", *value)
+    if field == HAND:
+        return struct.pack("<hh", *value)
+    if field in (ELAPSED, MOVES, CLOCK):
+        return struct.pack("<I", value)
+    if field == MESSAGE:
+        text = value[0].encode("utf-8")[:255]
+        return struct.pack(f"<B{len(text)}sI", len(text), text, value[1])
+    if field == COLOR:
+        return struct.pack("<4B", *value)
+    raise ValueError(f"unknown field {field}")
+
+
+def decode_field(field: int, data: bytes, offset: int, state: dict) -> Tuple[object, int]:
+    if field == FLAGS:
+        return data[offset], offset + 1
+    if field == NUM_DISKS:
+        return struct.unpack_from("<H", data, offset)[0], offset + 2
+    if field == TOWERS:
+        width, size = ("B", 1) if state[NUM_DISKS] < 256 else ("H", 2)
+        mask = data[offset]
+        offset += 1
+        towers = list(state.get(TOWERS, ((), (), ())))
+        for i in range(3):
+            if mask >> i & 1:
+                count = struct.unpack_from("<H", data, offset)[0]
+                towers[i] = struct.unpack_from(f"<{count}{width}", data, offset + 2)
+                offset += 2 + count * size
+        return tuple(towers), offset
+    if field == HELD:
+        return struct.unpack_from("<Hb", data, offset), offset + 3
+    if field == HAND:
+        return struct.unpack_from("<hh", data, offset), offset + 4
+    if field in (ELAPSED, MOVES, CLOCK):
+        return struct.unpack_from("<I", data, offset)[0], offset + 4
+    if field == MESSAGE:
+        length = data[offset]
+        text = data[offset + 1:offset + 1 + length].decode("utf-8", "replace")
+        return (text, struct.unpack_from("<I", data, offset + 1 + length)[0]), offset + 5 + length
+    if field == COLOR:
+        return struct.unpack_from("<4B", data, offset), offset + 4
+    raise ValueError(f"unknown field {field}")
+
+
+# --- Transports ---
+
+class UdpTransport:
+    """
+    Sends packets to a UDP multicast group (or a unicast address).
+
+    The socket is non-blocking: a full send buffer drops the packet rather
+    than stalling the game loop, and viewers recover with the next packet.
+    """
+    def __init__(self, group: str = BROADCAST_GROUP, port: int = BROADCAST_PORT, ttl: int = 1) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            group (str): Multicast group or unicast host.
+            port (int): Destination port.
+            ttl (int): Multicast hops (1 = local network only).
+        """
+        self.address = (group, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setblocking(False)
+        self.dropped = 0
+
+    def send(self, packet: bytes) -> None:
+        try:
+            self.sock.sendto(packet, self.address)
+        except (BlockingIOError, OSError):
+            self.dropped += 1
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class UdpReceiver:
+    """
+    Receives packets from a UDP multicast group (or on a unicast port).
+    """
+    def __init__(self, group: str = BROADCAST_GROUP, port: int = BROADCAST_PORT) -> None:
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("", port))
+        if socket.inet_aton(group)[0] >> 4 == 0xE:  # 224.0.0.0/4
+            membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0"))
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.setblocking(False)
+
+    def receive(self) -> List[bytes]:
+        """All packets waiting on the socket."""
+        packets = []
+        while True:
+            try:
+                packets.append(self.sock.recv(65536))
+            except (BlockingIOError, InterruptedError):
+                return packets
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class LoopbackTransport:
+    """
+    In-process stand-in for the network, with optional packet loss, for
+    tests and the bandwidth benchmark.
+    """
+    def __init__(self, loss: float = 0.0, seed: int = BENCH_SEED) -> None:
+        self.queue: Deque[bytes] = deque()
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.sent = 0
+        self.sent_bytes = 0
+        self.dropped = 0
+
+    def send(self, packet: bytes) -> None:
+        self.sent += 1
+        self.sent_bytes += len(packet)
+        if self.loss and self.random.random() < self.loss:
+            self.dropped += 1
+            return
+        self.queue.append(packet)
+
+    def receive(self) -> List[bytes]:
+        packets = list(self.queue)
+        self.queue.clear()
+        return packets
+
+    def close(self) -> None:
+        pass
+
+
+# --- Publisher / mirror ---
+
+class StatePublisher:
+    """
+    Broadcasts a game's state once per frame as field-level deltas.
+
+    A frame with no change sends nothing. Otherwise the packet carries the
+    fields that differ from the last keyframe, so each delta stands on its
+    own and a lost packet is repaired by the next one. A keyframe with every
+    field goes out every `keyframe_interval` packets so viewers can join, and
+    so deltas stay small as the game moves away from the keyframe.
+    """
+    def __init__(self, transport, keyframe_interval: int = BROADCAST_KEYFRAME_INTERVAL) -> None:
+        """
+        Initialize the publisher.
+
+        Args:
+            transport: Object with send(bytes) (UdpTransport, LoopbackTransport).
+            keyframe_interval (int): Packets between keyframes.
+        """
+        self.transport = transport
+        self.keyframe_interval = keyframe_interval
+        self.state: Optional[dict] = None     # Last state sent
+        self.keyframe: Optional[dict] = None  # State of the last keyframe, the base of every delta
+        self.keyframe_sequence = 0
+        self.sequence = 0
+        self.since_keyframe = 0
+        self.packets = 0
+        self.bytes = 0
+
+    def encode(self, state: dict, keyframe: bool) -> Optional[bytes]:
+        if not keyframe and state == self.state:
+            return None
+        reference = self.keyframe
+        mask = 0
+        parts = []
+        for field in range(CLOCK + 1):
+            value = state[field]
+            if keyframe or value != reference[field]:
+                changed_towers = 0b111
+                if field == TOWERS and not keyframe and state[NUM_DISKS] == reference[NUM_DISKS]:
+                    changed_towers = sum(1 << i for i in range(3) if value[i] != reference[TOWERS][i])
+                mask |= 1 << field
+                parts.append(encode_field(field, value, state, changed_towers))
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        base = self.sequence if keyframe else self.keyframe_sequence
+        return HEADER.pack(MAGIC, KEYFRAME if keyframe else DELTA, self.sequence, base, mask) + b"".join(parts)
+
+    def publish(self, game) -> int:
+        """
+        Sends this frame's changes. Call once per frame after the logic update.
+
+        Args:
+            game (TowerOfHanoiGame): Game to mirror.
+
+        Returns:
+            int: Bytes sent (0 when nothing changed).
+        """
+        state = capture_state(game, self.state)
+        keyframe = self.state is None or self.since_keyframe >= self.keyframe_interval
+        packet = self.encode(state, keyframe)
+        if packet is None:
+            return 0
+        self.state = state
+        if keyframe:
+            self.keyframe = state
+            self.keyframe_sequence = self.sequence
+        self.since_keyframe = 0 if keyframe else self.since_keyframe + 1
+        self.transport.send(packet)
+        self.packets += 1
+        self.bytes += len(packet)
+        return len(packet)
+
+
+class MirroredGame:
+    """
+    Game state rebuilt from the broadcast, with the attributes
+    GameRenderer.render reads, so a viewer draws it with the normal renderer.
+    """
+    def __init__(self) -> None:
+        self.state: Dict[int, object] = {}
+        self.keyframe: Dict[int, object] = {}  # Base of the deltas that follow it
+        self.keyframe_sequence: Optional[int] = None
+        self.sequence: Optional[int] = None  # Last applied packet (None = waiting for a keyframe)
+        self.applied = 0
+        self.skipped = 0
+        self.clock = FrameClock()
+        self.num_disks = 3
+        self.towers: List[Tuple[int, ...]] = [(), (), ()]
+        self.board_version = 0
+        self.disk_in_hand: Optional[int] = None
+        self.selected_tower: Optional[int] = None
+        self.hand_position: Optional[Tuple[int, int]] = None
+        self.elapsed_time = 0.0
+        self.moves = 0
+        self.action_message = ""
+        self.action_message_time = 0.0
+        self.pinch_indicator_color = PINCH_COLOR_IDLE
+        self.show_play_screen = True
+        self.game_started = False
+        self.game_won = False
+        self.timer_active = False
+        self.pinch_state = False
+
+    def apply(self, packet: bytes) -> bool:
+        """
+        Applies one packet.
+
+        Returns:
+            bool: False if it was skipped (corrupt, a delta on a keyframe we do
+                not have, or older than the state already shown).
+        """
+        if len(packet) < HEADER.size:
+            self.skipped += 1
+            return False
+        magic, kind, sequence, base, mask = HEADER.unpack_from(packet)
+        if magic != MAGIC or (kind == DELTA and (base != self.keyframe_sequence
+                                                 or not 0 < (sequence - self.sequence) & 0xFFFF < 0x8000)):
+            self.skipped += 1
+            return False
+
+        state = {} if kind == KEYFRAME else dict(self.keyframe)
+        offset = HEADER.size
+        try:
+            for field in range(CLOCK + 1):
+                if mask >> field & 1:
+                    state[field], offset = decode_field(field, packet, offset, state)
+        except (struct.error, IndexError):
+            self.skipped += 1
+            return False
+        previous = self.state
+        self.state = state
+        self.sequence = sequence
+        if kind == KEYFRAME:
+            self.keyframe = state
+            self.keyframe_sequence = sequence
+        self.applied += 1
+        self.update_attributes(previous)
+        return True
+
+    def update_attributes(self, previous: Dict[int, object]) -> None:
+        state = self.state
+        for bit, name in enumerate(FLAG_NAMES):
+            setattr(self, name, bool(state[FLAGS] >> bit & 1))
+        self.num_disks = state[NUM_DISKS]
+        if state[TOWERS] != previous.get(TOWERS):
+            self.towers = [list(tower) for tower in state[TOWERS]]
+            self.board_version += 1
+        disk, selected = state[HELD]
+        self.disk_in_hand = disk or None
+        self.selected_tower = None if selected < 0 else selected
+        self.hand_position = None if state[HAND][0] == NO_HAND else state[HAND]
+        self.elapsed_time = state[ELAPSED] / 1000
+        self.moves = state[MOVES]
+        self.action_message, message_ms = state[MESSAGE]
+        self.action_message_time = message_ms / 1000
+        self.pinch_indicator_color = state[COLOR]
+        self.clock.time = state[CLOCK] / 1000
+
+
+def simulate(frames: int, num_disks: int, loss: float, keyframe_interval: int) -> None:
+    # Scripted game (hand sweeping, solver moves) over the loopback transport
+    from frame_clock import ManualTimeSource
+    from game_state import TowerOfHanoiGame
+    from layout import get_layout
+    from solver import hanoi_moves
+
+    time_source = ManualTimeSource()
+    clock = FrameClock(time_source)
+    game = TowerOfHanoiGame(num_disks, clock)
+    game.start_game()
+    layout = get_layout(SCREEN_WIDTH, SCREEN_HEIGHT)
+    moves = hanoi_moves(num_disks)
+    transport = LoopbackTransport(loss)
+    publisher = StatePublisher(transport, keyframe_interval)
+    mirror = MirroredGame()
+
+    publish_ns = []
+    mismatched = 0
+    move = None
+    for frame in range(frames):
+        time_source.advance(1.0 / FPS)
+        clock.tick()
+        while clock.step():
+            game.step(clock.fixed_dt)
+        # A move every 60 frames (ACTION_COOLDOWN apart): pinch over the source, release over the target
+        phase = frame % 60
+        if phase == 0:
+            move = next(moves, None)
+        if move is not None and not game.game_won:
+            x = layout.tower_x[move[0] if phase < 20 else move[1]]
+            gap = 10 if 2 <= phase < 40 else 100
+            game.update_interaction([(x, 300 - gap), (x, 300 + gap), (x, 450)], layout)
+        start = time.perf_counter_ns()
+        publisher.publish(game)
+        publish_ns.append(time.perf_counter_ns() - start)
+
+        for packet in transport.receive():
+            mirror.apply(packet)
+        if mirror.sequence == publisher.sequence and [list(t) for t in game.towers] != mirror.towers:
+            mismatched += 1
+
+    sizes = publisher.bytes / max(1, frames)
+    publish_ns.sort()
+    print(f"frames {frames}  packets {publisher.packets}  bytes/frame {sizes:.1f}  "
+          f"keyframe every {keyframe_interval} packets")
+    print(f"publish p50 {publish_ns[len(publish_ns) // 2] / 1e3:.1f} us  p99 {publish_ns[int(len(publish_ns) * 0.99)] / 1e3:.1f} us")
+    print(f"loss {loss:.0%}: dropped {transport.dropped}  applied {mirror.applied}  skipped {mirror.skipped}  "
+          f"tower mismatches {mismatched}  moves {game.moves}/{mirror.moves}")
+
+
+def view(group: str, port: int, size: Tuple[int, int]) -> None:
+    # Spectator window: the normal renderer drawing the mirrored state
+    import pygame
+    from ui_renderer import GameRenderer
+
+    receiver = UdpReceiver(group, port)
+    renderer = GameRenderer(*size)
+    pygame.display.set_caption("Tower of Hanoi - Spectator")
+    game = MirroredGame()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                renderer.handle_resize(event.w, event.h)
+        for packet in receiver.receive():
+            game.apply(packet)
+        game.clock.tick()  # Particle timing only; game time comes from the stream
+        renderer.startup_status = "Waiting for the game..." if game.sequence is None else None
+        renderer.render(game)
+        renderer.clock.tick(FPS)
+    receiver.close()
+    pygame.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Spectator viewer and loopback test for the state broadcast.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    viewer = sub.add_parser("view", help="Open a spectator window")
+    viewer.add_argument("--group", default=BROADCAST_GROUP, help="Multicast group (or 127.0.0.1 for unicast)")
+    viewer.add_argument("--port", type=int, default=BROADCAST_PORT)
+    viewer.add_argument("--size", type=int, nargs=2, default=(SCREEN_WIDTH, SCREEN_HEIGHT), metavar=("W", "H"))
+    loopback = sub.add_parser("loopback", help="Measure bytes per frame and publish cost over a simulated link")
+    loopback.add_argument("--frames", type=int, default=1200)
+    loopback.add_argument("--disks", type=int, default=5)
+    loopback.add_argument("--loss", type=float, default=0.0, help="Fraction of packets dropped")
+    loopback.add_argument("--keyframe-interval", type=int, default=BROADCAST_KEYFRAME_INTERVAL)
+    args = parser.parse_args()
+
+    if args.command == "view":
+        view(args.group, args.port, tuple(args.size))
+    else:
+        simulate(args.frames, args.disks, args.loss, args.keyframe_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
+import os
+
 # Screen settings
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
 
+# Simulation clock
+LOGIC_HZ = 120 # Fixed logic steps per second, independent of the render rate
+RENDER_BACKEND = os.environ.get("HANOI_RENDER_BACKEND", "surface") # "surface" or "texture" (SDL2 renderer)
+MAX_FRAME_TIME = 0.25 # Longer frames are clamped to avoid catch-up bursts
+
 # Tower settings
 TOWER_WIDTH = 15 # Thicker for solid look
 TOWER_HEIGHT = 300
@@ -14,11 +21,32 @@ TOWER_BASE_HEIGHT = 15
 DISK_HEIGHT = 40 # Thicker disks
 BASE_DISK_WIDTH = 220
 DISK_ROUNDING = 8 # Less rounded, more machined
+DISK_WIDTH_STEP = 35 # Width difference between neighbouring disks (small stacks)
+DISK_MIN_WIDTH = 40 # Narrowest disk, reached when many disks share a tower
+MIN_DISKS = 2
+MAX_DISKS = 256
+DIFFICULTY_FAST_STEP = 10 # Disks added/removed per shift-click on the selector
+ARROW_HIT_SIZE = 40 # Click target of the difficulty arrows (px)
+
+# Level of detail for deep stacks
+DISK_LOD_DETAIL = 8 # Top disks of each tower always drawn individually
+DISK_LOD_CHUNK = 16 # Disks per cached pre-rendered strip below the detail zone
+DISK_LOD_CACHE_SIZE = 256 # Cached strips (least recently used are evicted)
+DISK_SPRITE_CACHE_SIZE = 512 # Cached pre-rendered disk sprites
+TEXT_CACHE_SIZE = 256 # Cached rendered strings
+PANEL_CACHE_SIZE = 32 # Cached glass panels, one per (size, radius)
+CURSOR_CACHE_SIZE = 128 # Cached pinch cursors, one per color
+BACKGROUND_CACHE_SIZE = 8 # Cached backgrounds, one per window size and style
+LAYOUT_CACHE_SIZE = 8 # Cached layouts, one per window size
+DISK_LOD_BEVEL_MIN_HEIGHT = 10 # Thinner disks are drawn flat (no bevel/shine)
+DISK_LOD_LABEL_MIN_HEIGHT = 16 # Thinner disks are drawn without number labels
 
 # Theme: Crystal & Metal (Professional, High Contrast)
 COLOR_BG_DARK = (245, 247, 250)     # Off-white / Metallic Mist
 COLOR_BG_LIGHT = (255, 255, 255)    # Pure White
 COLOR_GRID = (200, 210, 220, 100)   # Subtle Steel Grid
+BACKGROUND_STOPS = ((0.0, (255, 255, 255)), (1.0, (235, 240, 245))) # Vertical gradient (position, color)
+GRID_SPACING = 40
 
 # Metal Colors (Gradients are procedural, these are base tones)
 # We will define base tones for specific metal types
@@ -45,13 +73,107 @@ COLOR_BASE_GLOW = (160, 160, 160)  # Polished Base
 # Hand tracking
 PINCH_THRESHOLD = 50
 ACTION_COOLDOWN = 0.3
+PINCH_HOLD_PULSE_DELAY = 0.5 # Seconds of holding before the indicator pulses
 ACTION_MESSAGE_DURATION = 2.0
 
+# Events
+EVENT_QUEUE_CAPACITY = 256 # Events kept per ring before slow subscribers start dropping
+
+# Frame timing instrumentation
+METRICS_CAPACITY = 600 # Frames kept per stage for rolling percentiles
+METRICS_DUMP_INTERVAL = 10.0 # Seconds between metrics file dumps
+METRICS_HUD_REFRESH = 0.5 # Seconds between debug overlay updates
+
+# Allocation profiling (--alloc-profile); budgets are p95 transient bytes per frame stage
+ALLOC_SNAPSHOT_INTERVAL = 30 # Frames between call-site snapshots
+ALLOC_TRACE_DEPTH = 4 # Stack frames stored per traced allocation
+ALLOCATION_BUDGETS = {
+    "camera_surface": 4 * 1024,
+    "logic": 4 * 1024,
+    "dispatch": 4 * 1024,
+    "render": 32 * 1024,
+}
+
+# Split-screen multiplayer
+MAX_PLAYERS = 4
+PLAYER_MAX_JUMP = 0.25 # Largest hand movement between frames still matched to the same player (fraction of frame width)
+PLAYER_HANDEDNESS_PENALTY = 0.15 # Matching cost added when a hand's handedness differs from its player's
+PLAYER_NEW_HAND_COST = 1.0 # Cost of binding a new hand to a free player (prefer existing bindings)
+PLAYER_RELEASE_FRAMES = 15 # Frames without its hand before a player is freed
+
+# Local data
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".tower_of_hanoi")
+
+# Startup asset cache (synthesized sounds, font paths, backgrounds)
+ASSET_CACHE_DIR = os.path.join(DATA_DIR, "cache")
+ASSET_CACHE_VERSION = 1 # Bump when asset generation changes to invalidate old entries
+
+# On-demand profiling (F9 / SIGUSR1 / --profile-frames)
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_FRAMES = 300 # Frames captured per request (5 seconds at 60 FPS)
+PROFILE_SAMPLE_INTERVAL = 0.005 # Seconds between stack samples in sampling mode
+
+# Analytics
+ANALYTICS_DB_FILE = "analytics.db"
+ANALYTICS_BATCH_SIZE = 64 # Queued writes that force a commit
+ANALYTICS_FLUSH_INTERVAL = 1.0 # Max seconds a write waits in the queue
+
 # Pinch Indicator
 PINCH_COLOR_IDLE = (100, 100, 100, 100)
 PINCH_COLOR_ACTIVE = (0, 120, 255, 200) # Professional Blue
 PINCH_COLOR_ERROR = (200, 50, 50, 200)
 
 # Particle Settings (Subtle glints)
-PARTICLE_COUNT = 10
-PARTICLE_LIFETIME = 0.5
+PARTICLE_COUNT = 10 # Particles per burst
+PARTICLE_LIFETIME = 0.5 # Mean lifetime in seconds
+PARTICLE_CAPACITY = 4096 # Max live particles
+PARTICLE_COLOR = (255, 255, 255) # Glints are white
+PARTICLE_ALPHA_LEVELS = 8 # Pre-rendered fade steps
+
+# Render benchmark / golden images
+BENCH_FRAMES = 120 # Measured frames per scene
+BENCH_WARMUP_FRAMES = 10 # Frames rendered before timing (fills caches)
+BENCH_SEED = 1234 # Seeds particles so scenes are reproducible
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+GOLDEN_TOLERANCE = 8 # Max per-channel difference for a pixel to match
+GOLDEN_MAX_MISMATCH = 0.001 # Fraction of mismatched pixels allowed per image
+GOLDEN_FRAME = BENCH_WARMUP_FRAMES + BENCH_FRAMES - 1 # Frame the golden image is taken at, whatever --frames is
+
+# Motion-to-photon latency harness
+LATENCY_FRAMES = 600 # Camera frames measured per run
+LATENCY_CAMERA_FPS = 30 # Synthetic camera rate (0 = deliver frames as fast as they are read)
+LATENCY_CAMERA_BUFFER = 2 # Frames a camera driver queues before dropping the oldest
+LATENCY_SWEEP_FRAMES = 150 # Frames per left-to-right hand sweep
+LATENCY_SETTLE_FRAMES = 8 # Frames after a sweep restarts that are not measured
+
+# Benchmark suite
+BENCH_REPEATS = 15 # Timed samples per benchmark
+BENCH_MIN_SAMPLE_TIME = 0.02 # Seconds each sample runs for (fast benchmarks loop until then)
+BENCH_SOLVER_DISKS = (10, 16, 20) # Disk counts for solver move generation
+BENCH_REGRESSION_THRESHOLD = 0.10 # Relative slowdown below which changes are ignored (run-to-run noise)
+BENCH_BOOTSTRAP_ROUNDS = 2000 # Resamples for the confidence interval in compare mode
+BENCH_CONFIDENCE = 0.95 # Confidence level for flagging a regression
+
+# Spectator broadcast (--broadcast)
+BROADCAST_GROUP = "239.255.72.1" # Multicast group (administratively scoped: stays on the site network)
+BROADCAST_PORT = 50072
+BROADCAST_KEYFRAME_INTERVAL = 30 # Packets between full-state keyframes (bounds how long a late viewer waits)
+
+# Session server (session_server.py)
+SESSION_PORT = 50080
+SESSION_MAX = 10000 # Concurrent sessions before new connections are rejected
+SESSION_IDLE_TIMEOUT = 30.0 # Seconds without client input before a session is evicted
+SESSION_HELLO_TIMEOUT = 5.0 # Seconds a connection may stay open without sending HELLO
+SESSION_WRITE_BUFFER_LIMIT = 16384 # Unsent reply bytes above which a session's state is withheld
+SESSION_SOCKET_BUFFER = 32768 # Kernel send buffer per session socket (bytes)
+SESSION_STATS_INTERVAL = 5.0 # Seconds between server stats lines and metrics dumps
+LOAD_CLIENTS = 200
+LOAD_RATE = 30 # Frames per second per load-generator client
+LOAD_DURATION = 10.0 # Seconds
+
+# Gesture tuning sweep (--record-traces, gesture_sweep.py)
+TRACE_DIR = os.path.join(DATA_DIR, "traces")
+SWEEP_PINCH_THRESHOLDS = (20, 90, 2.5) # start, stop, step (pixels)
+SWEEP_ACTION_COOLDOWNS = (0.05, 0.8, 0.025) # start, stop, step (seconds)
+SWEEP_WEIGHTS = {"false_pickups": 1.0, "invalid_drops": 1.0, "missed_releases": 2.0, "lost_tracking_drops": 2.0,
+                 "seconds_per_move": 0.5, "unsolved": 5.0} # Score = weighted sum per trace (lower is better)
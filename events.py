@@ -0,0 +1,183 @@
+import time
+from enum import Enum
+from typing import Callable, List, Optional
+
+
+class EventType(Enum):
+    """
+    Kinds of events raised by the game.
+    """
+    PICKUP = "PICKUP"
+    DROP_VALID = "DROP_VALID"
+    DROP_INVALID = "DROP_INVALID"
+    WIN = "WIN"
+    RESET = "RESET"
+    GAME_START = "GAME_START"
+    DIFFICULTY_CHANGED = "DIFFICULTY_CHANGED"
+
+
+class GameEvent:
+    """
+    A single event record. Records are pre-allocated ring slots owned by the
+    EventBus and are overwritten once the ring wraps, so handlers must copy
+    any field they want to keep.
+    """
+    __slots__ = ("seq", "kind", "timestamp", "tower", "source", "disk", "duration")
+
+    def __init__(self) -> None:
+        self.seq: int = -1
+        self.kind: Optional[EventType] = None
+        self.timestamp: float = 0.0
+        self.tower: int = -1
+        self.source: int = -1
+        self.disk: int = 0
+        self.duration: float = 0.0
+
+    def __repr__(self) -> str:
+        return (f"GameEvent(seq={self.seq}, kind={self.kind}, timestamp={self.timestamp:.3f}, "
+                f"tower={self.tower}, source={self.source}, disk={self.disk}, duration={self.duration:.3f})")
+
+
+class Subscription:
+    """
+    An independent read cursor into an EventBus.
+    """
+    def __init__(self, bus: "EventBus", handler: Callable[[GameEvent], None]) -> None:
+        """
+        Initialize the subscription.
+
+        Args:
+            bus (EventBus): The bus this cursor reads from.
+            handler (Callable): Called with every event delivered to this subscriber.
+        """
+        self.bus = bus
+        self.handler = handler
+        self.cursor: int = bus.write_seq
+
+        # Backpressure counters
+        self.delivered: int = 0
+        self.dropped: int = 0
+        self.max_lag: int = 0
+
+    @property
+    def lag(self) -> int:
+        """Number of published events not yet delivered to this subscriber."""
+        return self.bus.write_seq - self.cursor
+
+    def drain(self) -> int:
+        """
+        Delivers all pending events to the handler.
+
+        Events that were overwritten before this subscriber got to them are
+        counted in `dropped` instead of being delivered.
+
+        Returns:
+            int: Number of events delivered.
+        """
+        bus = self.bus
+        end = bus.write_seq
+        lag = end - self.cursor
+        if lag > self.max_lag:
+            self.max_lag = lag
+
+        oldest = end - bus.capacity
+        if self.cursor < oldest:
+            self.dropped += oldest - self.cursor
+            self.cursor = oldest
+
+        delivered = 0
+        while self.cursor < end:
+            self.handler(bus.slots[self.cursor % bus.capacity])
+            self.cursor += 1
+            delivered += 1
+
+        self.delivered += delivered
+        return delivered
+
+
+class EventBus:
+    """
+    Bounded publish/subscribe bus backed by a ring of pre-allocated records.
+
+    Publishing overwrites the next ring slot in place (no allocation). Every
+    subscriber keeps its own cursor, so a slow consumer never steals events
+    from the others; if it falls more than `capacity` events behind, the
+    oldest events are skipped and counted as dropped for that subscriber.
+    """
+    def __init__(self, capacity: int = 256, time_source: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the bus.
+
+        Args:
+            capacity (int): Number of events kept before the ring wraps.
+            time_source (Callable): Default timestamp source for published events.
+        """
+        self.capacity: int = capacity
+        self.time_source = time_source
+        self.slots: List[GameEvent] = [GameEvent() for _ in range(capacity)]
+        self.write_seq: int = 0
+        self.subscriptions: List[Subscription] = []
+
+    def publish(self, kind: EventType, timestamp: Optional[float] = None, tower: int = -1,
+                source: int = -1, disk: int = 0, duration: float = 0.0) -> None:
+        """
+        Records an event.
+
+        Args:
+            kind (EventType): The type of event.
+            timestamp (float): Event time; defaults to the current time.
+            tower (int): Tower the event happened on, -1 if none.
+            source (int): Tower the disk came from, -1 if none.
+            disk (int): Disk involved, 0 if none.
+            duration (float): Event-specific duration (pickup-to-place time, game time).
+        """
+        event = self.slots[self.write_seq % self.capacity]
+        event.seq = self.write_seq
+        event.kind = kind
+        event.timestamp = self.time_source() if timestamp is None else timestamp
+        event.tower = tower
+        event.source = source
+        event.disk = disk
+        event.duration = duration
+        self.write_seq += 1
+
+    def subscribe(self, handler: Callable[[GameEvent], None]) -> Subscription:
+        """
+        Registers a handler. It receives events published from now on.
+
+        Args:
+            handler (Callable): Called with each event during dispatch().
+
+        Returns:
+            Subscription: The subscriber's cursor and backpressure counters.
+        """
+        subscription = Subscription(self, handler)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Removes a subscriber."""
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def dispatch(self) -> None:
+        """Delivers pending events to every subscriber, each at its own pace."""
+        for subscription in self.subscriptions:
+            subscription.drain()
+
+    def stats(self) -> dict:
+        """Returns backpressure counters for the bus and each subscriber."""
+        return {
+            "published": self.write_seq,
+            "capacity": self.capacity,
+            "subscribers": [
+                {
+                    "handler": getattr(s.handler, "__qualname__", repr(s.handler)),
+                    "delivered": s.delivered,
+                    "dropped": s.dropped,
+                    "lag": s.lag,
+                    "max_lag": s.max_lag,
+                }
+                for s in self.subscriptions
+            ],
+        }
@@ -0,0 +1,101 @@
+import time
+from typing import Callable
+from constants import *
+
+
+class ManualTimeSource:
+    """
+    Deterministic time source for tests, replays and headless runs.
+    """
+    def __init__(self, start: float = 0.0) -> None:
+        """
+        Initialize the time source.
+
+        Args:
+            start (float): Initial time in seconds.
+        """
+        self.now: float = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, dt: float) -> None:
+        """Moves time forward by dt seconds."""
+        self.now += dt
+
+
+class FrameClock:
+    """
+    Frame clock with a fixed-timestep simulation.
+
+    tick() reads the time source exactly once per frame. The elapsed real time
+    is fed into an accumulator that step() drains in fixed increments, so game
+    logic advances identically at 30, 60 or 144 FPS. `alpha` is the leftover
+    fraction of a step, used to interpolate rendering between logic states.
+    """
+    def __init__(self,
+                 time_source: Callable[[], float] = time.perf_counter,
+                 fixed_dt: float = 1.0 / LOGIC_HZ,
+                 max_frame_time: float = MAX_FRAME_TIME) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            time_source (Callable): Monotonic time source in seconds.
+            fixed_dt (float): Duration of one logic step in seconds.
+            max_frame_time (float): Longest frame fed to the accumulator; longer
+                stalls are dropped instead of triggering a burst of catch-up steps.
+        """
+        self.time_source = time_source
+        self.fixed_dt: float = fixed_dt
+        self.max_frame_time: float = max_frame_time
+
+        self.now: float = time_source()  # Real timestamp of the current tick
+        self.frame_dt: float = 0.0       # Real (clamped) duration of the last frame
+        self.time: float = 0.0           # Simulation time, advances by fixed_dt
+        self.accumulator: float = 0.0
+        self.frame_count: int = 0
+        self.step_count: int = 0
+        self.dropped_time: float = 0.0
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a logic step not yet simulated (0..1), for interpolation."""
+        return min(1.0, self.accumulator / self.fixed_dt)
+
+    def tick(self) -> float:
+        """
+        Starts a new frame. Call exactly once per frame.
+
+        Returns:
+            float: The real frame duration fed to the accumulator.
+        """
+        now = self.time_source()
+        frame_dt = now - self.now
+        self.now = now
+        if frame_dt > self.max_frame_time:
+            self.dropped_time += frame_dt - self.max_frame_time
+            frame_dt = self.max_frame_time
+        elif frame_dt < 0.0:
+            frame_dt = 0.0
+
+        self.frame_dt = frame_dt
+        self.accumulator += frame_dt
+        self.frame_count += 1
+        return frame_dt
+
+    def step(self) -> bool:
+        """
+        Consumes one fixed step from the accumulator, if available.
+
+        Usage: `while clock.step(): game.step(clock.fixed_dt)`
+
+        Returns:
+            bool: True if a logic step should run.
+        """
+        if self.accumulator < self.fixed_dt:
+            return False
+        self.accumulator -= self.fixed_dt
+        self.step_count += 1
+        self.time = self.step_count * self.fixed_dt
+        return True
@@ -1,22 +1,27 @@
 from collections import deque
-import time
 import math
 from typing import List, Optional, Tuple, Deque
 from constants import *
+from events import EventBus, EventType
+from frame_clock import FrameClock
+from layout import Layout
 
 class TowerOfHanoiGame:
     """
     Manages the logic and state of the Tower of Hanoi game.
     """
-    def __init__(self, num_disks: int = 3) -> None:
+    def __init__(self, num_disks: int = 3, clock: Optional[FrameClock] = None) -> None:
         """
         Initialize the game state.
 
         Args:
             num_disks (int): Number of disks to start with.
+            clock (FrameClock): Simulation clock; all game timing reads `clock.time`.
         """
         self.num_disks: int = num_disks
+        self.clock: FrameClock = clock or FrameClock()
         self.towers: List[Deque[int]] = [deque(), deque(), deque()]
+        self.board_version: int = 0 # Bumped whenever any tower changes
         
         # State variables
         self.selected_tower: Optional[int] = None
@@ -33,16 +38,21 @@ class TowerOfHanoiGame:
         self.moves: int = 0
         
         # Interaction state
-        self.last_action_time: float = 0.0
+        self.last_action_time: float = float('-inf')
         self.pinch_state: bool = False
         self.pinch_hold_time: float = 0.0
         self.hand_position: Optional[Tuple[int, int]] = None
         self.action_message: str = ""
         self.action_message_time: float = 0.0
         self.pinch_indicator_color: Tuple[int, int, int, int] = PINCH_COLOR_IDLE
+
+        # Gesture tuning (per game so gesture_sweep.py can replay traces with other values)
+        self.pinch_threshold: float = PINCH_THRESHOLD
+        self.action_cooldown: float = ACTION_COOLDOWN
+        self.hold_pulse_delay: float = PINCH_HOLD_PULSE_DELAY
         
-        # Event System for Audio/UI
-        self.last_event: Optional[str] = None
+        # Event System for Audio/UI (subscribers drain it independently)
+        self.events: EventBus = EventBus(EVENT_QUEUE_CAPACITY, time_source=lambda: self.clock.time)
 
         self.reset_game()
 
@@ -53,6 +63,7 @@ class TowerOfHanoiGame:
         
         for i in range(self.num_disks, 0, -1):
             self.towers[0].append(i)
+        self.board_version += 1
             
         self.selected_tower = None
         self.disk_in_hand = None
@@ -62,12 +73,48 @@ class TowerOfHanoiGame:
         self.timer_active = False
         self.pinch_state = False
         self.action_message = ""
-        self.last_event = "RESET"
+        self.events.publish(EventType.RESET)
+
+    def start_game(self) -> None:
+        """Leaves the play screen and starts a timed game."""
+        self.show_play_screen = False
+        self.game_started = True
+        self.reset_game()
+        self.start_time = self.clock.time
+        self.timer_active = True
+        self.show_action_message("Game started! Pinch to move disks")
+        self.events.publish(EventType.GAME_START)
+
+    def step(self, dt: float) -> None:
+        """
+        Advances time-based state by one fixed logic step.
+
+        Args:
+            dt (float): Step duration in seconds.
+        """
+        if self.timer_active:
+            self.elapsed_time += dt
 
     def check_win(self) -> bool:
         """Checks if the game has been won."""
         return len(self.towers[2]) == self.num_disks
 
+    def finish_if_won(self) -> bool:
+        """
+        Ends the game if the puzzle is solved: publishes WIN, stops the timer
+        and shows the victory message.
+
+        Returns:
+            bool: True only on the call that ended the game.
+        """
+        if self.game_won or not self.check_win():
+            return False
+        self.events.publish(EventType.WIN, duration=self.elapsed_time)
+        self.game_won = True
+        self.timer_active = False
+        self.show_action_message("Victory!")
+        return True
+
     def show_action_message(self, message: str) -> None:
         """
         Sets a message to be displayed on the UI.
@@ -76,7 +123,7 @@ class TowerOfHanoiGame:
             message (str): The message to display.
         """
         self.action_message = message
-        self.action_message_time = time.time()
+        self.action_message_time = self.clock.time
         
     def pickup_disc(self, tower_index: int) -> bool:
         """
@@ -90,11 +137,13 @@ class TowerOfHanoiGame:
         """
         if self.towers[tower_index]:
             self.disk_in_hand = self.towers[tower_index].pop()
+            self.board_version += 1
             self.selected_tower = tower_index
             self.pinch_indicator_color = PINCH_COLOR_ACTIVE
             self.show_action_message(f"Picked up disc {self.disk_in_hand}")
-            self.pickup_time = time.time()
-            self.last_event = "PICKUP"
+            self.pickup_time = self.clock.time
+            self.events.publish(EventType.PICKUP, tower=tower_index,
+                                source=tower_index, disk=self.disk_in_hand)
             return True
         return False
 
@@ -114,46 +163,53 @@ class TowerOfHanoiGame:
         # Check valid move rule: Empty tower OR smaller disk on larger disk
         if not self.towers[tower_index] or self.disk_in_hand < self.towers[tower_index][-1]:
             self.towers[tower_index].append(self.disk_in_hand)
+            self.board_version += 1
             self.moves += 1
             
             # Message logic
-            move_time = time.time() - self.pickup_time
+            move_time = self.clock.time - self.pickup_time
             if move_time < 1.5:
                 self.show_action_message("Quick move!")
             else:
                 self.show_action_message(f"Placed on tower {tower_index+1}")
                 
+            self.events.publish(EventType.DROP_VALID, tower=tower_index, source=self.selected_tower,
+                                disk=self.disk_in_hand, duration=move_time)
             self.disk_in_hand = None
             self.pinch_indicator_color = PINCH_COLOR_IDLE
-            self.last_event = "DROP_VALID"
             return True
         else:
             self.show_action_message("Invalid move!")
             # Return to original tower
             self.towers[self.selected_tower].append(self.disk_in_hand)
+            self.board_version += 1
+            self.events.publish(EventType.DROP_INVALID, tower=tower_index, source=self.selected_tower,
+                                disk=self.disk_in_hand, duration=self.clock.time - self.pickup_time)
             self.disk_in_hand = None
             self.pinch_indicator_color = PINCH_COLOR_ERROR
-            self.last_event = "DROP_INVALID"
             return False
 
-    def update_interaction(self, hand_landmarks: Optional[List[Tuple[float, float]]], camera_width: int) -> None:
+    def update_interaction(self, hand_landmarks: Optional[List[Tuple[float, float]]], layout: Layout) -> None:
         """
         Updates game interaction based on hand tracking data.
 
+        Call once per frame, after the frame's logic steps: each landmark
+        sample is a new gesture input and must be applied exactly once.
+
         Args:
-            hand_landmarks: List of (x, y) tuples for index, thumb, wrist.
-            camera_width: Width of the camera/renderer for scaling logic.
+            hand_landmarks: List of (x, y) tuples for index, thumb, wrist, in window coordinates.
+            layout: Current window layout, used to map the hand to a tower zone.
         """
-        self.last_event = None # Reset event frame
-        
         if not hand_landmarks:
             if self.disk_in_hand is not None and self.selected_tower is not None:
                 self.towers[self.selected_tower].append(self.disk_in_hand)
+                self.board_version += 1
+                self.events.publish(EventType.DROP_INVALID, tower=self.selected_tower, source=self.selected_tower,
+                                    disk=self.disk_in_hand, duration=self.clock.time - self.pickup_time)
                 self.disk_in_hand = None
                 self.pinch_state = False
                 self.show_action_message("Lost tracking - Disc returned")
                 self.pinch_indicator_color = PINCH_COLOR_ERROR
-                self.last_event = "DROP_INVALID"
             return
             
         index_pos, thumb_pos, _ = hand_landmarks
@@ -167,17 +223,10 @@ class TowerOfHanoiGame:
         self.hand_position = (int(avg_x), int(avg_y))
         
         # Map to tower zones
-        # Assuming screen is split into 3 columns
-        scaled_x = avg_x * (SCREEN_WIDTH / camera_width)
-        if scaled_x < SCREEN_WIDTH / 3:
-            tower_index = 0
-        elif scaled_x < 2 * SCREEN_WIDTH / 3:
-            tower_index = 1
-        else:
-            tower_index = 2
+        tower_index = layout.tower_zone(avg_x)
             
-        now = time.time()
-        is_pinching = distance < PINCH_THRESHOLD
+        now = self.clock.time
+        is_pinching = distance < self.pinch_threshold
         
         # --- State Machine ---
         
@@ -190,7 +239,7 @@ class TowerOfHanoiGame:
             # Attempt Pickup
             if self.disk_in_hand is None:
                  if self.towers[tower_index]:
-                      if now - self.last_action_time > ACTION_COOLDOWN:
+                      if now - self.last_action_time > self.action_cooldown:
                           self.pickup_disc(tower_index)
                           self.last_action_time = now
             
@@ -201,16 +250,16 @@ class TowerOfHanoiGame:
             
             # Attempt Place
             if self.disk_in_hand is not None:
-                if now - self.last_action_time > ACTION_COOLDOWN:
+                if now - self.last_action_time > self.action_cooldown:
                     self.place_disc(tower_index)
                     self.last_action_time = now
                     
         # 3. Holding Pinch (Visual Feedback)
         elif is_pinching:
             hold_duration = now - self.pinch_hold_time
-            if hold_duration > 0.5:
+            if hold_duration > self.hold_pulse_delay:
                 # Pulse effect
-                pulse = (math.sin(time.time() * 8) + 1) / 2
+                pulse = (math.sin(now * 8) + 1) / 2
                 if self.disk_in_hand is not None:
                      # Carrying
                      val = int(150 + pulse * 105)
@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from constants import *
+from events import EventType, GameEvent
+from frame_clock import FrameClock, ManualTimeSource
+from game_state import TowerOfHanoiGame
+from layout import get_layout
+from solver import hanoi_moves
+from traces import Trace, load_traces, save_trace
+
+# Outcome counts per replay, in report order
+COUNTS = ("pickups", "moves", "false_pickups", "invalid_drops", "missed_releases", "lost_tracking_drops", "unsolved")
+
+
+def replay(trace: Trace, params: Dict[str, float]) -> Dict[str, float]:
+    """
+    Replays a trace through update_interaction with other gesture settings.
+
+    The recorded hand does not react to the game, so a setting that misses
+    a gesture makes the rest of the trace play out differently, as it
+    would have for the player.
+
+    Args:
+        trace (Trace): Recorded landmarks.
+        params (Dict[str, float]): TowerOfHanoiGame gesture attributes to override.
+
+    Returns:
+        Dict[str, float]: COUNTS plus move_seconds (total pickup-to-place time of moves).
+    """
+    clock = FrameClock(ManualTimeSource())
+    game = TowerOfHanoiGame(trace.num_disks, clock)
+    for name, value in params.items():
+        setattr(game, name, value)
+    game.start_game()
+    layout = get_layout(trace.width, trace.height)
+    counts = Counter(dict.fromkeys(COUNTS, 0))
+    move_seconds = 0.0
+
+    def on_event(event: GameEvent) -> None:
+        nonlocal move_seconds
+        if event.kind == EventType.PICKUP:
+            counts["pickups"] += 1
+        elif event.kind == EventType.DROP_VALID:
+            if event.tower == event.source:
+                counts["false_pickups"] += 1  # Put straight back
+            else:
+                counts["moves"] += 1
+                move_seconds += event.duration
+        elif event.kind == EventType.DROP_INVALID:
+            # Only the lost-tracking path returns a disk to its own tower
+            counts["lost_tracking_drops" if event.tower == event.source else "invalid_drops"] += 1
+
+    subscription = game.events.subscribe(on_event)
+    for t, landmarks in trace.samples():
+        clock.time = t
+        pinching = game.pinch_state
+        game.update_interaction(landmarks, layout)
+        if pinching and not game.pinch_state and landmarks is not None and game.disk_in_hand is not None:
+            counts["missed_releases"] += 1  # Released within the cooldown: the disk stays in hand
+        if game.finish_if_won():
+            subscription.drain()
+            break
+        subscription.drain()
+    counts["unsolved"] = int(not game.game_won)
+    result = dict(counts)
+    result["move_seconds"] = move_seconds
+    return result
+
+
+def score(totals: Dict[str, float], traces: int, weights: Dict[str, float] = SWEEP_WEIGHTS) -> float:
+    """
+    Weighted cost of a setting over a corpus (lower is better).
+
+    Args:
+        totals (Dict[str, float]): Summed replay() results.
+        traces (int): Number of traces summed.
+        weights (Dict[str, float]): Weight per count (per trace) and for seconds_per_move.
+    """
+    cost = sum(weight * totals[name] / traces for name, weight in weights.items() if name in COUNTS)
+    return cost + weights.get("seconds_per_move", 0.0) * totals["seconds_per_move"]
+
+
+_corpus: List[Trace] = []
+
+
+def _load_corpus(traces: List[Trace]) -> None:
+    # Pool initializer: each worker keeps the corpus instead of receiving it per task
+    global _corpus
+    _corpus = traces
+
+
+def evaluate(params: Dict[str, float]) -> Dict[str, float]:
+    """Replays the whole corpus with one setting and sums the outcomes."""
+    totals = Counter()
+    for trace in _corpus:
+        totals.update(replay(trace, params))
+    totals["seconds_per_move"] = totals["move_seconds"] / max(1, totals["moves"])
+    return dict(totals)
+
+
+def sweep(traces: List[Trace], configs: List[Dict[str, float]], jobs: int = 0,
+          weights: Dict[str, float] = SWEEP_WEIGHTS) -> List[Tuple[float, Dict[str, float], Dict[str, float]]]:
+    """
+    Evaluates every setting over the corpus on a process pool.
+
+    Args:
+        traces (List[Trace]): Corpus.
+        configs (List[Dict[str, float]]): Settings to try.
+        jobs (int): Worker processes (0 = one per CPU; 1 runs in this process).
+        weights (Dict[str, float]): Passed to score().
+
+    Returns:
+        List[Tuple[float, Dict, Dict]]: (score, setting, totals), best first.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        _load_corpus(traces)
+        results = [evaluate(config) for config in configs]
+    else:
+        with ProcessPoolExecutor(jobs, initializer=_load_corpus, initargs=(traces,)) as pool:
+            results = list(pool.map(evaluate, configs, chunksize=max(1, len(configs) // (jobs * 8))))
+    ranked = [(score(totals, len(traces), weights), config, totals) for config, totals in zip(configs, results)]
+    ranked.sort(key=lambda entry: entry[0])
+    return ranked
+
+
+def synthesize(num_disks: int, seed: int, width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT,
+               fps: float = 30.0) -> Trace:
+    """
+    A synthetic player solving the puzzle: smooth moves between towers,
+    pinches that close and open over a few frames, and per-player pinch
+    widths, jitter, tracking glitches and dropouts.
+
+    Args:
+        num_disks (int): Disks in the game.
+        seed (int): Seeds the player's habits and noise.
+        width, height (int): Layout size the landmarks are in.
+        fps (float): Camera rate (one sample per frame).
+    """
+    rng = np.random.default_rng(seed)
+    layout = get_layout(width, height)
+    closed = rng.uniform(15, 40)      # Pinch distance when closed (pixels)
+    opened = rng.uniform(70, 130)     # ... and when open
+    jitter = rng.uniform(3, 12)
+    glitch = rng.uniform(0.002, 0.015) # Chance per frame of a bad distance reading
+    dropout = rng.uniform(0.0005, 0.004)
+    pace = rng.uniform(0.7, 1.4)      # Slower or faster than average
+    y = height // 2
+
+    times, present, landmarks = [], [], []
+    state = {"t": rng.uniform(0.5, 2.0), "x": float(layout.tower_x[0]), "lost": 0}
+
+    def emit(seconds: float, x_to: float, d_from: float, d_to: float) -> None:
+        frames = max(1, int(seconds * pace * fps))
+        x_from = state["x"]
+        for k in range(1, frames + 1):
+            a = k / frames
+            a = a * a * (3 - 2 * a)  # Ease in and out
+            x = x_from + (x_to - x_from) * a + rng.normal(0, jitter)
+            d = max(0.0, d_from + (d_to - d_from) * a + rng.normal(0, jitter))
+            if rng.random() < glitch:
+                d = opened + closed - d  # Misread finger: closed reads open and vice versa
+            if state["lost"] == 0 and rng.random() < dropout:
+                state["lost"] = int(rng.integers(1, 8))
+            times.append(state["t"])
+            if state["lost"]:
+                state["lost"] -= 1
+                present.append(False)
+                landmarks.append(((0, 0), (0, 0), (0, 0)))
+            else:
+                yy = y + rng.normal(0, jitter)
+                present.append(True)
+                landmarks.append(((x, yy - d / 2), (x, yy + d / 2), (x, yy + 150)))
+            state["t"] += 1.0 / fps
+        state["x"] = x_to
+
+    for source, target in hanoi_moves(num_disks):
+        emit(rng.uniform(0.3, 0.7), layout.tower_x[source], opened, opened)  # Reach
+        emit(rng.uniform(0.08, 0.15), layout.tower_x[source], opened, closed)  # Close
+        emit(rng.uniform(0.1, 0.3), layout.tower_x[source], closed, closed)  # Grip
+        emit(rng.uniform(0.3, 0.9), layout.tower_x[target], closed, closed)  # Carry
+        emit(rng.uniform(0.08, 0.15), layout.tower_x[target], closed, opened)  # Open
+    emit(0.5, state["x"], opened, opened)
+    return Trace(num_disks, width, height, np.array(times), np.array(present),
+                 np.array(landmarks, dtype=np.float32))
+
+
+def parse_range(spec: str) -> List[float]:
+    """'start:stop:step' (inclusive) or comma-separated values."""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        return [round(v, 6) for v in np.arange(start, stop + step / 2, step)]
+    return [float(part) for part in spec.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded hand traces over a grid of gesture settings.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    synth = sub.add_parser("synth", help="Write synthetic traces (for trying the sweep without recordings)")
+    synth.add_argument("--count", type=int, default=20)
+    synth.add_argument("--disks", type=int, default=4)
+    synth.add_argument("--seed", type=int, default=BENCH_SEED)
+    synth.add_argument("--out", default=TRACE_DIR)
+    run = sub.add_parser("run", help="Sweep settings and rank them")
+    run.add_argument("--traces", default=TRACE_DIR, help="Directory of .npz traces (main.py --record-traces)")
+    run.add_argument("--pinch-threshold", default=":".join(map(str, SWEEP_PINCH_THRESHOLDS)),
+                     help="start:stop:step or a,b,c (pixels)")
+    run.add_argument("--action-cooldown", default=":".join(map(str, SWEEP_ACTION_COOLDOWNS)),
+                     help="start:stop:step or a,b,c (seconds)")
+    run.add_argument("--hold-pulse-delay", default=str(PINCH_HOLD_PULSE_DELAY),
+                     help="start:stop:step or a,b,c (seconds; only changes the indicator)")
+    run.add_argument("--jobs", type=int, default=0, help="Worker processes (default: one per CPU)")
+    run.add_argument("--top", type=int, default=10)
+    run.add_argument("--report", metavar="FILE", help="Write the full ranking as JSON")
+    args = parser.parse_args()
+
+    if args.command == "synth":
+        os.makedirs(args.out, exist_ok=True)
+        for i in range(args.count):
+            save_trace(os.path.join(args.out, f"synthetic-{i:03d}.npz"), synthesize(args.disks, args.seed + i))
+        print(f"Wrote {args.count} traces to {args.out}")
+        return
+
+    traces = load_traces(args.traces)
+    if not traces:
+        sys.exit(f"No traces in {args.traces} (record with main.py --record-traces, or run synth)")
+    axes = {"pinch_threshold": parse_range(args.pinch_threshold),
+            "action_cooldown": parse_range(args.action_cooldown),
+            "hold_pulse_delay": parse_range(args.hold_pulse_delay)}
+    configs = [dict(zip(axes, values)) for values in itertools.product(*axes.values())]
+    default = {"pinch_threshold": float(PINCH_THRESHOLD), "action_cooldown": ACTION_COOLDOWN,
+               "hold_pulse_delay": PINCH_HOLD_PULSE_DELAY}
+    if default not in configs:
+        configs.append(default)  # Always ranked, as the baseline
+
+    samples = sum(len(trace.times) for trace in traces)
+    print(f"{len(configs)} settings x {len(traces)} traces ({samples} samples)")
+    started = time.perf_counter()
+    ranked = sweep(traces, configs, args.jobs)
+    elapsed = time.perf_counter() - started
+    print(f"{elapsed:.1f} s ({len(configs) * samples / elapsed / 1e6:.2f} M samples/s)")
+
+    header = f"{'rank':>5}{'score':>9}{'pinch':>8}{'cooldown':>10}" + "".join(f"{name[:12]:>13}" for name in COUNTS)
+    print(header + f"{'s/move':>8}")
+    baseline = next(i for i, (_, config, _) in enumerate(ranked) if config == default)
+    for i, (cost, config, totals) in enumerate(ranked):
+        if i < args.top or i == baseline:
+            marker = " (current)" if i == baseline else ""
+            print(f"{i + 1:>5}{cost:9.3f}{config['pinch_threshold']:8.1f}{config['action_cooldown']:10.3f}"
+                  + "".join(f"{totals[name]:13d}" for name in COUNTS) + f"{totals['seconds_per_move']:8.2f}{marker}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"traces": len(traces), "samples": samples, "weights": SWEEP_WEIGHTS,
+                       "ranking": [{"score": cost, "params": config, "totals": totals}
+                                   for cost, config, totals in ranked]}, f, indent=1)
+        print(f"Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, NamedTuple, Tuple, Any
+
+class DetectedHand(NamedTuple):
+    """
+    One hand found in a frame.
+    """
+    landmarks: List[Tuple[int, int]] # [Index Tip, Thumb Tip, Wrist] in pixels
+    handedness: str # "Left" or "Right" (from the player's point of view on a mirrored frame)
+    score: float # Handedness classification confidence
 
 class HandDetector:
     """
@@ -28,6 +36,17 @@ class HandDetector:
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence)
     
+    def warm_up(self, width: int = 640, height: int = 480) -> None:
+        """
+        Runs one inference on a blank frame so model initialization is not
+        paid on the first camera frame.
+
+        Args:
+            width (int): Frame width.
+            height (int): Frame height.
+        """
+        self.hands.process(np.zeros((height, width, 3), dtype=np.uint8))
+    
     def process_frame(self, frame: np.ndarray) -> Tuple[Optional[List[Tuple[int, int]]], np.ndarray]:
         """
         Process a video frame to detect hands and draw landmarks.
@@ -40,39 +59,59 @@ class HandDetector:
                 - A list of (x, y) coordinates for [Index Tip, Thumb Tip, Wrist] if detected, else None.
                 - The processed frame with landmarks drawn.
         """
+        hands, frame = self.process_frame_multi(frame, limit=1)
+        # We only process the primary hand
+        return (hands[0].landmarks if hands else None), frame
+    
+    def process_frame_multi(self, frame: np.ndarray, limit: Optional[int] = None) -> Tuple[List[DetectedHand], np.ndarray]:
+        """
+        Detects every hand in one inference pass (up to max_num_hands).
+
+        Args:
+            frame (np.ndarray): The BGR image frame from OpenCV.
+            limit (int): Stop after this many hands (landmarks are only drawn for those).
+
+        Returns:
+            Tuple[List[DetectedHand], np.ndarray]: The hands and the frame with landmarks drawn.
+        """
         # Convert BGR to RGB
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.hands.process(rgb_frame)
         
-        hand_landmarks_data: Optional[List[Tuple[int, int]]] = None
+        hands: List[DetectedHand] = []
+        if not results.multi_hand_landmarks:
+            return hands, frame
+        
+        # Get dimensions
+        h, w, _ = frame.shape
+        handedness = results.multi_handedness or []
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Draw landmarks on frame
-                self.mp_drawing.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style())
-                
-                # Get dimensions
-                h, w, _ = frame.shape
-                
-                # Extract key landmarks
-                index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-                wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-                
-                # Convert to pixel coordinates
-                index_x, index_y = int(index_tip.x * w), int(index_tip.y * h)
-                thumb_x, thumb_y = int(thumb_tip.x * w), int(thumb_tip.y * h)
-                wrist_x, wrist_y = int(wrist.x * w), int(wrist.y * h)
-                
-                # Store coordinates tuple: (index, thumb, wrist)
-                hand_landmarks_data = [(index_x, index_y), (thumb_x, thumb_y), (wrist_x, wrist_y)]
-                
-                # We only process the primary hand
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            if limit is not None and len(hands) >= limit:
                 break
-                
-        return hand_landmarks_data, frame
+            
+            # Draw landmarks on frame
+            self.mp_drawing.draw_landmarks(
+                frame,
+                hand_landmarks,
+                self.mp_hands.HAND_CONNECTIONS,
+                self.mp_drawing_styles.get_default_hand_landmarks_style(),
+                self.mp_drawing_styles.get_default_hand_connections_style())
+            
+            # Extract key landmarks
+            index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
+            thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
+            wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
+            
+            # Convert to pixel coordinates: (index, thumb, wrist)
+            landmarks = [(int(index_tip.x * w), int(index_tip.y * h)),
+                         (int(thumb_tip.x * w), int(thumb_tip.y * h)),
+                         (int(wrist.x * w), int(wrist.y * h))]
+            
+            label, score = "Unknown", 0.0
+            if i < len(handedness):
+                classification = handedness[i].classification[0]
+                label, score = classification.label, classification.score
+            hands.append(DetectedHand(landmarks, label, score))
+            
+        return hands, frame
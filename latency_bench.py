@@ -0,0 +1,279 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pygame
+from typing import Dict, List, Optional, Tuple
+from constants import *
+from frame_clock import FrameClock
+from game_state import TowerOfHanoiGame
+from render_bench import camera_frame, summarize
+from ui_renderer import GameRenderer
+
+BARCODE_BITS = 32
+BARCODE_CELL = (16, 8)  # Width and height of one bit in camera pixels
+
+STAGES = ("camera", "detect", "camera_surface", "logic", "render", "display", "total")
+
+
+def hand_pose(sequence: int, size: Tuple[int, int] = (640, 480)) -> List[Tuple[int, int]]:
+    """
+    The pose shown in a synthetic frame: a pinching hand sweeping left to
+    right, so the held disk's position on screen only ever increases
+    within a sweep and identifies the newest frame that reached the display.
+
+    Args:
+        sequence (int): Frame sequence id.
+        size (Tuple[int, int]): Camera image size (width, height).
+
+    Returns:
+        List[Tuple[int, int]]: [index tip, thumb tip, wrist] in (mirrored) camera pixels.
+    """
+    width, height = size
+    progress = (sequence % LATENCY_SWEEP_FRAMES) / LATENCY_SWEEP_FRAMES
+    x = int(width * 0.05 + width * 0.9 * progress)
+    y = height // 2
+    return [(x, y - 8), (x, y + 8), (x, y + 120)]
+
+
+def encode_sequence(image: np.ndarray, sequence: int) -> None:
+    """Writes the sequence id as a black/white barcode along the top edge."""
+    cell_w, cell_h = BARCODE_CELL
+    for bit in range(BARCODE_BITS):
+        value = 255 if sequence >> bit & 1 else 0
+        image[:cell_h, bit * cell_w:(bit + 1) * cell_w] = value
+
+
+def decode_sequence(image: np.ndarray) -> Optional[int]:
+    """Reads the barcode back (None if the strip is not there)."""
+    cell_w, cell_h = BARCODE_CELL
+    if image.shape[1] < BARCODE_BITS * cell_w or image.shape[0] < cell_h:
+        return None
+    centers = image[cell_h // 2, cell_w // 2:BARCODE_BITS * cell_w:cell_w].mean(axis=1)
+    if np.any((centers > 64) & (centers < 192)):
+        return None  # Not a clean barcode
+    return int(sum(1 << bit for bit, value in enumerate(centers) if value >= 128))
+
+
+class SyntheticCamera:
+    """
+    Stand-in for cv2.VideoCapture that produces numbered frames.
+
+    With a frame rate set, frame N is "exposed" at start + N / fps and read()
+    blocks until then, like a real camera. If the reader falls behind, the
+    driver queue holds `buffer` frames and older ones are dropped, so queueing
+    delay shows up in the measurements the way it would with real hardware.
+    """
+    def __init__(self, fps: float = LATENCY_CAMERA_FPS, buffer: int = LATENCY_CAMERA_BUFFER,
+                 size: Tuple[int, int] = (640, 480)) -> None:
+        """
+        Initialize the camera.
+
+        Args:
+            fps (float): Frame rate; 0 delivers a new frame on every read.
+            buffer (int): Frames queued before the oldest is dropped.
+            size (Tuple[int, int]): Image size (width, height).
+        """
+        self.fps = fps
+        self.buffer = buffer
+        self.size = size
+        self.start = time.perf_counter()
+        self.sequence = -1
+        self.capture_times: Dict[int, float] = {}
+        self.dropped = 0
+        # A few pre-rendered backgrounds so generating a frame costs only a copy
+        self.backgrounds = [np.ascontiguousarray(camera_frame(i * 8, size)[:, ::-1]) for i in range(8)]
+
+    def read(self) -> Tuple[bool, np.ndarray]:
+        sequence = self.sequence + 1
+        if self.fps > 0:
+            # Skip frames the driver queue would already have discarded
+            newest = int((time.perf_counter() - self.start) * self.fps)
+            if newest - sequence >= self.buffer:
+                self.dropped += newest - self.buffer + 1 - sequence
+                sequence = newest - self.buffer + 1
+
+        # Stored mirrored, since the game flips every frame before detection
+        image = self.backgrounds[sequence % len(self.backgrounds)].copy()
+        encode_sequence(image[:, ::-1], sequence)
+
+        now = time.perf_counter()
+        if self.fps > 0:
+            captured = self.start + sequence / self.fps
+            if captured > now:
+                time.sleep(captured - now)
+        else:
+            captured = now
+        self.sequence = sequence
+        self.capture_times[sequence] = captured
+        return True, image
+
+    def release(self) -> None:
+        pass
+
+
+class SyntheticHandDetector:
+    """
+    Stand-in for HandDetector that decodes the barcode and returns the pose
+    the frame was generated with. Wrapping the real detector runs MediaPipe
+    on every frame for its cost, while the pose still comes from the barcode.
+    """
+    def __init__(self, inner=None) -> None:
+        self.inner = inner
+        self.sequence: Optional[int] = None
+
+    def process_frame(self, frame: np.ndarray) -> Tuple[Optional[List[Tuple[int, int]]], np.ndarray]:
+        self.sequence = decode_sequence(frame)
+        if self.inner is not None:
+            _, frame = self.inner.process_frame(frame)
+        if self.sequence is None:
+            return None, frame
+        height, width = frame.shape[:2]
+        return hand_pose(self.sequence, (width, height)), frame
+
+
+def run_latency(renderer: GameRenderer, camera: SyntheticCamera, detector: SyntheticHandDetector,
+                frames: int = LATENCY_FRAMES, display_fps: int = FPS) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+    """
+    Runs the main-loop pipeline on synthetic frames and times each frame
+    from exposure until the held disk is drawn at (or past) its pose.
+
+    Stages, in milliseconds:
+        camera          exposure -> read() returns (queueing in the driver)
+        detect          read -> detection done (includes the mirror flip)
+        camera_surface  preview upload
+        logic           until a logic step applies the pose (waits for the fixed step)
+        render          until the first frame rendered after that is flipped
+        display         extra frames until the interpolated position reaches the pose
+        total           exposure -> photon
+
+    Args:
+        renderer (GameRenderer): Headless renderer.
+        camera (SyntheticCamera): Frame source.
+        detector (SyntheticHandDetector): Detector returning the encoded pose.
+        frames (int): Camera frames to run.
+        display_fps (int): Loop pacing, like the game's clock.tick (0 = unpaced).
+
+    Returns:
+        Tuple[Dict[str, List[float]], Dict[str, int]]: Per-stage samples and counters
+            (measured, lost at a sweep restart, camera drops).
+    """
+    frame_clock = FrameClock()
+    game = TowerOfHanoiGame(num_disks=3, clock=frame_clock)
+    game.start_game()
+    pace = pygame.time.Clock()
+
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    counts = {"measured": 0, "unmatched": 0}
+    pending: Dict[int, Dict[str, float]] = {}  # Frames read but not yet displayed
+    applied: List[Tuple[int, int]] = []        # (sequence, window x) awaiting the photon
+
+    for _ in range(frames):
+        frame_clock.tick()
+        ok, frame = camera.read()
+        sequence = camera.sequence
+        stamps = {"captured": camera.capture_times.pop(sequence), "read": time.perf_counter()}
+
+        # Same steps as the game loop
+        frame = np.ascontiguousarray(frame[:, ::-1])
+        hand_landmarks, frame = detector.process_frame(frame)
+        stamps["detect"] = time.perf_counter()
+        renderer.prepare_camera_surface(frame)
+        stamps["camera_surface"] = time.perf_counter()
+
+        settling = sequence % LATENCY_SWEEP_FRAMES < LATENCY_SETTLE_FRAMES
+        if detector.sequence == sequence and not settling:
+            pending[sequence] = stamps
+
+        scaled_landmarks = None
+        if hand_landmarks:
+            cam_h, cam_w = frame.shape[:2]
+            scale_x, scale_y = renderer.width / cam_w, renderer.height / cam_h
+            scaled_landmarks = [(x * scale_x, y * scale_y) for x, y in hand_landmarks]
+
+        while frame_clock.step():
+            game.step(frame_clock.fixed_dt)
+        game.update_interaction(scaled_landmarks, renderer.layout)
+        if sequence in pending:
+            pending[sequence]["logic"] = time.perf_counter()
+            applied.append((sequence, game.hand_position[0]))
+        game.events.dispatch()
+
+        # The renderer draws the latest hand position
+        drawn = game.hand_position
+        renderer.render(game)
+        flipped = time.perf_counter()
+
+        remaining = []
+        for applied_sequence, expected_x in applied:
+            stamps = pending[applied_sequence]
+            stamps.setdefault("render", flipped)
+            if drawn is not None and expected_x <= drawn[0] < expected_x + renderer.width // 4:
+                del pending[applied_sequence]
+                samples["camera"].append(stamps["read"] - stamps["captured"])
+                samples["detect"].append(stamps["detect"] - stamps["read"])
+                samples["camera_surface"].append(stamps["camera_surface"] - stamps["detect"])
+                samples["logic"].append(stamps["logic"] - stamps["camera_surface"])
+                samples["render"].append(stamps["render"] - stamps["logic"])
+                samples["display"].append(flipped - stamps["render"])
+                samples["total"].append(flipped - stamps["captured"])
+                counts["measured"] += 1
+            elif drawn is not None and drawn[0] < expected_x - renderer.width // 2:
+                # The sweep restarted before this position was ever drawn
+                del pending[applied_sequence]
+                counts["unmatched"] += 1
+            else:
+                remaining.append((applied_sequence, expected_x))
+        applied = remaining
+
+        if display_fps:
+            pace.tick(display_fps)
+
+    counts["camera_dropped"] = camera.dropped
+    return {stage: [value * 1e3 for value in values] for stage, values in samples.items()}, counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless motion-to-photon latency measurement.")
+    parser.add_argument("--frames", type=int, default=LATENCY_FRAMES)
+    parser.add_argument("--camera-fps", type=float, default=LATENCY_CAMERA_FPS,
+                        help="Synthetic camera rate (0 = a new frame on every read)")
+    parser.add_argument("--camera-buffer", type=int, default=LATENCY_CAMERA_BUFFER)
+    parser.add_argument("--display-fps", type=int, default=FPS, help="Loop pacing (0 = unpaced)")
+    parser.add_argument("--backend", default=RENDER_BACKEND, choices=("surface", "texture"))
+    parser.add_argument("--size", type=int, nargs=2, default=(SCREEN_WIDTH, SCREEN_HEIGHT), metavar=("W", "H"))
+    parser.add_argument("--mediapipe", action="store_true",
+                        help="Also run the real hand detector on every frame (pose still comes from the barcode)")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    renderer = GameRenderer(*args.size, backend=args.backend, headless=True)
+    inner = None
+    if args.mediapipe:
+        from hand_detector import HandDetector
+        inner = HandDetector()
+        inner.warm_up()
+    camera = SyntheticCamera(args.camera_fps, args.camera_buffer)
+    samples, counts = run_latency(renderer, camera, SyntheticHandDetector(inner), args.frames, args.display_fps)
+
+    if not samples["total"]:
+        print("No frame reached the display.")
+        sys.exit(1)
+
+    results = {stage: summarize(values) for stage, values in samples.items()}
+    print(f"{'stage':<16}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}")
+    for stage, stats in results.items():
+        print(f"{stage:<16}" + "".join(f"{stats[k]:8.2f}" for k in ("mean", "p50", "p95", "p99", "max")))
+    print("  ".join(f"{name} {value}" for name, value in counts.items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": "texture" if renderer.gpu else "surface", "size": list(args.size),
+                       "camera_fps": args.camera_fps, "display_fps": args.display_fps,
+                       "stages": results, "counts": counts}, f, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
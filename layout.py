@@ -0,0 +1,139 @@
+import pygame
+from typing import Tuple
+from constants import *
+from render_cache import LRUCache
+
+_cache = LRUCache(LAYOUT_CACHE_SIZE)
+
+
+class Layout:
+    """
+    Geometry of every widget and input zone for one window size.
+
+    The renderer, mouse hit-testing and gesture tower lookup all read from
+    here, so drawing and input can never disagree. Use get_layout() to get
+    the cached instance for a size; treat the rects as read-only.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Computes the layout.
+
+        Args:
+            width (int): Window width.
+            height (int): Window height.
+        """
+        self.width = width
+        self.height = height
+        cx, cy = width // 2, height // 2
+
+        # --- Game screen ---
+        self.stage_ground_y = cy + 150
+        self.tower_x: Tuple[int, int, int] = (width // 4, width // 2, 3 * width // 4)
+        self.post_label_centers = tuple((x, self.stage_ground_y + 40) for x in self.tower_x)
+
+        # Gesture zones: the window split into three columns
+        self.zone_edges: Tuple[float, float] = (width / 3, 2 * width / 3)
+
+        self.hud_panel = pygame.Rect(30, 30, 220, 90)
+        self.hud_time_center = (self.hud_panel.centerx, self.hud_panel.top + 25)
+        self.hud_moves_center = (self.hud_panel.centerx, self.hud_panel.bottom - 25)
+
+        # Panels shrink to fit narrow split-screen views
+        self.message_panel = pygame.Rect(0, 0, min(600, width - 40), 60)
+        self.message_panel.center = (cx, 60)
+        if self.message_panel.left < self.hud_panel.right + 10:
+            self.message_panel.top = self.hud_panel.bottom + 15 # Below the HUD when they would overlap
+
+        self.win_panel = pygame.Rect(0, 0, min(500, width - 40), 250)
+        self.win_panel.center = (cx, cy)
+        self.win_title_center = (cx, cy - 50)
+        self.win_subtitle_center = (cx, cy + 10)
+        self.win_hint_center = (cx, cy + 60)
+
+        # Camera preview (top right): 320x240 feed inside a padded panel
+        self.camera_feed = pygame.Rect(width - 320 - 30, 30, 320, 240)
+        self.camera_panel = pygame.Rect(self.camera_feed.x - 10, self.camera_feed.y - 10, 320 + 20, 240 + 20 + 30)
+        self.camera_label_pos = (self.camera_panel.centerx, self.camera_feed.bottom + 8)
+
+        # Player name under the board in split-screen views
+        self.player_label_center = (cx, height - 40)
+
+        # Debug overlay grows upwards from the bottom-left corner
+        self.debug_anchor = (30, height - 30)
+
+        # --- Play screen ---
+        self.play_panel = pygame.Rect(0, 0, 700, 500)
+        self.play_panel.center = (cx, cy)
+        self.play_title_center = (cx, self.play_panel.top + 70)
+        self.play_subtitle_center = (cx, self.play_panel.top + 130)
+        self.play_rule = ((self.play_panel.left + 80, self.play_panel.top + 160),
+                          (self.play_panel.right - 80, self.play_panel.top + 160))
+        self.play_instructions_y = self.play_panel.top + 200
+
+        self.startup_status_center = (cx, self.play_panel.bottom + 30)
+
+        self.play_button = pygame.Rect(0, 0, 240, 60)
+        self.play_button.center = (cx, self.play_panel.bottom - 110)
+
+        self.difficulty_panel = pygame.Rect(0, 0, 260, 40)
+        self.difficulty_panel.center = (cx, self.play_panel.bottom - 45)
+        diff_y = self.difficulty_panel.centery - 2
+        self.difficulty_left_center = (self.difficulty_panel.left - 20, diff_y)
+        self.difficulty_right_center = (self.difficulty_panel.right + 20, diff_y)
+
+        # Arrow hit boxes are larger than the glyphs so they are easy to click
+        self.difficulty_left = pygame.Rect(0, 0, ARROW_HIT_SIZE, ARROW_HIT_SIZE)
+        self.difficulty_left.center = self.difficulty_left_center
+        self.difficulty_right = pygame.Rect(0, 0, ARROW_HIT_SIZE, ARROW_HIT_SIZE)
+        self.difficulty_right.center = self.difficulty_right_center
+
+    def tower_zone(self, x: float) -> int:
+        """
+        Maps a horizontal window position to the tower whose zone contains it.
+
+        Args:
+            x (float): Window x coordinate.
+
+        Returns:
+            int: Tower index (0-2).
+        """
+        if x < self.zone_edges[0]:
+            return 0
+        if x < self.zone_edges[1]:
+            return 1
+        return 2
+
+    def difficulty_hit(self, pos: Tuple[int, int]) -> int:
+        """
+        Tests a click against the difficulty arrows.
+
+        Args:
+            pos (Tuple[int, int]): Click position.
+
+        Returns:
+            int: -1 for the left arrow, 1 for the right arrow, 0 for neither.
+        """
+        if self.difficulty_left.collidepoint(pos):
+            return -1
+        if self.difficulty_right.collidepoint(pos):
+            return 1
+        return 0
+
+
+def get_layout(width: int, height: int) -> Layout:
+    """
+    Cached Layout for a window size.
+
+    Args:
+        width (int): Window width.
+        height (int): Window height.
+
+    Returns:
+        Layout: The shared layout for that size.
+    """
+    key = (width, height)
+    layout = _cache.get(key)
+    if layout is None:
+        layout = Layout(width, height)
+        _cache.put(key, layout)
+    return layout
@@ -1,81 +1,171 @@
-import cv2
 import sys
+from startup import ImportTimer, Startup
+
+# Time every import from here on (reported with --import-time). Only when
+# run as the program: importing this module must not hook __import__.
+import_timer = ImportTimer()
+if __name__ == "__main__":
+    import_timer.install()
+
+import os
+import argparse
 import pygame
-import time
 import numpy as np
 from typing import Optional, List, Tuple
 from constants import *
-from hand_detector import HandDetector
 from game_state import TowerOfHanoiGame
+from events import EventType
+from analytics import AnalyticsStore, SessionRecorder
+from asset_cache import AssetCache
+from sound import SoundManager
+from metrics import FrameMetrics, MetricsExporter
+from allocations import AllocationTracker
+from profiling import FrameProfiler
+from players import PlayerAssigner
+from broadcast import StatePublisher, UdpTransport
+from traces import TraceRecorder
+from frame_clock import FrameClock
 from ui_renderer import GameRenderer
 
-class SoundManager:
-    """
-    Manages synthetic sound effects for the game.
-    """
-    def __init__(self):
-        pygame.mixer.init(frequency=44100, size=-16, channels=1)
-        self.sounds = {}
-        self.generate_sounds()
-        
-    def generate_wave(self, frequency: float, duration: float, volume: float = 0.5):
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, n_samples, False)
-        
-        # Sine wave with decay
-        wave = np.sin(frequency * t * 2 * np.pi)
-        
-        # Apply decay envelope
-        decay = np.linspace(1.0, 0.0, n_samples)
-        wave = wave * decay * volume
-        
-        # Convert to 16-bit signed integers
-        wave = (wave * 32767).astype(np.int16)
-        return pygame.sndarray.make_sound(wave)
-
-    def generate_sounds(self):
-        # Pickup: Non-intrusive high blip
-        self.sounds['PICKUP'] = self.generate_wave(600, 0.1, 0.3)
-        
-        # Drop Valid: Satisfying lower thud/click
-        self.sounds['DROP_VALID'] = self.generate_wave(400, 0.15, 0.4)
-        
-        # Drop Invalid: Low buzz
-        # Complex wave for error? Just simple low tone for now
-        self.sounds['DROP_INVALID'] = self.generate_wave(150, 0.3, 0.4)
-        
-        # Win: Ascending arpeggio
-        # We can play multiple sounds or a pre-mixed buffer.
-        # For simplicity, just a "Ding" high note
-        self.sounds['WIN'] = self.generate_wave(880, 0.8, 0.5)
-        
-        # Reset
-        self.sounds['RESET'] = self.generate_wave(300, 0.2, 0.3)
-
-    def play(self, event_name: str):
-        if event_name in self.sounds:
-            self.sounds[event_name].play()
-
-def main():
-    # Initialize components
-    # Start capturing
+def open_camera():
+    # Runs on a startup thread; OpenCV is only imported here
+    import cv2
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
-        print("Error: Could not open camera.")
-        sys.exit()
+        raise RuntimeError("Could not open camera.")
     
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    return cap
+
+def load_hand_detector(max_num_hands: int = 1):
+    # Runs on a startup thread: importing MediaPipe and building the model
+    # take seconds, and one warm-up inference keeps the first real frame fast
+    from hand_detector import HandDetector
+    hand_detector = HandDetector(max_num_hands=max_num_hands)
+    hand_detector.warm_up()
+    return hand_detector
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture-controlled Tower of Hanoi.")
+    parser.add_argument("--rebuild-cache", action="store_true",
+                        help="Discard the startup asset cache and rebuild it")
+    parser.add_argument("--import-time", nargs="?", const="-", metavar="FILE",
+                        help="Report import and startup timings on exit (to FILE, default stderr)")
+    parser.add_argument("--metrics-dump", metavar="FILE",
+                        help=f"Write frame timing percentiles every {METRICS_DUMP_INTERVAL:g}s (.json or .csv)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve frame timing percentiles at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--alloc-profile", nargs="?", const="-", metavar="FILE",
+                        help="Trace per-stage allocations and GC pauses; report on exit (to FILE, default stderr)")
+    parser.add_argument("--profile-frames", type=int, metavar="N",
+                        help=f"Profile the first N frames of the main loop (results in {PROFILE_DIR})")
+    parser.add_argument("--profile-mode", choices=("cprofile", "sample"), default="cprofile",
+                        help="cProfile for exact call counts, or low-overhead stack sampling")
+    parser.add_argument("--players", type=int, default=1, choices=range(1, MAX_PLAYERS + 1),
+                        help="Split-screen competition, one hand per player")
+    parser.add_argument("--broadcast", nargs="?", const=f"{BROADCAST_GROUP}:{BROADCAST_PORT}", metavar="GROUP:PORT",
+                        help="Stream game state to spectators (`python broadcast.py view`); player i uses PORT+i")
+    parser.add_argument("--record-traces", nargs="?", const=TRACE_DIR, metavar="DIR",
+                        help=f"Save each game's hand landmarks for gesture_sweep.py (default {TRACE_DIR})")
+    args = parser.parse_args()
+    startup = Startup()
+    
+    # Sounds, font paths and backgrounds load from disk after the first launch
+    assets = AssetCache()
+    if args.rebuild_cache:
+        assets.clear()
+        
+    # Window and play screen first (mixer format must be set before pygame.init)
+    pygame.mixer.pre_init(frequency=44100, size=-16, channels=1)
+    # Split screen composites views of one display surface
+    backend = RENDER_BACKEND if args.players == 1 else "surface"
+    renderer = GameRenderer(SCREEN_WIDTH, SCREEN_HEIGHT, backend=backend, assets=assets)
+    renderer.set_players(args.players)
+    frame_clock = FrameClock()
+    
+    # One game per player; the first one drives the shared play screen
+    games = [TowerOfHanoiGame(num_disks=3, clock=frame_clock) for _ in range(args.players)]
+    game = games[0]
+    assigner = PlayerAssigner(args.players)
+    winner = None
+    renderer.startup_status = "Starting..."
+    renderer.render(game)
+    startup.mark("first frame")
+    
+    # Slow work continues in the background while the play screen is up
+    startup.start("camera", open_camera)
+    startup.start("hand tracking", lambda: load_hand_detector(args.players))
+    cap = None
+    hand_detector = None
     
-    renderer = GameRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
-    hand_detector = HandDetector()
-    game = TowerOfHanoiGame(num_disks=3)
-    sound_manager = SoundManager()
+    sound_manager = SoundManager(assets)
+    
+    # Analytics are written off-thread; the loop only queues records
+    analytics = AnalyticsStore(os.path.join(DATA_DIR, ANALYTICS_DB_FILE))
+    recorders = []
+    traces = []
+    
+    # Event subscribers (each drains the bus at its own pace)
+    for i, player_game in enumerate(games):
+        player_game.events.subscribe(sound_manager.on_event)
+        player_game.events.subscribe(renderer.view_event_handler(i) if renderer.views else renderer.on_event)
+        recorder = SessionRecorder(analytics, player_game)
+        player_game.events.subscribe(recorder.on_event)
+        recorders.append(recorder)
+        if args.record_traces:
+            trace = TraceRecorder(player_game, args.record_traces, player=i)
+            player_game.events.subscribe(trace.on_event)
+            traces.append(trace)
+    
+    # Per-stage frame timing (F3 toggles the overlay)
+    metrics = FrameMetrics()
+    exporter = MetricsExporter(metrics, args.metrics_dump, port=args.metrics_port)
+    allocations = None
+    if args.alloc_profile:
+        allocations = metrics.allocations = AllocationTracker().start()
+    
+    # Spectator streams, one per player
+    publishers = []
+    if args.broadcast:
+        group, _, port = args.broadcast.rpartition(":")
+        publishers = [StatePublisher(UdpTransport(group, int(port) + i)) for i in range(len(games))]
+    show_debug = False
+    next_debug_refresh = 0.0
+    
+    # On-demand profiling: F9 (shift for sampling), SIGUSR1/SIGUSR2 or --profile-frames
+    profiler = FrameProfiler(tags=lambda: {
+        "disks": game.num_disks,
+        "players": len(games),
+        "backend": "texture" if renderer.gpu is not None else "surface",
+        "size": f"{renderer.width}x{renderer.height}",
+        "fps": FPS,
+    })
+    profiler.install_signal_handlers()
+    if args.profile_frames:
+        profiler.request(args.profile_frames, args.profile_mode)
     
     running = True
     
     while running:
+        profiler.frame_start()
+        t = metrics.begin_frame()
+        
+        # One timestamp per frame; logic below advances in fixed steps
+        frame_clock.tick()
+        
+        # Pick up startup work as it finishes
+        if cap is None or hand_detector is None:
+            failed = startup.failed()
+            if failed is not None:
+                print(f"Error: {failed.name} failed: {failed.error}")
+                break
+            cap = startup.result("camera")
+            hand_detector = startup.result("hand tracking")
+            renderer.startup_status = startup.status()
+            if startup.ready:
+                startup.mark("ready")
+        
         # Event Loop
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -83,117 +173,179 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     if game.game_started:
-                        game.game_started = False
-                        game.show_play_screen = True
+                        for player_game in games:
+                            player_game.game_started = False
+                            player_game.show_play_screen = True
                     else:
                         running = False
                 elif event.key == pygame.K_r:
-                    game.reset_game()
+                    winner = None
+                    for player_game in games:
+                        player_game.reset_game()
+                elif event.key == pygame.K_F3:
+                    show_debug = not show_debug
+                    renderer.debug_lines = None
+                elif event.key == pygame.K_F9 and not profiler.active:
+                    mode = "sample" if event.mod & pygame.KMOD_SHIFT else "cprofile"
+                    profiler.request(PROFILE_FRAMES, mode)
+                    game.show_action_message(f"Profiling {PROFILE_FRAMES} frames ({mode})")
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if game.show_play_screen:
-                    if renderer.play_button_rect.collidepoint(event.pos):
-                        game.show_play_screen = False
-                        game.game_started = True
-                        game.reset_game()
-                        game.start_time = time.time()
-                        game.timer_active = True
-                        game.show_action_message("Game started! Pinch to move disks")
-                        sound_manager.play('PICKUP') # Start sound
+                    # Hit-test against the same layout the renderer draws
+                    layout = renderer.layout
+                    if layout.play_button.collidepoint(event.pos) and hand_detector is not None:
+                        winner = None
+                        for player_game in games:
+                            player_game.start_game()
                         
-                    # Difficulty
-                    # Center of screen calc for hitboxes
-                    diff_y = renderer.play_button_rect.bottom + 65 # Approx position from renderer logic
-                    # To be robust, we should ask renderer. 
-                    # But for now, simple rect logic relative to center
-                    cx, cy = renderer.width//2, renderer.height//2
-                    
-                    # Difficulty arrows (Hardcoded matching renderer visual approx)
-                    # Renderer draws arrows at diff_bg.left - 20 etc.
-                    # Let's just use a wide area check around projected positions
-                    
-                    # Diff box center y is roughly play_button + 150?
-                    # Let's rely on standard positions
-                    diff_cy = cy + 205 # From old renderer logic, refined renderer aligns differently
-                    
-                    # Improved Hitbox logic:
-                    # Let's define hitboxes based on window center
-                    w, h = renderer.width, renderer.height
-                    
-                    # Left Arrow
-                    left_arrow = pygame.Rect(w//2 - 150, h//2 + 190, 60, 60)
-                    # Right Arrow
-                    right_arrow = pygame.Rect(w//2 + 90, h//2 + 190, 60, 60)
-                    
-                    if left_arrow.collidepoint(event.pos):
-                        game.num_disks = max(2, game.num_disks - 1)
-                        game.reset_game()
-                        sound_manager.play('PICKUP') # Beep
-                    elif right_arrow.collidepoint(event.pos):
-                         game.num_disks = min(5, game.num_disks + 1)
-                         game.reset_game()
-                         sound_manager.play('PICKUP') # Beep
+                    # Difficulty arrows; shift-click steps faster for large-N challenge runs
+                    direction = layout.difficulty_hit(event.pos)
+                    if direction:
+                        step = DIFFICULTY_FAST_STEP if pygame.key.get_mods() & pygame.KMOD_SHIFT else 1
+                        num_disks = min(MAX_DISKS, max(MIN_DISKS, game.num_disks + direction * step))
+                        for player_game in games:
+                            player_game.num_disks = num_disks
+                            player_game.reset_game()
+                        game.events.publish(EventType.DIFFICULTY_CHANGED, disk=num_disks)
                         
             elif event.type == pygame.VIDEORESIZE:
                 renderer.handle_resize(event.w, event.h)
+        t = metrics.lap("events", t)
 
         # Camera
-        ret, frame = cap.read()
-        if not ret:
-            break
-            
-        frame = cv2.flip(frame, 1)
-        
-        # Hand Detection
-        hand_landmarks, processed_frame = hand_detector.process_frame(frame)
-        
-        # Prepare camera surface for rendering
-        renderer.prepare_camera_surface(processed_frame)
-        
-        # Game Logic
-        if game.game_started and not game.game_won:
-            # We need to scale hand coords to screen
-            scaled_landmarks = None
-            if hand_landmarks:
-                # Scale from Camera (640x480) to Window
-                cam_w = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-                cam_h = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-                
-                scale_x = renderer.width / cam_w
-                scale_y = renderer.height / cam_h
+        hand_landmarks = None
+        hands = None # Set (possibly empty) on frames where multi-hand detection ran
+        input_start = None # When this frame's camera sample was read, for analytics latency
+        if cap is not None:
+            input_start = t
+            ret, frame = cap.read()
+            if not ret:
+                break
+            t = metrics.lap("camera_read", t)
                 
-                scaled_landmarks = []
-                for x, y in hand_landmarks:
-                    scaled_landmarks.append((x * scale_x, y * scale_y))
+            # Mirror
+            frame = np.ascontiguousarray(frame[:, ::-1])
+            t = metrics.lap("flip", t)
+            
+            # Hand Detection (one pass finds every player's hand)
+            if hand_detector is not None:
+                if len(games) == 1:
+                    hand_landmarks, frame = hand_detector.process_frame(frame)
+                else:
+                    hands, frame = hand_detector.process_frame_multi(frame)
+                t = metrics.lap("detect", t)
             
-            game.update_interaction(scaled_landmarks, renderer.width)
+            # Prepare camera surface for rendering
+            renderer.prepare_camera_surface(frame)
+            t = metrics.lap("camera_surface", t)
+        
+        # We need to scale hand coords to screen
+        player_landmarks = [None] * len(games)
+        if hand_landmarks:
+            # Scale from Camera (640x480) to Window
+            cam_h, cam_w = frame.shape[:2]
             
-            # Sound Trigger
-            if game.last_event:
-                if game.last_event == 'DROP_VALID':
-                    sound_manager.play('DROP_VALID')
-                elif game.last_event == 'DROP_INVALID':
-                    sound_manager.play('DROP_INVALID')
-                elif game.last_event == 'PICKUP':
-                    sound_manager.play('PICKUP')
+            scale_x = renderer.width / cam_w
+            scale_y = renderer.height / cam_h
             
-            if game.check_win():
-                if not game.game_won: # Just happened
-                     sound_manager.play('WIN')
-                game.game_won = True
-                game.timer_active = False
-                game.show_action_message("Victory!")
+            scaled_landmarks = []
+            for x, y in hand_landmarks:
+                scaled_landmarks.append((x * scale_x, y * scale_y))
+            player_landmarks[0] = scaled_landmarks
+        elif hands is not None:
+            # Each player's camera column maps onto their own view. The assigner
+            # sees frames without hands too, so absent players are released.
+            cam_h, cam_w = frame.shape[:2]
+            scale_x = renderer.width / cam_w
+            scale_y = renderer.height / cam_h
+            column_w = cam_w / len(games)
+            for i, hand in enumerate(assigner.assign(hands, cam_w)):
+                if hand is not None:
+                    player_landmarks[i] = [((x - i * column_w) * scale_x, y * scale_y) for x, y in hand.landmarks]
+        
+        # Game Logic (fixed timestep, same result at any frame rate)
+        while frame_clock.step():
+            for player_game in games:
+                player_game.step(frame_clock.fixed_dt)
+
+        # Each camera sample is applied once, whether the frame ran zero or several steps
+        for i, player_game in enumerate(games):
+            if player_game.game_started and not player_game.game_won:
+                player_game.update_interaction(player_landmarks[i], renderer.player_layout(i))
+                if traces:
+                    traces[i].add(player_landmarks[i], renderer.player_layout(i))
                 
-        if game.timer_active:
-             game.elapsed_time = time.time() - game.start_time
+                if player_game.finish_if_won():
+                    # Competitive mode: the first finisher is announced on every board
+                    if len(games) > 1 and winner is None:
+                        winner = i
+                        for other in games:
+                            if other is not player_game:
+                                other.show_action_message(f"Player {i + 1} wins!")
+        t = metrics.lap("logic", t)
+             
+        # Deliver this frame's events (sound, renderer effects, ...)
+        for player_game in games:
+            player_game.events.dispatch()
+        t = metrics.lap("dispatch", t)
+        
+        # Debug overlay text changes a few times per second, not every frame
+        if show_debug and t >= next_debug_refresh:
+            renderer.debug_lines = metrics.hud_lines()
+            next_debug_refresh = t + int(METRICS_HUD_REFRESH * 1e9)
              
         # Render
-        renderer.render(game)
+        if renderer.views and not game.show_play_screen:
+            renderer.render_split(games)
+        else:
+            renderer.render(game)
+        t = metrics.lap("render", t)
+        if input_start is not None:
+            for recorder in recorders:
+                recorder.frame_displayed((t - input_start) / 1e6)
+        if publishers:
+            for publisher, player_game in zip(publishers, games):
+                publisher.publish(player_game)
+            t = metrics.lap("broadcast", t)
+        metrics.end_frame(t)
         
         renderer.clock.tick(FPS)
+        metrics.lap("tick", t)
+        exporter.poll()
+        
+        output = profiler.frame_end()
+        if output is not None:
+            print(f"Profile written to {output}.*")
         
-    cap.release()
+    if profiler.active:
+        print(f"Profile written to {profiler.finish()}.*")
+    exporter.close()
+    for publisher in publishers:
+        publisher.transport.close()
+    for recorder in recorders:
+        recorder.end_session(won=False)
+    for trace in traces:
+        trace.finish()
+    analytics.close()
+    if cap is not None:
+        cap.release()
     pygame.quit()
-    cv2.destroyAllWindows()
+    
+    if allocations is not None:
+        allocations.stop()
+        out = sys.stderr if args.alloc_profile == "-" else open(args.alloc_profile, "w")
+        allocations.report(out)
+        for violation in allocations.check_budgets():
+            out.write(f"over budget: {violation}\n")
+        if out is not sys.stderr:
+            out.close()
+    
+    if args.import_time:
+        out = sys.stderr if args.import_time == "-" else open(args.import_time, "w")
+        startup.report(out)
+        import_timer.report(out)
+        if out is not sys.stderr:
+            out.close()
 
 if __name__ == "__main__":
     main()
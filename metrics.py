@@ -0,0 +1,237 @@
+import os
+import csv
+import json
+import time
+import threading
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from constants import *
+
+
+class StageRing:
+    """
+    Fixed-size ring of durations (nanoseconds) for one stage.
+    """
+    def __init__(self, capacity: int) -> None:
+        self.samples = np.zeros(capacity, dtype=np.int64)
+        self.index = 0
+        self.count = 0
+
+    def add(self, duration_ns: int) -> None:
+        self.samples[self.index] = duration_ns
+        self.index = (self.index + 1) % len(self.samples)
+        self.count += 1
+
+    def window(self) -> np.ndarray:
+        """The samples currently held (oldest ones overwritten)."""
+        return self.samples[:min(self.count, len(self.samples))]
+
+
+class FrameMetrics:
+    """
+    Per-stage frame timing from perf_counter_ns spans.
+
+    Recording is a subtraction and an array store, so it can stay on in
+    production. Statistics are computed from the rings only when asked for
+    (HUD refresh, dumps, the metrics endpoint).
+
+    Usage in the loop:
+        t = metrics.begin_frame()
+        ...
+        t = metrics.lap("camera", t)
+        ...
+        metrics.end_frame(t)
+    """
+    def __init__(self, capacity: int = METRICS_CAPACITY, target_fps: int = FPS) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            capacity (int): Frames kept per stage for the rolling percentiles.
+            target_fps (int): Frame rate whose budget defines a dropped frame.
+        """
+        self.capacity = capacity
+        self.budget_ns = int(1e9 / target_fps)
+        self.stages: Dict[str, StageRing] = {}
+        self.frame_start: Optional[int] = None
+        self.frames = 0
+        self.dropped_frames = 0
+        self.over_budget = 0
+        self.allocations = None  # Optional AllocationTracker fed the same stages
+
+    def begin_frame(self) -> int:
+        """
+        Marks the start of a frame; the interval since the previous one is the
+        real frame period, which also catches time lost outside the loop body.
+
+        Returns:
+            int: Start timestamp to pass to lap().
+        """
+        now = time.perf_counter_ns()
+        if self.frame_start is not None:
+            interval = now - self.frame_start
+            self.record("interval", interval)
+            # Each whole budget the frame overran is a frame the display missed
+            missed = interval // self.budget_ns - 1
+            if missed > 0:
+                self.dropped_frames += int(missed)
+        self.frame_start = now
+        if self.allocations is not None:
+            self.allocations.begin_frame()
+        return now
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        ring = self.stages.get(stage)
+        if ring is None:
+            ring = self.stages[stage] = StageRing(self.capacity)
+        ring.add(duration_ns)
+
+    def lap(self, stage: str, start_ns: int) -> int:
+        """
+        Records the time since start_ns under a stage.
+
+        Returns:
+            int: Current timestamp, the start of the next span.
+        """
+        now = time.perf_counter_ns()
+        self.record(stage, now - start_ns)
+        if self.allocations is not None:
+            self.allocations.lap(stage)
+        return now
+
+    def end_frame(self, now: Optional[int] = None) -> None:
+        """Records the whole loop body (excluding the frame-rate sleep if lapped separately)."""
+        if self.frame_start is None:
+            return
+        work = (now if now is not None else time.perf_counter_ns()) - self.frame_start
+        self.record("frame", work)
+        self.frames += 1
+        if work > self.budget_ns:
+            self.over_budget += 1
+        if self.allocations is not None:
+            self.allocations.end_frame()
+
+    def stage_stats(self, stage: str) -> Dict[str, float]:
+        """
+        Rolling statistics for one stage, in milliseconds.
+
+        Returns:
+            Dict[str, float]: count, mean, p50, p95, p99 and max.
+        """
+        samples = self.stages[stage].window()
+        if len(samples) == 0:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99)) / 1e6
+        return {"count": int(self.stages[stage].count), "mean": float(samples.mean() / 1e6),
+                "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(samples.max() / 1e6)}
+
+    def snapshot(self) -> dict:
+        """All stages plus frame counters (JSON-serializable)."""
+        return {
+            "timestamp": time.time(),
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "over_budget": self.over_budget,
+            "budget_ms": self.budget_ns / 1e6,
+            "stages": {stage: self.stage_stats(stage) for stage in self.stages},
+        }
+
+    def hud_lines(self) -> List[str]:
+        """Short text for the debug overlay."""
+        lines = [f"frames {self.frames}  dropped {self.dropped_frames}  over budget {self.over_budget}"]
+        for stage in self.stages:
+            s = self.stage_stats(stage)
+            lines.append(f"{stage:<14} p50 {s['p50']:5.2f}  p95 {s['p95']:5.2f}  p99 {s['p99']:5.2f} ms")
+        return lines
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the current snapshot. JSON files are replaced; CSV files get
+        one row per stage appended, so they build a history.
+
+        Args:
+            path (str): Destination (.csv for CSV, anything else for JSON).
+        """
+        snapshot = self.snapshot()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith(".csv"):
+            new_file = not os.path.exists(path)
+            with open(path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(["timestamp", "stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                                     "max_ms", "frames", "dropped_frames"])
+                for stage, s in snapshot["stages"].items():
+                    writer.writerow([f"{snapshot['timestamp']:.3f}", stage, s["count"], f"{s['mean']:.4f}",
+                                     f"{s['p50']:.4f}", f"{s['p95']:.4f}", f"{s['p99']:.4f}", f"{s['max']:.4f}",
+                                     snapshot["frames"], snapshot["dropped_frames"]])
+        else:
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp, path)
+
+
+class MetricsExporter:
+    """
+    Publishes FrameMetrics: periodic file dumps from the game loop and/or a
+    local HTTP endpoint (GET /metrics returns the JSON snapshot).
+    """
+    def __init__(self, metrics: FrameMetrics, dump_path: Optional[str] = None,
+                 interval: float = METRICS_DUMP_INTERVAL, port: Optional[int] = None) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            metrics (FrameMetrics): Source of the data.
+            dump_path (str): File written every `interval` seconds (.json or .csv).
+            interval (float): Seconds between dumps.
+            port (int): If given, serve the snapshot on http://127.0.0.1:<port>/metrics.
+        """
+        self.metrics = metrics
+        self.dump_path = dump_path
+        self.interval = interval
+        self.next_dump = time.monotonic() + interval
+        self.server: Optional[ThreadingHTTPServer] = None
+
+        if port is not None:
+            exporter = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.rstrip("/") != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = json.dumps(exporter.metrics.snapshot()).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args) -> None:
+                    pass  # Keep the console quiet
+
+            self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+            threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+
+    def poll(self) -> None:
+        """Called once per frame; dumps when the interval has passed."""
+        if self.dump_path is None:
+            return
+        now = time.monotonic()
+        if now >= self.next_dump:
+            self.next_dump = now + self.interval
+            self.metrics.dump(self.dump_path)
+
+    def close(self) -> None:
+        """Writes a final dump and stops the endpoint."""
+        if self.dump_path is not None:
+            self.metrics.dump(self.dump_path)
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
@@ -0,0 +1,152 @@
+import numpy as np
+import pygame
+from typing import Dict, List, Optional, Tuple
+from constants import *
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle engine stored as NumPy arrays (structure of arrays).
+
+    Updates are vectorized over all live particles; dead particles are
+    compacted away with a mask. Drawing uses pre-rendered sprites at a few
+    alpha levels and a single batched blits() call.
+    """
+    def __init__(self,
+                 capacity: int = PARTICLE_CAPACITY,
+                 lifetime: float = PARTICLE_LIFETIME,
+                 color: Tuple[int, int, int] = PARTICLE_COLOR,
+                 alpha_levels: int = PARTICLE_ALPHA_LEVELS,
+                 seed: Optional[int] = None) -> None:
+        """
+        Initialize the particle system.
+
+        Args:
+            capacity (int): Maximum live particles; spawns beyond it are dropped.
+            lifetime (float): Mean particle lifetime in seconds.
+            color (Tuple[int, int, int]): Particle color.
+            alpha_levels (int): Number of pre-rendered fade steps per sprite size.
+            seed (int): Optional RNG seed for reproducible effects.
+        """
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.color = color
+        self.alpha_levels = alpha_levels
+        self.max_life = lifetime * 1.2
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.count = 0
+        self.dropped = 0
+
+        self.sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def spawn(self, x: float, y: float, n: int = PARTICLE_COUNT) -> None:
+        """
+        Emits a burst of particles in random directions.
+
+        Args:
+            x (float): Burst center x.
+            y (float): Burst center y.
+            n (int): Number of particles.
+        """
+        n_fit = min(n, self.capacity - self.count)
+        self.dropped += n - n_fit
+        if n_fit <= 0:
+            return
+        s = slice(self.count, self.count + n_fit)
+        angle = self.rng.uniform(0.0, 2 * np.pi, n_fit)
+        speed = self.rng.uniform(60.0, 180.0, n_fit)  # px/s (1-3 px per 60 Hz frame)
+        self.pos[s] = (x, y)
+        self.vel[s, 0] = np.cos(angle) * speed
+        self.vel[s, 1] = np.sin(angle) * speed
+        self.life[s] = self.rng.uniform(0.6, 1.2, n_fit) * self.lifetime
+        self.size[s] = self.rng.integers(1, 4, n_fit)
+        self.count += n_fit
+
+    def update(self, dt: float) -> None:
+        """
+        Advances every particle and removes the dead ones.
+
+        Args:
+            dt (float): Real frame time in seconds.
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+
+        alive = self.life[:n] > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            self.pos[:k] = self.pos[:n][alive]
+            self.vel[:k] = self.vel[:n][alive]
+            self.life[:k] = self.life[:n][alive]
+            self.size[:k] = self.size[:n][alive]
+            self.count = k
+
+    def clear(self) -> None:
+        """Removes every particle."""
+        self.count = 0
+
+    def bounds(self) -> Optional[pygame.Rect]:
+        """
+        Bounding box of all live particles (for damage tracking).
+
+        Returns:
+            Optional[pygame.Rect]: The area touched by draw(), or None if empty.
+        """
+        n = self.count
+        if n == 0:
+            return None
+        lo = np.floor(self.pos[:n].min(axis=0)).astype(int) - 4
+        hi = np.ceil(self.pos[:n].max(axis=0)).astype(int) + 4
+        return pygame.Rect(int(lo[0]), int(lo[1]), int(hi[0] - lo[0]) + 1, int(hi[1] - lo[1]) + 1)
+
+    def get_sprite(self, size: int, level: int) -> pygame.Surface:
+        sprite = self.sprites.get((size, level))
+        if sprite is None:
+            alpha = int(255 * (level + 1) / self.alpha_levels)
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.color, alpha), (size, size), size)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.sprites[(size, level)] = sprite
+        return sprite
+
+    def blit_sequence(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """
+        Sprite and top-left position of every live particle.
+
+        Returns:
+            List[Tuple[pygame.Surface, Tuple[int, int]]]: (sprite, position) pairs.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        # Fade: quantize remaining life into one of the pre-rendered alpha levels
+        levels = np.clip((self.life[:n] / self.max_life * self.alpha_levels).astype(np.int32),
+                         0, self.alpha_levels - 1)
+        sizes = self.size[:n]
+        xs = (self.pos[:n, 0] - sizes).astype(np.int32)
+        ys = (self.pos[:n, 1] - sizes).astype(np.int32)
+        get_sprite = self.get_sprite
+        return [(get_sprite(s, l), (x, y))
+                for s, l, x, y in zip(sizes.tolist(), levels.tolist(), xs.tolist(), ys.tolist())]
+
+    def draw(self, target: pygame.Surface) -> None:
+        """
+        Blits every live particle in one batched call.
+
+        Args:
+            target (pygame.Surface): Surface to draw on.
+        """
+        if self.count:
+            target.blits(self.blit_sequence(), doreturn=False)
@@ -0,0 +1,98 @@
+import math
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from constants import *
+
+if TYPE_CHECKING:
+    # hand_detector imports MediaPipe, which the game loads in the background
+    from hand_detector import DetectedHand
+
+
+class PlayerSlot:
+    """
+    Tracking state of one player's hand between frames.
+    """
+    def __init__(self) -> None:
+        self.position: Optional[Tuple[float, float]] = None  # Last pinch centroid (None = no hand bound)
+        self.handedness: Optional[str] = None
+        self.missed: int = 0  # Consecutive frames without the hand
+
+
+class PlayerAssigner:
+    """
+    Binds detected hands to players so each hand keeps driving the same game.
+
+    A free player picks up a new hand that appears in its column of the
+    (mirrored) camera image. Once bound, a hand is matched frame to frame by
+    distance from its last position, with a penalty when the detector's
+    handedness disagrees, so two players' hands crossing or a hand briefly
+    misclassified do not swap games. A player whose hand is missing for
+    PLAYER_RELEASE_FRAMES frames is freed again.
+    """
+    def __init__(self, num_players: int) -> None:
+        """
+        Initialize the assigner.
+
+        Args:
+            num_players (int): Number of players (1-4).
+        """
+        self.slots: List[PlayerSlot] = [PlayerSlot() for _ in range(num_players)]
+
+    @staticmethod
+    def centroid(hand: "DetectedHand") -> Tuple[float, float]:
+        (ix, iy), (tx, ty), _ = hand.landmarks
+        return (ix + tx) / 2, (iy + ty) / 2
+
+    def column(self, x: float, frame_width: int) -> int:
+        """Player whose camera column contains x."""
+        return min(len(self.slots) - 1, max(0, int(x / frame_width * len(self.slots))))
+
+    def assign(self, hands: List["DetectedHand"], frame_width: int) -> List[Optional["DetectedHand"]]:
+        """
+        Matches this frame's hands to players.
+
+        Args:
+            hands (List[DetectedHand]): Output of HandDetector.process_frame_multi.
+            frame_width (int): Camera frame width in pixels.
+
+        Returns:
+            List[Optional[DetectedHand]]: The hand for each player, or None.
+        """
+        positions = [self.centroid(hand) for hand in hands]
+
+        # Every plausible (cost, hand, player) pair, cheapest matched first
+        candidates = []
+        for h, (hand, (x, y)) in enumerate(zip(hands, positions)):
+            for p, slot in enumerate(self.slots):
+                if slot.position is not None:
+                    distance = math.hypot(x - slot.position[0], y - slot.position[1]) / frame_width
+                    if distance > PLAYER_MAX_JUMP:
+                        continue
+                    mismatch = slot.handedness not in (None, "Unknown", hand.handedness)
+                    cost = distance + (PLAYER_HANDEDNESS_PENALTY if mismatch else 0.0)
+                elif self.column(x, frame_width) == p:
+                    cost = PLAYER_NEW_HAND_COST
+                else:
+                    continue
+                candidates.append((cost, h, p))
+        candidates.sort()
+
+        assigned: List[Optional["DetectedHand"]] = [None] * len(self.slots)
+        used = set()
+        for _, h, p in candidates:
+            if h in used or assigned[p] is not None:
+                continue
+            used.add(h)
+            assigned[p] = hands[h]
+            slot = self.slots[p]
+            slot.position = positions[h]
+            slot.missed = 0
+            if slot.handedness in (None, "Unknown"):
+                slot.handedness = hands[h].handedness
+
+        for slot, hand in zip(self.slots, assigned):
+            if hand is None and slot.position is not None:
+                slot.missed += 1
+                if slot.missed > PLAYER_RELEASE_FRAMES:
+                    slot.position = None
+                    slot.handedness = None
+        return assigned
@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+import pstats
+import signal
+import cProfile
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from constants import *
+
+FunctionKey = Tuple[str, int, str]  # (file, line, name) as used by pstats
+
+
+def frame_label(filename: str, name: str) -> str:
+    # Short, stable frame name for collapsed stacks: module:function
+    module = os.path.splitext(os.path.basename(filename))[0] if filename else "~"
+    return f"{module}:{name}"
+
+
+def collapse_pstats(stats: pstats.Stats, min_seconds: float = 1e-5, max_depth: int = 64) -> Dict[str, float]:
+    """
+    Approximates collapsed stacks from cProfile's caller/callee edges.
+
+    cProfile only keeps one level of callers, so inclusive time is pushed
+    down the call graph in proportion to each edge's share, the same way
+    pstats-to-flamegraph converters do. Recursion is cut at the first repeat.
+
+    Args:
+        stats (pstats.Stats): Loaded profile.
+        min_seconds (float): Paths below this are pruned.
+        max_depth (int): Deepest stack emitted.
+
+    Returns:
+        Dict[str, float]: "a;b;c" -> self seconds.
+    """
+    raw = stats.stats  # {func: (cc, nc, tt, ct, callers)}
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks: Dict[str, float] = {}
+
+    def walk(func: FunctionKey, share: float, path: Tuple[str, ...], seen: frozenset) -> None:
+        _, _, tt, ct, _ = raw[func]
+        path = path + (frame_label(func[0], func[2]),)
+        self_time = tt * share
+        if self_time >= min_seconds:
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0.0) + self_time
+        if len(path) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            callee_ct = raw[callee][3]
+            if callee in seen or callee_ct <= 0:
+                continue
+            callee_share = share * edge_ct / callee_ct
+            if edge_ct * share >= min_seconds:
+                walk(callee, callee_share, path, seen | {callee})
+
+    roots = [func for func, (_, _, _, _, callers) in raw.items() if not callers]
+    for root in roots:
+        walk(root, 1.0, (), frozenset((root,)))
+    return stacks
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler for one thread.
+
+    A daemon thread wakes every `interval` seconds and records the target
+    thread's current stack, so the cost is bounded by the sampling rate
+    rather than by how much code runs (unlike cProfile).
+    """
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_INTERVAL) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            thread_id (int): Thread to sample (threading.get_ident() of the game loop).
+            interval (float): Seconds between samples.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.cost = 0.0  # Seconds spent taking samples
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            start = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            path = []
+            while frame is not None:
+                code = frame.f_code
+                path.append(frame_label(code.co_filename, code.co_name))
+                frame = frame.f_back
+            if path:
+                self.samples[";".join(reversed(path))] += 1
+            self.cost += time.perf_counter() - start
+
+
+class FrameProfiler:
+    """
+    On-demand profiling of the next N frames of the game loop.
+
+    Requests can come from a hotkey, a signal (SIGUSR1 for cProfile,
+    SIGUSR2 for sampling) or the command line; they only set a flag, and the
+    loop starts profiling at the next frame boundary. Results are written to
+    `output_dir` as <name>.pstats (cProfile mode), <name>.collapsed (both
+    modes, flamegraph.pl / speedscope format) and <name>.json with the tags.
+    """
+    def __init__(self, output_dir: str = PROFILE_DIR,
+                 tags: Optional[Callable[[], Dict[str, object]]] = None) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir (str): Directory for the result files.
+            tags (Callable): Returns the current settings (disk count, backend, ...)
+                recorded with each profile and used in its file name.
+        """
+        self.output_dir = output_dir
+        self.tags = tags or (lambda: {})
+        self.thread_id = threading.get_ident()
+        self.pending: Optional[Tuple[int, str]] = None
+        self.active_mode: Optional[str] = None
+        self.frames_left = 0
+        self.frames = 0
+        self.started_at = 0.0
+        self.profile: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+        self.last_output: Optional[str] = None
+
+    def request(self, frames: int = PROFILE_FRAMES, mode: str = "cprofile") -> None:
+        """
+        Asks for the next `frames` frames to be profiled (safe from signal handlers).
+
+        Args:
+            frames (int): Number of frames.
+            mode (str): "cprofile" for deterministic profiling, "sample" for the sampler.
+        """
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"unknown profiling mode {mode!r}")
+        self.pending = (frames, mode)
+
+    def install_signal_handlers(self, frames: int = PROFILE_FRAMES) -> None:
+        """SIGUSR1 profiles with cProfile, SIGUSR2 samples (POSIX only)."""
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.request(frames, "cprofile"))
+            signal.signal(signal.SIGUSR2, lambda signum, frame: self.request(frames, "sample"))
+
+    @property
+    def active(self) -> bool:
+        return self.active_mode is not None
+
+    def frame_start(self) -> None:
+        """Called at the top of every loop iteration."""
+        if self.pending is None or self.active:
+            return
+        self.frames_left, self.active_mode = self.pending
+        self.pending = None
+        self.frames = 0
+        self.started_at = time.perf_counter()
+        if self.active_mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = StackSampler(self.thread_id)
+            self.sampler.start()
+
+    def frame_end(self) -> Optional[str]:
+        """
+        Called at the bottom of every loop iteration.
+
+        Returns:
+            Optional[str]: Base path of the written files when a profile just finished.
+        """
+        if not self.active:
+            return None
+        self.frames += 1
+        self.frames_left -= 1
+        if self.frames_left > 0:
+            return None
+        return self.finish()
+
+    def finish(self) -> str:
+        """Stops the running profile early or on schedule and writes the results."""
+        duration = time.perf_counter() - self.started_at
+        mode = self.active_mode
+        tags = dict(self.tags())
+        name = "-".join([time.strftime("%Y%m%d-%H%M%S"), mode] + [f"{k}{v}" for k, v in tags.items()])
+        base = os.path.join(self.output_dir, name)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        info = {"mode": mode, "frames": self.frames, "seconds": duration, "tags": tags}
+        if mode == "cprofile":
+            self.profile.disable()
+            self.profile.dump_stats(base + ".pstats")
+            stacks = collapse_pstats(pstats.Stats(self.profile))
+            with open(base + ".collapsed", "w") as f:
+                for stack, seconds in sorted(stacks.items()):
+                    f.write(f"{stack} {max(1, int(seconds * 1e6))}\n")  # microseconds
+            self.profile = None
+        else:
+            self.sampler.stop()
+            with open(base + ".collapsed", "w") as f:
+                for stack, count in sorted(self.sampler.samples.items()):
+                    f.write(f"{stack} {count}\n")
+            info["samples"] = sum(self.sampler.samples.values())
+            info["interval"] = self.sampler.interval
+            info["overhead"] = self.sampler.cost / duration if duration > 0 else 0.0
+            self.sampler = None
+
+        with open(base + ".json", "w") as f:
+            json.dump(info, f, indent=2)
+
+        self.active_mode = None
+        self.last_output = base
+        return base
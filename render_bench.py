@@ -0,0 +1,233 @@
+import os
+import sys
+import math
+import json
+import time
+import random
+import argparse
+import numpy as np
+import pygame
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from constants import *
+from frame_clock import FrameClock, ManualTimeSource
+from game_state import TowerOfHanoiGame
+from particles import ParticleSystem
+from ui_renderer import GameRenderer
+
+
+class Scene(NamedTuple):
+    """
+    A scripted state for the render benchmark.
+
+    setup(game) puts the game into the state once; update(game, frame) runs
+    before every rendered frame (e.g. to move the hand).
+    """
+    num_disks: int
+    setup: Callable[[TowerOfHanoiGame], None]
+    update: Optional[Callable[[TowerOfHanoiGame, int], None]] = None
+
+
+def setup_play_screen(game: TowerOfHanoiGame) -> None:
+    game.show_play_screen = True
+
+
+def setup_mid_game(game: TowerOfHanoiGame) -> None:
+    # A few legal moves, then hold the next disk
+    game.start_game()
+    for source, target in ((0, 2), (0, 1), (2, 1)):
+        game.pickup_disc(source)
+        game.place_disc(target)
+    game.pickup_disc(0)
+
+
+def setup_win(game: TowerOfHanoiGame) -> None:
+    game.start_game()
+    game.towers[0].clear()
+    game.towers[2].extend(range(game.num_disks, 0, -1))
+    game.board_version += 1
+    game.moves = 2 ** game.num_disks - 1
+    game.game_won = True
+    game.timer_active = False
+    game.show_action_message("Victory!")
+
+
+def move_hand(game: TowerOfHanoiGame, frame: int) -> None:
+    # Sweep the held disk across the towers
+    angle = frame * 0.05
+    game.hand_position = (int(640 + 400 * math.sin(angle)), int(260 + 60 * math.cos(angle * 2)))
+
+
+SCENES: Dict[str, Scene] = {
+    "play_screen": Scene(3, setup_play_screen),
+    "mid_game_held": Scene(5, setup_mid_game, move_hand),
+    "large_stack": Scene(128, setup_mid_game, move_hand),
+    "win_particles": Scene(5, setup_win),
+}
+
+
+def camera_frame(frame: int, size: Tuple[int, int] = (640, 480)) -> np.ndarray:
+    """
+    Synthetic BGR camera image (a scrolling gradient) so the preview path is exercised.
+
+    Args:
+        frame (int): Frame number.
+        size (Tuple[int, int]): Image size (width, height).
+
+    Returns:
+        np.ndarray: (height, width, 3) uint8 image.
+    """
+    width, height = size
+    x = np.arange(width, dtype=np.uint16)[np.newaxis, :]
+    y = np.arange(height, dtype=np.uint16)[:, np.newaxis]
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[..., 0] = (x + frame) & 0xFF
+    image[..., 1] = y & 0xFF
+    image[..., 2] = (x + y) >> 2 & 0xFF
+    return image
+
+
+def run_scene(renderer: GameRenderer, scene: Scene, frames: int = BENCH_FRAMES,
+              warmup: int = BENCH_WARMUP_FRAMES, seed: int = BENCH_SEED,
+              golden_frame: int = GOLDEN_FRAME) -> Tuple[List[float], pygame.Surface]:
+    """
+    Renders a scene on a simulated 60 FPS clock and times every frame.
+
+    The scene and camera image change with the frame number, so the image
+    for the golden check is always taken at golden_frame (rendering untimed
+    frames past the timed ones if needed).
+
+    Args:
+        renderer (GameRenderer): Renderer to drive (caches are kept across scenes).
+        scene (Scene): The scripted state.
+        frames (int): Number of timed frames.
+        warmup (int): Untimed frames rendered first.
+        seed (int): Seed for particles and other random effects.
+        golden_frame (int): Frame number to snapshot.
+
+    Returns:
+        Tuple[List[float], pygame.Surface]: Frame times in milliseconds and the golden_frame image.
+    """
+    random.seed(seed)
+    renderer.particles = ParticleSystem(seed=seed)
+
+    time_source = ManualTimeSource()
+    clock = FrameClock(time_source)
+    game = TowerOfHanoiGame(scene.num_disks, clock)
+    subscription = game.events.subscribe(renderer.on_event)
+    scene.setup(game)
+
+    times = []
+    image = None
+    for frame in range(max(warmup + frames, golden_frame + 1)):
+        time_source.advance(1.0 / FPS)
+        clock.tick()
+        while clock.step():
+            game.step(clock.fixed_dt)
+        if scene.update is not None:
+            scene.update(game, frame)
+        game.events.dispatch()
+
+        # Wall-clock cost of the frame (the game clock above is simulated)
+        start = time.perf_counter_ns()
+        renderer.prepare_camera_surface(camera_frame(frame))
+        renderer.render(game)
+        if warmup <= frame < warmup + frames:
+            times.append((time.perf_counter_ns() - start) / 1e6)
+        if frame == golden_frame:
+            image = renderer.snapshot()
+
+    game.events.unsubscribe(subscription)
+    return times, image
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """Frame time statistics in milliseconds."""
+    values = np.asarray(times, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {"frames": len(values), "mean": float(values.mean()), "p50": float(p50),
+            "p95": float(p95), "p99": float(p99), "max": float(values.max())}
+
+
+def compare_images(actual: pygame.Surface, expected: pygame.Surface,
+                   tolerance: int = GOLDEN_TOLERANCE) -> float:
+    """
+    Fraction of pixels whose largest channel difference exceeds the tolerance.
+
+    Args:
+        actual (pygame.Surface): Rendered frame.
+        expected (pygame.Surface): Golden image.
+        tolerance (int): Allowed per-channel difference.
+
+    Returns:
+        float: Mismatched pixel fraction (1.0 if the sizes differ).
+    """
+    if actual.get_size() != expected.get_size():
+        return 1.0
+    a = pygame.surfarray.array3d(actual).astype(np.int16)
+    b = pygame.surfarray.array3d(expected).astype(np.int16)
+    mismatched = np.abs(a - b).max(axis=2) > tolerance
+    return float(mismatched.mean())
+
+
+def golden_path(golden_dir: str, backend: str, name: str) -> str:
+    # Backends scale the camera preview differently, so each has its own set
+    return os.path.join(golden_dir, backend, f"{name}.png")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless render benchmark with golden-image checks.")
+    parser.add_argument("scenes", nargs="*", help=f"Scenes to run (default: all of {', '.join(SCENES)})")
+    parser.add_argument("--backend", default=RENDER_BACKEND, choices=("surface", "texture"))
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    parser.add_argument("--warmup", type=int, default=BENCH_WARMUP_FRAMES)
+    parser.add_argument("--size", type=int, nargs=2, default=(SCREEN_WIDTH, SCREEN_HEIGHT), metavar=("W", "H"))
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("--tolerance", type=int, default=GOLDEN_TOLERANCE, help="Per-channel pixel tolerance")
+    parser.add_argument("--max-mismatch", type=float, default=GOLDEN_MAX_MISMATCH,
+                        help="Allowed fraction of mismatched pixels")
+    parser.add_argument("--update-golden", action="store_true", help="Store the rendered frames as the new goldens")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+    for name in args.scenes:
+        if name not in SCENES:
+            parser.error(f"unknown scene {name!r}")
+
+    renderer = GameRenderer(*args.size, backend=args.backend, headless=True)
+    backend = "texture" if renderer.gpu else "surface"
+
+    results = {}
+    failed = False
+    print(f"{'scene':<16}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  golden")
+    for name in args.scenes or list(SCENES):
+        times, image = run_scene(renderer, SCENES[name], args.frames, args.warmup)
+        stats = summarize(times)
+
+        path = golden_path(args.golden_dir, backend, name)
+        if args.update_golden:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pygame.image.save(image, path)
+            status = "updated"
+        elif not os.path.exists(path):
+            status = "missing"
+            failed = True
+        else:
+            mismatch = compare_images(image, pygame.image.load(path), args.tolerance)
+            stats["mismatch"] = mismatch
+            ok = mismatch <= args.max_mismatch
+            status = f"{'ok' if ok else 'FAIL'} ({mismatch:.4%})"
+            failed = failed or not ok
+        stats["golden"] = status.split()[0]
+        results[name] = stats
+
+        print(f"{name:<16}" + "".join(f"{stats[k]:8.2f}" for k in ("mean", "p50", "p95", "p99", "max")) + f"  {status}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": backend, "size": list(args.size), "scenes": results}, f, indent=2)
+
+    pygame.quit()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
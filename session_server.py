@@ -0,0 +1,487 @@
+import sys
+import time
+import socket
+import struct
+import asyncio
+import argparse
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from constants import *
+from broadcast import MirroredGame, StatePublisher
+from events import EventType, GameEvent
+from frame_clock import FrameClock
+from game_state import TowerOfHanoiGame
+from layout import get_layout
+from metrics import FrameMetrics, MetricsExporter
+
+# Every message is a u16 body length followed by the body; the body starts
+# with its type.
+#   client -> server
+#     HELLO   disks u8, width u16, height u16   (opens the session)
+#     FRAME   seq u32, hand u8, 3 x (x i16, y i16) in window pixels
+#     START   (leave the play screen)
+#     RESET   disks u8
+#   server -> client
+#     STATE   seq u32 (of the frame it answers), event count u8,
+#             events (kind u8, tower i8, source i8, disk u16),
+#             then a broadcast.py state packet (empty when nothing changed)
+#     REJECT  (server full)
+LENGTH = struct.Struct("<H")
+HELLO, FRAME, START, RESET = 1, 2, 3, 4
+STATE, REJECT = 16, 17
+HELLO_BODY = struct.Struct("<BHH")
+FRAME_BODY = struct.Struct("<IB6h")
+STATE_HEAD = struct.Struct("<IB")
+EVENT = struct.Struct("<BbbH")
+EVENT_KINDS = list(EventType)
+
+
+def message(kind: int, body: bytes = b"") -> bytes:
+    return LENGTH.pack(len(body) + 1) + bytes((kind,)) + body
+
+
+def frame_message(seq: int, landmarks: Optional[List[Tuple[float, float]]]) -> bytes:
+    if landmarks is None:
+        return message(FRAME, FRAME_BODY.pack(seq, 0, 0, 0, 0, 0, 0, 0))
+    (ix, iy), (tx, ty), (wx, wy) = landmarks
+    return message(FRAME, FRAME_BODY.pack(seq, 1, int(ix), int(iy), int(tx), int(ty), int(wx), int(wy)))
+
+
+class Session(asyncio.Protocol):
+    """
+    One client connection and, after its HELLO, the game it plays.
+
+    Messages are handled as they arrive. Landmark frames that arrive in the
+    same read are coalesced to the newest (when the server falls behind, the
+    kernel buffers several, and only the latest hand pose matters, like a
+    camera dropping frames); START/RESET are applied in order and never lost.
+    """
+    def __init__(self, server: "SessionServer") -> None:
+        self.server = server
+        self.id = 0
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.clock: Optional[FrameClock] = None
+        self.game: Optional[TowerOfHanoiGame] = None
+        self.layout = None
+        self.subscription = None
+        self.publisher = StatePublisher(self)  # Sends through self.send
+        self.outbox = bytearray()
+        self.events: List[bytes] = []
+        self.paused = False  # Client not reading: reply bytes over the write buffer limit
+        self.accepted_at = server.time_source()
+        self.last_input = self.accepted_at
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        # A small kernel buffer too, or loopback and LAN autotuning absorb
+        # megabytes before the write buffer ever fills
+        transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SESSION_SOCKET_BUFFER)
+        transport.set_write_buffer_limits(high=self.server.write_buffer_limit)
+        self.server.accept(self)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.server.drop(self)
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+
+    def open(self, num_disks: int, width: int, height: int) -> None:
+        self.clock = FrameClock(self.server.time_source)
+        self.game = TowerOfHanoiGame(min(MAX_DISKS, max(MIN_DISKS, num_disks)), self.clock)
+        self.layout = get_layout(width, height)
+        self.subscription = self.game.events.subscribe(self.on_event)
+
+    def on_event(self, event: GameEvent) -> None:
+        # Ring slots are reused, so encode now
+        if len(self.events) < 255:
+            self.events.append(EVENT.pack(EVENT_KINDS.index(event.kind), event.tower, event.source, event.disk))
+
+    def send(self, packet: bytes) -> None:
+        # Called by the publisher; packed into the STATE reply
+        self.outbox += packet
+
+    def data_received(self, data: bytes) -> None:
+        server = self.server
+        server.counters["bytes_in"] += len(data)
+        self.last_input = server.time_source()
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        frame = None
+        while len(buffer) - offset >= LENGTH.size:
+            (length,) = LENGTH.unpack_from(buffer, offset)
+            end = offset + LENGTH.size + length
+            if end > len(buffer):
+                break
+            kind = buffer[offset + LENGTH.size] if length else 0
+            body_offset = offset + LENGTH.size + 1
+            offset = end
+            if kind == FRAME and self.game is not None and length == 1 + FRAME_BODY.size:
+                server.counters["frames_in"] += 1
+                if frame is not None:
+                    server.counters["frames_coalesced"] += 1
+                frame = FRAME_BODY.unpack_from(buffer, body_offset)
+            elif kind == HELLO and self.game is None and length == 1 + HELLO_BODY.size:
+                if not server.register(self, *HELLO_BODY.unpack_from(buffer, body_offset)):
+                    return
+            elif kind in (START, RESET) and self.game is not None:
+                if frame is not None:
+                    self.process(frame)  # Commands apply after the frames sent before them
+                    frame = None
+                if kind == START:
+                    self.game.start_game()
+                elif length > 1:
+                    self.game.num_disks = min(MAX_DISKS, max(MIN_DISKS, buffer[body_offset]))
+                    self.game.reset_game()
+            else:
+                server.counters["protocol_errors"] += 1
+                self.transport.close()
+                return
+        del buffer[:offset]
+        if frame is not None:
+            self.process(frame)
+
+    def process(self, frame: Tuple[int, ...]) -> None:
+        start = time.perf_counter_ns()
+        seq, hand, ix, iy, tx, ty, wx, wy = frame
+        self.update([(ix, iy), (tx, ty), (wx, wy)] if hand else None)
+        self.reply(seq)
+        self.server.metrics.record("process", time.perf_counter_ns() - start)
+        self.server.counters["frames_processed"] += 1
+
+    def update(self, landmarks: Optional[List[Tuple[int, int]]]) -> None:
+        # Same sequence as the local game loop, for one landmark sample
+        game = self.game
+        clock = self.clock
+        clock.tick()
+        while clock.step():
+            game.step(clock.fixed_dt)
+        if game.game_started and not game.game_won:
+            game.update_interaction(landmarks, self.layout)
+            game.finish_if_won()
+        self.subscription.drain()
+
+    def reply(self, seq: int) -> None:
+        if self.paused:
+            # Withhold state until the client catches up, then resume with a keyframe
+            self.server.counters["states_withheld"] += 1
+            self.publisher.state = None
+            self.events.clear()
+            return
+        self.publisher.publish(self.game)
+        body = STATE_HEAD.pack(seq, len(self.events)) + b"".join(self.events) + self.outbox
+        self.events.clear()
+        self.outbox.clear()
+        data = message(STATE, body)
+        self.server.counters["bytes_out"] += len(data)
+        self.transport.write(data)
+
+
+class ServerMetrics(FrameMetrics):
+    """
+    FrameMetrics whose snapshot also carries the server's counters, so the
+    MetricsExporter dumps and /metrics endpoint include them.
+    """
+    def __init__(self, server: "SessionServer") -> None:
+        super().__init__()
+        self.server = server
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot.update(self.server.counters, connections=len(self.server.connections),
+                        sessions=len(self.server.sessions),
+                        peak_sessions=self.server.peak_sessions)
+        return snapshot
+
+
+class SessionServer:
+    """
+    Hosts many headless TowerOfHanoiGame sessions on one asyncio loop.
+
+    Clients send landmark frames; for each processed frame the server
+    replies with the game's state delta and events. Every session has its
+    own FrameClock on the server's injected time source, so games run on
+    server time (a ManualTimeSource makes a run reproducible).
+
+    Backpressure is per session: input is coalesced to the newest frame, and
+    a client that does not read its replies (more than
+    SESSION_WRITE_BUFFER_LIMIT bytes unsent) gets no state until it catches
+    up, then a keyframe. Sessions without input for SESSION_IDLE_TIMEOUT are
+    evicted, and so are connections that send no HELLO within
+    SESSION_HELLO_TIMEOUT. Every open connection counts against max_sessions.
+    """
+    def __init__(self, time_source: Callable[[], float] = time.perf_counter, max_sessions: int = SESSION_MAX,
+                 idle_timeout: float = SESSION_IDLE_TIMEOUT, hello_timeout: float = SESSION_HELLO_TIMEOUT,
+                 write_buffer_limit: int = SESSION_WRITE_BUFFER_LIMIT) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            time_source (Callable): Clock for every session (seconds).
+            max_sessions (int): Connections beyond this are rejected.
+            idle_timeout (float): Seconds without input before a session is evicted.
+            hello_timeout (float): Seconds a connection may stay open without a HELLO.
+            write_buffer_limit (int): Unsent reply bytes above which state is withheld.
+        """
+        self.time_source = time_source
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.hello_timeout = hello_timeout
+        self.write_buffer_limit = write_buffer_limit
+        self.connections: Set[Session] = set()  # Every open connection, with or without a HELLO
+        self.sessions: Dict[int, Session] = {}  # Connections that sent HELLO, by id
+        self.next_id = 1
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.sweeper: Optional[asyncio.Task] = None
+
+        # "process" times the game update plus encoding of one frame
+        self.metrics = ServerMetrics(self)
+        self.counters = dict.fromkeys(("connected", "rejected", "evicted", "protocol_errors", "frames_in",
+                                       "frames_processed", "frames_coalesced", "states_withheld",
+                                       "bytes_in", "bytes_out"), 0)
+        self.peak_sessions = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = SESSION_PORT) -> "SessionServer":
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: Session(self), host, port, backlog=1024)
+        self.sweeper = asyncio.ensure_future(self.sweep())
+        return self
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        self.sweeper.cancel()
+        self.server.close()
+        for session in list(self.connections):
+            self.drop(session)
+        await self.server.wait_closed()
+
+    def accept(self, session: Session) -> None:
+        if len(self.connections) >= self.max_sessions:
+            self.counters["rejected"] += 1
+            session.transport.write(message(REJECT))
+            session.transport.close()
+            return
+        self.connections.add(session)
+
+    def register(self, session: Session, num_disks: int, width: int, height: int) -> bool:
+        if session not in self.connections:
+            return False  # Rejected on accept; the transport is closing
+        session.open(num_disks, width, height)
+        session.id = self.next_id
+        self.next_id += 1
+        self.sessions[session.id] = session
+        self.counters["connected"] += 1
+        self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        return True
+
+    def drop(self, session: Session) -> None:
+        self.connections.discard(session)
+        if self.sessions.pop(session.id, None) is not None:
+            session.game.events.unsubscribe(session.subscription)
+        session.transport.close()
+
+    async def sweep(self) -> None:
+        while True:
+            await asyncio.sleep(min(1.0, self.idle_timeout / 2, self.hello_timeout / 2))
+            now = self.time_source()
+            idle_cutoff, hello_cutoff = now - self.idle_timeout, now - self.hello_timeout
+            for session in [s for s in self.connections if s.last_input < idle_cutoff
+                            or (s.game is None and s.accepted_at < hello_cutoff)]:
+                self.counters["evicted"] += 1
+                self.drop(session)
+
+
+# --- Load generator ---
+
+class LoadClient(asyncio.Protocol):
+    """
+    A scripted thin client: solves the puzzle by sweeping a synthetic hand
+    between towers, mirrors the replies and measures round trips.
+    """
+    def __init__(self, num_disks: int, rate: float, width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT) -> None:
+        self.num_disks = num_disks
+        self.interval = 1.0 / rate
+        self.width = width
+        self.height = height
+        self.layout = get_layout(width, height)
+        self.mirror = MirroredGame()
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.sent: Dict[int, int] = {}
+        self.rtt_ns: List[int] = []
+        self.move = None
+        self.frames = 0
+        self.skipped = 0  # Frames not sent because the server was not reading
+        self.events = 0
+        self.replies = 0
+        self.bytes = 0
+        self.paused = False
+        self.rejected = False
+        self.closed = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.closed = True
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+
+    def landmarks(self, frame: int, moves) -> Optional[List[Tuple[float, float]]]:
+        # A move every 60 frames (ACTION_COOLDOWN apart): pinch over the source,
+        # carry to the target, release
+        phase = frame % 60
+        if phase == 0:
+            self.move = next(moves, None)
+        if self.move is None:
+            return None
+        x = self.layout.tower_x[self.move[0] if phase < 20 else self.move[1]]
+        y = self.height // 2
+        gap = 10 if 2 <= phase < 40 else 100
+        return [(x, y - gap), (x, y + gap), (x, y + 150)]
+
+    async def run(self, host: str, port: int, duration: float) -> None:
+        from solver import hanoi_moves
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.create_connection(lambda: self, host, port)
+        except OSError:
+            self.rejected = True
+            return
+        self.transport.write(message(HELLO, HELLO_BODY.pack(self.num_disks, self.width, self.height)))
+        self.transport.write(message(START))
+        moves = hanoi_moves(self.num_disks)
+        start = loop.time()
+        frame = 0
+        while loop.time() - start < duration and not self.closed:
+            landmarks = self.landmarks(frame, moves)
+            if self.paused:
+                self.skipped += 1
+            else:
+                self.sent[frame] = time.perf_counter_ns()
+                self.transport.write(frame_message(frame, landmarks))
+                self.frames += 1
+            frame += 1
+            # Fixed schedule, so a slow server does not slow the offered load
+            await asyncio.sleep(max(0.0, start + frame * self.interval - loop.time()))
+        await asyncio.sleep(0.2)  # Collect replies in flight
+        self.transport.close()
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= LENGTH.size:
+            (length,) = LENGTH.unpack_from(buffer, offset)
+            end = offset + LENGTH.size + length
+            if end > len(buffer):
+                break
+            body = bytes(buffer[offset + LENGTH.size:end])
+            offset = end
+            self.bytes += length + LENGTH.size
+            if body[0] == REJECT:
+                self.rejected = True
+                continue
+            seq, count = STATE_HEAD.unpack_from(body, 1)
+            sent = self.sent.pop(seq, None)
+            if sent is not None:
+                self.rtt_ns.append(time.perf_counter_ns() - sent)
+            self.replies += 1
+            self.events += count
+            packet = body[1 + STATE_HEAD.size + count * EVENT.size:]
+            if packet:
+                self.mirror.apply(packet)
+        del buffer[:offset]
+
+
+async def run_load(clients: int, rate: float, duration: float, num_disks: int,
+                   host: Optional[str], port: int) -> None:
+    server = None
+    if host is None:
+        # In-process server on an ephemeral port (shares the CPU with the clients)
+        server = await SessionServer().start("127.0.0.1", 0)
+        host, port = "127.0.0.1", server.port
+    load = [LoadClient(num_disks, rate) for _ in range(clients)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client.run(host, port, duration) for client in load))
+    elapsed = time.perf_counter() - started
+
+    rtt = np.array([ns for client in load for ns in client.rtt_ns], dtype=np.float64) / 1e6
+    replies = sum(client.replies for client in load)
+    sent = sum(client.frames for client in load)
+    solved = sum(client.mirror.game_won for client in load)
+    print(f"{clients} clients x {rate:g} Hz for {duration:g} s ({elapsed:.1f} s wall)")
+    print(f"frames sent {sent}  skipped {sum(c.skipped for c in load)}  "
+          f"replies {replies} ({replies / elapsed:.0f}/s)  bytes/reply {sum(c.bytes for c in load) / max(1, replies):.1f}  "
+          f"rejected {sum(c.rejected for c in load)}  solved {solved}")
+    if len(rtt):
+        p50, p95, p99 = np.percentile(rtt, (50, 95, 99))
+        print(f"round trip ms: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {rtt.max():.2f}")
+    if server is not None:
+        snapshot = server.metrics.snapshot()
+        print(f"server: frames in {snapshot['frames_in']}  processed {snapshot['frames_processed']}  "
+              f"coalesced {snapshot['frames_coalesced']}  withheld {snapshot['states_withheld']}  "
+              f"peak sessions {snapshot['peak_sessions']}")
+        s = snapshot["stages"]["process"]
+        print(f"server process ms: p50 {s['p50']:.3f}  p99 {s['p99']:.3f}  max {s['max']:.3f}")
+        await server.close()
+
+
+async def serve(host: str, port: int, metrics_dump: Optional[str], metrics_port: Optional[int]) -> None:
+    server = await SessionServer().start(host, port)
+    print(f"Serving sessions on {host}:{server.port}")
+    exporter = MetricsExporter(server.metrics, metrics_dump, interval=SESSION_STATS_INTERVAL, port=metrics_port)
+    try:
+        while True:
+            await asyncio.sleep(SESSION_STATS_INTERVAL)
+            exporter.poll()
+            s = server.metrics.snapshot()
+            print(f"sessions {s['sessions']}  frames {s['frames_processed']}  coalesced {s['frames_coalesced']}  "
+                  f"withheld {s['states_withheld']}  evicted {s['evicted']}", file=sys.stderr)
+    finally:
+        exporter.close()
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless game sessions for thin clients, and a load generator.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serving = sub.add_parser("serve", help="Run the session server")
+    serving.add_argument("--host", default="127.0.0.1")
+    serving.add_argument("--port", type=int, default=SESSION_PORT)
+    serving.add_argument("--metrics-dump", metavar="FILE", help="Write stage latencies and counters periodically")
+    serving.add_argument("--metrics-port", type=int, metavar="PORT", help="Serve them on /metrics")
+    loading = sub.add_parser("load", help="Drive a server with scripted clients")
+    loading.add_argument("--clients", type=int, default=LOAD_CLIENTS)
+    loading.add_argument("--rate", type=float, default=LOAD_RATE, help="Frames per second per client")
+    loading.add_argument("--duration", type=float, default=LOAD_DURATION, help="Seconds")
+    loading.add_argument("--disks", type=int, default=3)
+    loading.add_argument("--connect", metavar="HOST:PORT", help="External server (default: start one in-process)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port, args.metrics_dump, args.metrics_port))
+    else:
+        host, port = None, SESSION_PORT
+        if args.connect:
+            host, _, port = args.connect.rpartition(":")
+            port = int(port)
+        asyncio.run(run_load(args.clients, args.rate, args.duration, args.disks, host, port))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
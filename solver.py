@@ -0,0 +1,30 @@
+from typing import Iterator, Tuple
+
+
+def optimal_move_count(num_disks: int) -> int:
+    """Length of the shortest solution."""
+    return 2 ** num_disks - 1
+
+
+def hanoi_moves(num_disks: int, source: int = 0, target: int = 2) -> Iterator[Tuple[int, int]]:
+    """
+    Generates the optimal solution one move at a time.
+
+    Iterative (no recursion), so any disk count works and memory stays
+    constant; move m moves disk (trailing zeros of m) + 1, and its towers
+    follow from the bits of m.
+
+    Args:
+        num_disks (int): Number of disks, all starting on `source`.
+        source (int): Tower the disks start on (0-2).
+        target (int): Tower to move them to (0-2).
+
+    Yields:
+        Tuple[int, int]: (from tower, to tower) for each move.
+    """
+    spare = 3 - source - target
+    # The bit pattern moves the stack to the first free tower for an even
+    # disk count and to the second for an odd one
+    towers = (source, spare, target) if num_disks % 2 else (source, target, spare)
+    for move in range(1, 2 ** num_disks):
+        yield towers[(move & (move - 1)) % 3], towers[((move | (move - 1)) + 1) % 3]
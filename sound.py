@@ -0,0 +1,80 @@
+import pygame
+import numpy as np
+from typing import Optional
+from asset_cache import AssetCache
+from events import EventType, GameEvent
+
+
+class SoundManager:
+    """
+    Manages synthetic sound effects for the game.
+    """
+    # Sound played for each game event (events without an entry are silent).
+    # RESET stays silent: starting a game and changing difficulty reset the
+    # board first, and each plays its own single beep.
+    EVENT_SOUNDS = {
+        EventType.PICKUP: 'PICKUP',
+        EventType.DROP_VALID: 'DROP_VALID',
+        EventType.DROP_INVALID: 'DROP_INVALID',
+        EventType.WIN: 'WIN',
+        EventType.GAME_START: 'PICKUP',
+        EventType.DIFFICULTY_CHANGED: 'PICKUP',
+    }
+    
+    def __init__(self, assets: Optional[AssetCache] = None):
+        pygame.mixer.init(frequency=44100, size=-16, channels=1)
+        self.sounds = {}
+        self.assets = assets
+        self.generate_sounds()
+        
+    def generate_wave(self, frequency: float, duration: float, volume: float = 0.5):
+        # Synthesized once, then loaded from the asset cache as PCM
+        if self.assets is not None:
+            wave = self.assets.get_array("pcm", (frequency, duration, volume, 44100),
+                                         lambda: self.synthesize(frequency, duration, volume))
+        else:
+            wave = self.synthesize(frequency, duration, volume)
+        return pygame.sndarray.make_sound(wave)
+        
+    def synthesize(self, frequency: float, duration: float, volume: float) -> np.ndarray:
+        sample_rate = 44100
+        n_samples = int(sample_rate * duration)
+        t = np.linspace(0, duration, n_samples, False)
+        
+        # Sine wave with decay
+        wave = np.sin(frequency * t * 2 * np.pi)
+        
+        # Apply decay envelope
+        decay = np.linspace(1.0, 0.0, n_samples)
+        wave = wave * decay * volume
+        
+        # Convert to 16-bit signed integers
+        return (wave * 32767).astype(np.int16)
+
+    def generate_sounds(self):
+        # Pickup: Non-intrusive high blip
+        self.sounds['PICKUP'] = self.generate_wave(600, 0.1, 0.3)
+        
+        # Drop Valid: Satisfying lower thud/click
+        self.sounds['DROP_VALID'] = self.generate_wave(400, 0.15, 0.4)
+        
+        # Drop Invalid: Low buzz
+        # Complex wave for error? Just simple low tone for now
+        self.sounds['DROP_INVALID'] = self.generate_wave(150, 0.3, 0.4)
+        
+        # Win: Ascending arpeggio
+        # We can play multiple sounds or a pre-mixed buffer.
+        # For simplicity, just a "Ding" high note
+        self.sounds['WIN'] = self.generate_wave(880, 0.8, 0.5)
+        
+        # Reset
+        self.sounds['RESET'] = self.generate_wave(300, 0.2, 0.3)
+
+    def play(self, event_name: str):
+        if event_name in self.sounds:
+            self.sounds[event_name].play()
+            
+    def on_event(self, event: GameEvent):
+        sound_name = self.EVENT_SOUNDS.get(event.kind)
+        if sound_name:
+            self.play(sound_name)
@@ -0,0 +1,156 @@
+import sys
+import time
+import builtins
+import threading
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+
+class ImportTimer:
+    """
+    Records how long every import takes, like `python -X importtime`.
+
+    Wraps builtins.__import__, so it only sees imports made after install();
+    install it before the heavy imports. Already-loaded modules take a fast
+    path and are not recorded. Nesting is tracked per thread, so imports done
+    by background loaders are attributed correctly.
+    """
+    def __init__(self) -> None:
+        # (thread name, module, self seconds, cumulative seconds, depth), in completion order
+        self.records: List[Tuple[str, str, float, float, int]] = []
+        self.local = threading.local()
+        self.original: Optional[Callable] = None
+        self.lock = threading.Lock()
+
+    def install(self) -> "ImportTimer":
+        if self.original is None:
+            self.original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self) -> None:
+        if self.original is not None:
+            builtins.__import__ = self.original
+            self.original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self.original
+        if level == 0 and name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        children = [0.0]
+        stack.append(children)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += total
+            with self.lock:
+                self.records.append((threading.current_thread().name, "." * level + name,
+                                     total - children[0], total, len(stack)))
+
+    def total(self) -> float:
+        """Seconds spent in top-level imports."""
+        return sum(cumulative for _, _, _, cumulative, depth in self.records if depth == 0)
+
+    def report(self, out: TextIO = sys.stderr) -> None:
+        """
+        Writes the records in `-X importtime` format (microseconds, nested by indentation).
+
+        Args:
+            out (TextIO): Destination stream.
+        """
+        out.write("import time: self [us] | cumulative | imported package\n")
+        for thread, name, self_time, cumulative, depth in self.records:
+            suffix = "" if thread == "MainThread" else f"  [{thread}]"
+            out.write(f"import time: {self_time * 1e6:>9.0f} | {cumulative * 1e6:>10.0f} | {'  ' * depth}{name}{suffix}\n")
+        out.write(f"import time: total {self.total() * 1e3:.1f} ms\n")
+
+
+class StartupTask:
+    """
+    A piece of startup work running on a background thread.
+    """
+    def __init__(self, name: str, function: Callable[[], Any]) -> None:
+        """
+        Starts the task.
+
+        Args:
+            name (str): Label shown on the splash screen.
+            function (Callable): Work to run; its return value becomes `result`.
+        """
+        self.name = name
+        self.function = function
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"startup-{name}", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.result = self.function()
+        except BaseException as e:  # Surfaced to the main thread through `error`
+            self.error = e
+        self.elapsed = time.perf_counter() - self.started_at
+        self.done = True
+
+
+class Startup:
+    """
+    Staged startup: the window comes up first while slow work (imports,
+    model creation, opening devices) runs on background threads. The main
+    loop polls it every frame and picks results up as they finish.
+    """
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.tasks: Dict[str, StartupTask] = {}
+        self.milestones: List[Tuple[str, float]] = []
+
+    def start(self, name: str, function: Callable[[], Any]) -> StartupTask:
+        """Runs `function` on a background thread."""
+        task = self.tasks[name] = StartupTask(name, function)
+        return task
+
+    def result(self, name: str) -> Any:
+        """The task's result, or None while it is still running (or failed)."""
+        task = self.tasks[name]
+        return task.result if task.done else None
+
+    def failed(self) -> Optional[StartupTask]:
+        """The first task that raised, if any."""
+        for task in self.tasks.values():
+            if task.done and task.error is not None:
+                return task
+        return None
+
+    @property
+    def ready(self) -> bool:
+        return all(task.done for task in self.tasks.values())
+
+    def status(self) -> Optional[str]:
+        """Progress line for the splash screen, or None once everything is loaded."""
+        pending = [task.name for task in self.tasks.values() if not task.done]
+        if not pending:
+            return None
+        done = len(self.tasks) - len(pending)
+        return f"Loading {', '.join(pending)}... ({done}/{len(self.tasks)})"
+
+    def mark(self, milestone: str) -> None:
+        """Records the time since startup for a named milestone (e.g. first frame)."""
+        self.milestones.append((milestone, time.perf_counter() - self.started_at))
+
+    def report(self, out: TextIO = sys.stderr) -> None:
+        """Writes milestone and task timings."""
+        for milestone, at in self.milestones:
+            out.write(f"startup: {milestone:<24} {at * 1e3:8.1f} ms\n")
+        for task in self.tasks.values():
+            state = "failed" if task.error is not None else ("done" if task.done else "running")
+            out.write(f"startup: task {task.name:<19} {task.elapsed * 1e3:8.1f} ms ({state})\n")
@@ -0,0 +1,169 @@
+import weakref
+import numpy as np
+import pygame
+from typing import Optional, Tuple, Union
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # pygame built without the SDL2 video bindings
+    video = None
+
+Dest = Union[pygame.Rect, Tuple[int, int]]
+
+
+def unpremultiply(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Converts a premultiplied-alpha surface back to straight alpha.
+
+    SDL's software renderer only supports the predefined blend modes, so
+    premultiplied sprites are uploaded in straight alpha instead.
+
+    Args:
+        surface (pygame.Surface): Premultiplied SRCALPHA surface.
+
+    Returns:
+        pygame.Surface: A straight-alpha copy.
+    """
+    result = surface.copy()
+    rgb = pygame.surfarray.pixels3d(result)
+    alpha = pygame.surfarray.pixels_alpha(result)
+    visible = alpha > 0
+    a = alpha[visible].astype(np.uint16)[:, np.newaxis]
+    rgb[visible] = np.minimum(255, (rgb[visible].astype(np.uint16) * 255 + a // 2) // a).astype(np.uint8)
+    del rgb, alpha  # Unlock the surface
+    return result
+
+
+class TextureBackend:
+    """
+    Compositing through pygame._sdl2.video (Renderer/Texture).
+
+    Every sprite the renderer blits is uploaded once as a Texture and drawn by
+    the SDL renderer, so blending and scaling run on the GPU when one is
+    available. The same path works on SDL's software renderer, e.g. headless
+    with the dummy video driver.
+    """
+    def __init__(self, title: str, size: Tuple[int, int], resizable: bool = True,
+                 accelerated: int = -1, vsync: bool = False) -> None:
+        """
+        Opens the window and its renderer.
+
+        Args:
+            title (str): Window title.
+            size (Tuple[int, int]): Window size.
+            resizable (bool): Whether the window can be resized.
+            accelerated (int): 1 for hardware only, 0 for software, -1 to prefer hardware.
+            vsync (bool): Synchronize present() with the display refresh.
+
+        Raises:
+            pygame.error: If the SDL2 video bindings or a renderer are unavailable.
+        """
+        if video is None:
+            raise pygame.error("pygame._sdl2.video is not available")
+        self.window = video.Window(title, size, resizable=resizable)
+        self.renderer = video.Renderer(self.window, accelerated=accelerated, vsync=vsync)
+
+        # Textures live as long as the surface they were made from
+        self.textures: "weakref.WeakKeyDictionary[pygame.Surface, video.Texture]" = weakref.WeakKeyDictionary()
+
+        # Full-window base layer, re-uploaded only when its key changes
+        self.layer_texture: Optional[video.Texture] = None
+        self.layer_key = None
+
+        # Camera preview: a streaming texture updated in place every frame
+        self.stream_surface: Optional[pygame.Surface] = None
+        self.stream_texture: Optional[video.Texture] = None
+
+    def texture(self, surface: pygame.Surface, premultiplied: bool = False) -> "video.Texture":
+        """
+        Returns the texture for a surface, uploading it on first use.
+
+        The surface must not be modified afterwards (cached sprites never are).
+
+        Args:
+            surface (pygame.Surface): Source sprite.
+            premultiplied (bool): Whether the surface holds premultiplied alpha.
+        """
+        texture = self.textures.get(surface)
+        if texture is None:
+            source = unpremultiply(surface) if premultiplied else surface
+            texture = video.Texture.from_surface(self.renderer, source)
+            texture.blend_mode = 1  # SDL_BLENDMODE_BLEND
+            self.textures[surface] = texture
+        return texture
+
+    def blit(self, surface: pygame.Surface, dest: Dest, area: Optional[pygame.Rect] = None,
+             premultiplied: bool = False) -> None:
+        """
+        Draws a sprite like Surface.blit, at its natural size.
+
+        Args:
+            surface (pygame.Surface): Source sprite.
+            dest (Dest): Destination rect or top-left position.
+            area (pygame.Rect): Optional source sub-rectangle.
+            premultiplied (bool): Whether the surface holds premultiplied alpha.
+        """
+        size = area.size if area is not None else surface.get_size()
+        self.texture(surface, premultiplied).draw(srcrect=area, dstrect=pygame.Rect(tuple(dest)[:2], size))
+
+    def begin(self, layer: pygame.Surface, key) -> None:
+        """
+        Starts a frame with a full-window base layer.
+
+        Args:
+            layer (pygame.Surface): Opaque window-sized surface.
+            key: Identifies the layer contents; the upload is skipped while it is unchanged.
+        """
+        if key != self.layer_key or self.layer_texture is None:
+            if self.layer_texture is not None and self.layer_texture.get_rect().size == layer.get_size():
+                self.layer_texture.update(layer)
+            else:
+                self.layer_texture = video.Texture.from_surface(self.renderer, layer)
+            self.layer_key = key
+        self.layer_texture.draw()
+
+    def update_stream(self, frame: np.ndarray) -> None:
+        """
+        Uploads a camera frame into the streaming preview texture.
+
+        Args:
+            frame (np.ndarray): RGB image of shape (height, width, 3).
+        """
+        height, width = frame.shape[:2]
+        if self.stream_surface is None or self.stream_surface.get_size() != (width, height):
+            self.stream_surface = pygame.Surface((width, height), 0, 24)
+            self.stream_texture = video.Texture(self.renderer, (width, height), streaming=True)
+        pygame.surfarray.blit_array(self.stream_surface, frame.swapaxes(0, 1))
+        self.stream_texture.update(self.stream_surface)
+
+    def draw_stream(self, dest: pygame.Rect) -> None:
+        """
+        Draws the camera preview, scaled to dest by the SDL renderer.
+
+        Args:
+            dest (pygame.Rect): Destination rectangle.
+        """
+        if self.stream_texture is not None:
+            self.stream_texture.draw(dstrect=dest)
+
+    def present(self) -> None:
+        """Shows the finished frame."""
+        self.renderer.present()
+
+    def read_pixels(self) -> pygame.Surface:
+        """
+        Copies the current frame back into a surface (slow; for tests and captures).
+
+        Returns:
+            pygame.Surface: The window contents.
+        """
+        return self.renderer.to_surface()
+
+    def resize(self) -> None:
+        """Drops the base layer after the window size changed."""
+        self.layer_texture = None
+        self.layer_key = None
+
+    def clear_textures(self) -> None:
+        """Drops every cached sprite texture."""
+        self.textures.clear()
@@ -0,0 +1,115 @@
+import os
+import time
+from typing import Any, List, NamedTuple, Optional, Tuple
+import numpy as np
+from constants import *
+from events import EventType, GameEvent
+
+
+class Trace(NamedTuple):
+    """
+    The landmarks one game's update_interaction received, one sample per
+    frame, from the start of a game to its win, reset or the end of the run.
+    """
+    num_disks: int
+    width: int            # Layout the landmarks are in (the player's view)
+    height: int
+    times: np.ndarray     # (N,) float64, game clock seconds
+    present: np.ndarray   # (N,) bool, False where the hand was not tracked
+    landmarks: np.ndarray # (N, 3, 2) float32, index tip, thumb tip, wrist
+
+    def samples(self):
+        """(time, landmarks or None) pairs, as passed to update_interaction."""
+        for t, present, landmarks in zip(self.times.tolist(), self.present.tolist(), self.landmarks.tolist()):
+            yield t, (landmarks if present else None)
+
+
+def save_trace(path: str, trace: Trace) -> None:
+    np.savez_compressed(path, num_disks=trace.num_disks, size=(trace.width, trace.height),
+                        times=trace.times, present=trace.present, landmarks=trace.landmarks)
+
+
+def load_trace(path: str) -> Trace:
+    with np.load(path) as data:
+        width, height = data["size"].tolist()
+        return Trace(int(data["num_disks"]), width, height, data["times"], data["present"], data["landmarks"])
+
+
+def load_traces(directory: str) -> List[Trace]:
+    """Every trace in a directory, in name (recording) order."""
+    return [load_trace(os.path.join(directory, name))
+            for name in sorted(os.listdir(directory)) if name.endswith(".npz")]
+
+
+class TraceRecorder:
+    """
+    Event bus subscriber that cuts a game's landmark stream into traces.
+
+    The game loop calls add() where it calls update_interaction. A trace
+    starts at GAME_START (or a RESET mid-game) and ends at WIN or the next
+    RESET. Events are delivered a frame late, so samples are split by the
+    event's timestamp rather than by arrival order.
+    """
+    def __init__(self, game: Any, directory: str = TRACE_DIR, player: int = 0) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            game (TowerOfHanoiGame): Game whose input is recorded (read for disk count and state).
+            directory (str): Where traces are written, one .npz per game.
+            player (int): Player number, part of the file name.
+        """
+        self.game = game
+        self.directory = directory
+        self.player = player
+        self.samples: List[Tuple[float, Optional[List[Tuple[float, float]]]]] = []
+        self.start: Optional[float] = None  # Time the open trace began (None = no trace open)
+        self.num_disks = game.num_disks
+        self.size = (0, 0)
+        self.saved: List[str] = []
+
+    def add(self, landmarks: Optional[List[Tuple[float, float]]], layout: Any) -> None:
+        """
+        Records the landmarks passed to update_interaction (once per frame).
+
+        Args:
+            landmarks: As passed to update_interaction.
+            layout (Layout): As passed to update_interaction.
+        """
+        self.samples.append((self.game.clock.time, landmarks))
+        self.size = (layout.width, layout.height)
+
+    def on_event(self, event: GameEvent) -> None:
+        if event.kind == EventType.WIN:
+            self.finish(event.timestamp, inclusive=True)
+        elif event.kind in (EventType.GAME_START, EventType.RESET):
+            self.finish(event.timestamp, inclusive=False)
+            if self.game.game_started:
+                self.start = event.timestamp
+                self.num_disks = self.game.num_disks
+                self.samples = [sample for sample in self.samples if sample[0] >= event.timestamp]
+
+    def finish(self, end: float = float("inf"), inclusive: bool = True) -> Optional[str]:
+        """
+        Writes the open trace (samples up to `end`), if any.
+
+        Returns:
+            Optional[str]: Path written, or None.
+        """
+        before = [s for s in self.samples if s[0] < end or (inclusive and s[0] == end)]
+        self.samples = self.samples[len(before):]
+        if self.start is None:
+            return None
+        self.start = None
+        if not before:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-p{self.player}-{len(self.saved)}.npz")
+        present = np.array([landmarks is not None for _, landmarks in before])
+        landmarks = np.zeros((len(before), 3, 2), dtype=np.float32)
+        for i, (_, points) in enumerate(before):
+            if points is not None:
+                landmarks[i] = points
+        save_trace(path, Trace(self.num_disks, *self.size, np.array([t for t, _ in before]), present, landmarks))
+        self.saved.append(path)
+        return path
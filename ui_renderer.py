@@ -1,40 +1,228 @@
+import os
 import pygame
-import cv2
 import numpy as np
-import time
-import math
 import random
+from itertools import islice
 from constants import *
+from events import EventType
+from render_cache import LRUCache
+from backgrounds import get_background
+from particles import ParticleSystem
+from texture_backend import TextureBackend
+from layout import get_layout
+
+# Attributes each split-screen view keeps for itself; swap_view() exchanges
+# them with the renderer's, so all drawing code works unchanged on a view
+VIEW_STATE = ("width", "height", "layout", "screen", "background_surface", "disk_metrics",
+              "static_layer", "static_layer_key", "board_layer", "board_layer_key", "widget_state",
+              "full_redraw", "particles", "camera_visible", "player_label", "debug_lines")
+
+def default_font(name, size, bold=False):
+    # pygame's bundled font whatever the family, so headless output is the
+    # same on every machine (golden images)
+    font = pygame.font.Font(None, size)
+    font.set_bold(bold)
+    return font
 
 class GameRenderer:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, backend=RENDER_BACKEND, headless=False, assets=None):
+        if headless:
+            # Offscreen: SDL's dummy video driver, no window or GPU needed
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pygame.init()
         pygame.display.set_caption("Tower of Hanoi - Professional Edition")
         self.width = screen_width
         self.height = screen_height
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+        self.layout = get_layout(self.width, self.height)
+        
+        # Backend: "texture" composites SDL2 textures (GPU when available),
+        # "surface" blits onto the display surface. Same API either way.
+        self.gpu = None
+        if backend == "texture":
+            try:
+                self.gpu = TextureBackend("Tower of Hanoi - Professional Edition", (self.width, self.height))
+            except pygame.error as e:
+                print(f"Texture backend unavailable ({e}), falling back to surfaces.")
+        self.screen = None if self.gpu else pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
         self.clock = pygame.time.Clock()
         
-        # Load high-quality fonts (Serif/Sans-Serif mix for elegance)
-        self.title_font = pygame.font.SysFont('Georgia', 56, bold=True)
-        self.font = pygame.font.SysFont('Arial', 28, bold=True) # Bold for readability
-        self.small_font = pygame.font.SysFont('Arial', 18, bold=True)
+        # Load high-quality fonts (Serif/Sans-Serif mix for elegance).
+        # Font paths come from the asset cache when there is one, which skips
+        # the system font scan. Headless rendering uses the bundled font.
+        self.assets = assets
+        if headless:
+            self.load_font = default_font
+        else:
+            self.load_font = assets.load_font if assets else pygame.font.SysFont
+        self.title_font = self.load_font('Georgia', 56, bold=True)
+        self.font = self.load_font('Arial', 28, bold=True) # Bold for readability
+        self.small_font = self.load_font('Arial', 18, bold=True)
         
         self.camera_feed_surface = None
-        self.play_button_rect = pygame.Rect(0, 0, 240, 60)
+        self.startup_status = None # Progress line shown while loading in the background
+        self.debug_lines = None # Frame timing overlay (toggled from the game loop)
+        self.debug_font = None
         
-        self.particles = []
+        self.particles = ParticleSystem()
         self.background_surface = None
         
+        # Disk geometry + pre-rendered strips for deep stacks (level of detail)
+        self.disk_metrics = None
+        self.disk_strip_cache = LRUCache(DISK_LOD_CACHE_SIZE)
+        
+        # Pre-rendered disks (body, bevels, rim and label baked in)
+        self.disk_sprites = LRUCache(DISK_SPRITE_CACHE_SIZE)
+        
+        # Glass panels (shadow, body and border baked in) and other UI sprites
+        self.panel_cache = LRUCache(PANEL_CACHE_SIZE)
+        
+        # Pinch cursor per color (the carrying pulse cycles through ~100)
+        self.cursor_sprites = LRUCache(CURSOR_CACHE_SIZE)
+        
+        # Rendered strings (shadow baked in) and per-glyph atlases for counters
+        self.text_cache = LRUCache(TEXT_CACHE_SIZE)
+        self.glyph_atlases = {}
+        
+        # Scene layers: static (background, floor, posts, labels) and board
+        # (static + stacked disks), each rebuilt only when its key changes
+        self.static_layer = None
+        self.static_layer_key = None
+        self.board_layer = None
+        self.board_layer_key = None
+        self.play_layer = None
+        self.play_layer_key = None
+        
+        # Damage tracking: bounds/key of each widget drawn last frame
+        self.widget_state = {}
+        self.current_screen = None
+        self.full_redraw = True
+        self.camera_frame_id = 0
+        
+        # Split-screen views (one per player), see set_players()
+        self.views = []
+        self.camera_visible = True
+        self.player_label = None
+        
     def handle_resize(self, new_width, new_height):
         self.width = new_width
         self.height = new_height
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+        self.layout = get_layout(self.width, self.height)
+        if self.gpu:
+            self.gpu.resize()
+        else:
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
         self.background_surface = None
+        self.disk_metrics = None
+        self.disk_strip_cache.clear()
+        self.disk_sprites.clear()
+        self.static_layer_key = None
+        self.board_layer = None
+        self.board_layer_key = None
+        self.play_layer_key = None
+        if self.views:
+            # Views are subsurfaces of the old window
+            self.set_players(len(self.views))
+        self.widget_state = {}
+        self.full_redraw = True
+        
+    def set_players(self, count):
+        # One view per player, side by side. Views only keep their own
+        # layout, layers and damage state; sprite, text and panel caches are
+        # shared, so every extra board mostly costs its widgets.
+        self.views = []
+        if count < 2:
+            return
+        if self.gpu:
+            raise ValueError("Split screen needs the surface backend")
+        view_w = self.width // count
+        for i in range(count):
+            rect = pygame.Rect(i * view_w, 0, view_w, self.height)
+            layout = get_layout(rect.width, rect.height)
+            self.views.append({
+                "width": rect.width, "height": rect.height, "layout": layout,
+                "screen": self.screen.subsurface(rect), "background_surface": None, "disk_metrics": None,
+                "static_layer": None, "static_layer_key": None, "board_layer": None, "board_layer_key": None,
+                "widget_state": {}, "full_redraw": True,
+                "particles": ParticleSystem(),
+                # The camera preview only fits in the last view when the HUD leaves room for it
+                "camera_visible": i == count - 1 and layout.camera_panel.left > layout.hud_panel.right + 20,
+                "player_label": f"PLAYER {i + 1}", "debug_lines": None,
+            })
+        
+    def swap_view(self, view):
+        for name in VIEW_STATE:
+            value = getattr(self, name)
+            setattr(self, name, view[name])
+            view[name] = value
+            
+    def player_layout(self, index):
+        # Layout a player's gestures are mapped to (the whole window with one player)
+        return self.views[index]["layout"] if self.views else self.layout
+        
+    def view_event_handler(self, index):
+        # Event subscriber that spawns effects in one player's view
+        def on_event(event):
+            view = self.views[index]
+            self.swap_view(view)
+            try:
+                self.on_event(event)
+            finally:
+                self.swap_view(view)
+        return on_event
+        
+    def convert(self, surface):
+        # Pixel-format conversion needs a display surface, which the texture
+        # backend does not have (its sprites become textures instead)
+        return surface.convert_alpha() if self.screen is not None else surface
+        
+    def blit(self, surface, dest, premultiplied=False):
+        if self.gpu:
+            self.gpu.blit(surface, dest, premultiplied=premultiplied)
+        else:
+            self.screen.blit(surface, dest, special_flags=pygame.BLEND_PREMULTIPLIED if premultiplied else 0)
+            
+    def snapshot(self):
+        # Copy of the last rendered frame
+        return self.gpu.read_pixels() if self.gpu else self.screen.copy()
+        
+    def get_disk_metrics(self, num_disks):
+        # Disk sizes scale with the window and the disk count so that any stack
+        # fits on its rod. Recomputed only when one of those changes.
+        key = (self.width, self.height, num_disks)
+        if self.disk_metrics is None or self.disk_metrics[0] != key:
+            scale = min(self.width / SCREEN_WIDTH, self.height / SCREEN_HEIGHT)
+            tower_height = max(TOWER_WIDTH * 2, int(TOWER_HEIGHT * scale))
+            
+            # Widest disk must leave a gap between neighbouring posts
+            max_w = max(2, min(BASE_DISK_WIDTH * scale, self.width / 3 - 20))
+            min_w = min(max_w, DISK_MIN_WIDTH * scale)
+            step = DISK_WIDTH_STEP * scale
+            if num_disks > 1:
+                step = min(step, (max_w - min_w) / (num_disks - 1))
+                
+            # Integer heights keep cached strips seamless
+            disk_h = (tower_height - TOWER_WIDTH) // max(1, num_disks)
+            disk_h = max(1, min(int(DISK_HEIGHT * scale), disk_h))
+            
+            self.disk_metrics = (key, tower_height, max_w, step, disk_h)
+        return self.disk_metrics
+        
+    def get_disk_size(self, disk, metrics):
+        # Disk numbers follow the game rule: a larger number is a larger disk
+        key, _, max_w, step, disk_h = metrics
+        num_disks = key[2]
+        return max(2, int(max_w - (num_disks - disk) * step)), disk_h
         
     def prepare_camera_surface(self, frame):
-        # Frame is likely 640x480 from CV2
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Frame is likely 640x480 BGR from CV2; reversing the channel axis gives RGB
+        frame = frame[..., ::-1]
+        
+        if self.gpu:
+            # Streaming texture updated in place; the renderer scales it on draw
+            self.gpu.update_stream(frame)
+            self.camera_feed_surface = self.gpu.stream_surface
+            self.camera_frame_id += 1
+            return
         
         # Pygame expects (Width, Height, Channels), CV2 is (Height, Width, Channels)
         # We need to transpose/swap axes 0 and 1
@@ -45,114 +233,157 @@ class GameRenderer:
         # Scale to a reasonable preview size (maintaining 4:3 aspect ratio)
         # 640x480 -> 320x240 (Half size is clearer than 240x180)
         self.camera_feed_surface = pygame.transform.smoothscale(frame, (320, 240))
+        self.camera_frame_id += 1
         
     def create_background(self):
         if self.background_surface is None:
-            self.background_surface = pygame.Surface((self.width, self.height))
-            self.background_surface.fill(COLOR_BG_DARK)
-            
-            # Simple Metallic Gradient
-            for y in range(self.height):
-                # Interpolate between Off-White and Light-Steel-Blue
-                ratio = y / self.height
-                r = 255 - ratio * 20
-                g = 255 - ratio * 15
-                b = 255 - ratio * 10
-                pygame.draw.line(self.background_surface, (r, g, b), (0, y), (self.width, y))
+            # Metallic gradient (Off-White to Light-Steel-Blue) with steel grid
+            self.background_surface = get_background((self.width, self.height), BACKGROUND_STOPS, COLOR_GRID,
+                                                     assets=self.assets)
 
-    def update_particles(self, dt):
-        alive_particles = []
-        for p in self.particles:
-            p['x'] += p['vx'] * dt * 60
-            p['y'] += p['vy'] * dt * 60
-            p['life'] -= dt
-            if p['life'] > 0:
-                alive_particles.append(p)
-        self.particles = alive_particles
+    def on_event(self, event):
+        # Glint at the top of the post a disk was placed on
+        if event.kind == EventType.DROP_VALID and self.disk_metrics is not None:
+            x = self.layout.tower_x[event.tower]
+            y = self.layout.stage_ground_y - self.disk_metrics[1]
+            self.particles.spawn(x, y)
 
-    def spawn_particles(self, x, y, color):
-        for _ in range(5):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 3)
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': random.uniform(0.3, 0.6),
-                'color': (255, 255, 255), # Glints are white
-                'size': random.randint(1, 3)
-            })
-
-    def draw_particles(self):
-        for p in self.particles:
-            alpha = int(255 * (p['life'] / 0.6))
-            s = pygame.Surface((p['size']*2, p['size']*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*p['color'], alpha), (p['size'], p['size']), p['size'])
-            self.screen.blit(s, (int(p['x']-p['size']), int(p['y']-p['size'])))
-            
-    def draw_glass_panel(self, rect, border_radius=10):
+    def get_glass_panel(self, size, border_radius):
         # Frosted "Crystal" effect
         # 1. White semi-transparent fill
         # 2. Blur (simulated by just lightening)
         # 3. Crisp gray border
         # 4. Drop shadow
-        
-        # Shadow
-        shadow_rect = rect.copy()
-        shadow_rect.x += 4
-        shadow_rect.y += 4
-        shadow_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surf, (0, 0, 0, 30), shadow_surf.get_rect(), border_radius=border_radius)
-        self.screen.blit(shadow_surf, shadow_rect)
-        
-        # Glass Body
-        s = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        s.fill((255, 255, 255, 180)) # Milky white
-        pygame.draw.rect(s, (255, 255, 255, 100), s.get_rect(), border_radius=border_radius)
-        self.screen.blit(s, rect)
-        
-        # Border (Crisp Steel)
-        pygame.draw.rect(self.screen, (150, 160, 170), rect, 1, border_radius=border_radius)
+        # Rendered once per (size, radius) with the shadow pre-composited.
+        # Layers are combined premultiplied so the result blends like the
+        # separate shadow + body blits did.
+        key = (size, border_radius)
+        panel = self.panel_cache.get(key)
+        if panel is None:
+            width, height = size
+            panel = pygame.Surface((width + 4, height + 4), pygame.SRCALPHA)
+            
+            # Shadow
+            pygame.draw.rect(panel, (0, 0, 0, 30), (4, 4, width, height), border_radius=border_radius)
+            panel = panel.premul_alpha()
+            
+            # Glass Body
+            s = pygame.Surface(size, pygame.SRCALPHA)
+            s.fill((255, 255, 255, 180)) # Milky white
+            pygame.draw.rect(s, (255, 255, 255, 100), s.get_rect(), border_radius=border_radius)
+            panel.blit(s.premul_alpha(), (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            
+            # Border (Crisp Steel, opaque so already premultiplied)
+            pygame.draw.rect(panel, (150, 160, 170), (0, 0, width, height), 1, border_radius=border_radius)
+            
+            panel = self.convert(panel)
+            self.panel_cache.put(key, panel)
+        return panel
+
+    def draw_glass_panel(self, rect, border_radius=10, target=None):
+        panel = self.get_glass_panel(rect.size, border_radius)
+        if target is None:
+            self.blit(panel, rect.topleft, premultiplied=True)
+        else:
+            target.blit(panel, rect.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
+            
+    def get_frame_sprite(self, size, color, width):
+        # Hollow rectangle outline
+        key = ("frame", size, color, width)
+        frame = self.panel_cache.get(key)
+        if frame is None:
+            frame = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(frame, color, frame.get_rect(), width)
+            frame = self.convert(frame)
+            self.panel_cache.put(key, frame)
+        return frame
+
+    def get_text_surface(self, text, font, color, shadow=False):
+        key = (font, text, color, shadow)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            txt = font.render(text, True, color)
+            if shadow:
+                # Subtle drop shadow for "lifting" text off the page
+                surf = pygame.Surface((txt.get_width() + 1, txt.get_height() + 1), pygame.SRCALPHA)
+                surf.blit(font.render(text, True, (180, 180, 190)), (1, 1))
+                surf.blit(txt, (0, 0))
+            else:
+                surf = txt
+            surf = self.convert(surf)
+            self.text_cache.put(key, surf)
+        return surf
 
-    def draw_text(self, text, font, color, center_pos, shadow=True):
+    def draw_text(self, text, font, color, center_pos, shadow=True, target=None):
+        surf = self.get_text_surface(text, font, color, shadow)
+        w, h = surf.get_size()
         if shadow:
-            # Subtle drop shadow for "lifting" text off the page
-            sh_txt = font.render(text, True, (180, 180, 190))
-            sh_rect = sh_txt.get_rect(center=(center_pos[0]+1, center_pos[1]+1))
-            self.screen.blit(sh_txt, sh_rect)
+            w, h = w - 1, h - 1
+        rect = pygame.Rect(0, 0, w, h)
+        rect.center = center_pos
+        if target is None:
+            self.blit(surf, rect)
+        else:
+            target.blit(surf, rect)
+        return rect
+        
+    def get_glyph_atlas(self, font, color):
+        # One surface per character, rendered on first use
+        key = (font, color)
+        atlas = self.glyph_atlases.get(key)
+        if atlas is None:
+            atlas = self.glyph_atlases[key] = {}
+        return atlas
+        
+    def draw_counter(self, label, value, font, color, center_pos):
+        # Static label from the text cache, changing value composed from
+        # cached glyphs, so ticking counters never hit the rasterizer
+        label_surf = self.get_text_surface(label, font, color)
+        atlas = self.get_glyph_atlas(font, color)
+        glyphs = []
+        width = label_surf.get_width()
+        for ch in value:
+            glyph = atlas.get(ch)
+            if glyph is None:
+                glyph = atlas[ch] = self.convert(font.render(ch, True, color))
+            glyphs.append(glyph)
+            width += glyph.get_width()
             
-        txt = font.render(text, True, color)
-        rect = txt.get_rect(center=center_pos)
-        self.screen.blit(txt, rect)
+        rect = pygame.Rect(0, 0, width, label_surf.get_height())
+        rect.center = center_pos
+        self.blit(label_surf, rect)
+        x = rect.x + label_surf.get_width()
+        for glyph in glyphs:
+            self.blit(glyph, (x, rect.y))
+            x += glyph.get_width()
         return rect
         
     def draw_camera_preview(self):
          if self.camera_feed_surface:
-            # Dimensions: 320x240
-            rect_w, rect_h = 320, 240
-            padding = 10
-            x = self.width - rect_w - 30
-            y = 30
-            
-            panel_rect = pygame.Rect(x - padding, y - padding, rect_w + padding*2, rect_h + padding*2 + 30)
-            self.draw_glass_panel(panel_rect, 8)
+            layout = self.layout
+            self.draw_glass_panel(layout.camera_panel, 8)
             
-            # Feed
-            self.screen.blit(self.camera_feed_surface, (x, y))
+            # Feed (320x240)
+            feed_rect = layout.camera_feed
+            if self.gpu:
+                self.gpu.draw_stream(feed_rect)
+            else:
+                self.screen.blit(self.camera_feed_surface, feed_rect)
             
             # Border around feed
-            pygame.draw.rect(self.screen, (50, 50, 50), (x, y, rect_w, rect_h), 2)
+            self.blit(self.get_frame_sprite(feed_rect.size, (50, 50, 50), 2), feed_rect)
             
             # Label
-            lbl = self.small_font.render("CAMERA FEED", True, COLOR_TEXT_DIM)
-            self.screen.blit(lbl, (panel_rect.centerx - lbl.get_width()//2, y + rect_h + 8))
+            lbl = self.get_text_surface("CAMERA FEED", self.small_font, COLOR_TEXT_DIM)
+            label_x, label_y = layout.camera_label_pos
+            self.blit(lbl, (label_x - lbl.get_width()//2, label_y))
 
-    def draw_metallic_disk(self, rect, base_color):
+    def draw_metallic_disk(self, rect, base_color, target=None):
         # Simulate metal cylinder with vertical shine (horizontal gradient)
+        target = target or self.screen
         
         # 1. Main body
-        pygame.draw.rect(self.screen, base_color, rect, border_radius=DISK_ROUNDING)
+        pygame.draw.rect(target, base_color, rect, border_radius=DISK_ROUNDING)
         
         # 2. Highlights (Shine) to look like a cylinder
         # We need a surface to blit highlights
@@ -169,143 +400,359 @@ class GameRenderer:
         pygame.draw.rect(s, (0, 0, 0, 50), (0, rect.height-4, rect.width, 4), border_radius=DISK_ROUNDING) # Bottom edge
         
         # Apply texture
-        self.screen.blit(s, rect)
+        target.blit(s, rect)
         
         # 3. Rim Outline (Darker version of base color)
-        pygame.draw.rect(self.screen, (50, 50, 60), rect, 1, border_radius=DISK_ROUNDING)
+        pygame.draw.rect(target, (50, 50, 60), rect, 1, border_radius=DISK_ROUNDING)
+
+    def get_disk_sprite(self, disk, size):
+        # Built once per (disk, color, size); size already reflects the scale
+        color = DISK_COLORS[(disk - 1) % len(DISK_COLORS)]
+        key = (disk, color, size)
+        sprite = self.disk_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            rect = sprite.get_rect()
+            
+            # Level of detail: thin disks (large stacks) skip bevels and labels
+            if rect.height >= DISK_LOD_BEVEL_MIN_HEIGHT:
+                self.draw_metallic_disk(rect, color, sprite)
+            else:
+                sprite.fill(color)
+                
+            if rect.height >= DISK_LOD_LABEL_MIN_HEIGHT:
+                # Label (Etched)
+                lbl = self.small_font.render(str(disk), True, (50, 50, 50))
+                sprite.blit(lbl, lbl.get_rect(center=rect.center))
+                
+            sprite = self.convert(sprite)
+            self.disk_sprites.put(key, sprite)
+        return sprite
+
+    def draw_disk(self, rect, disk, target=None):
+        sprite = self.get_disk_sprite(disk, rect.size)
+        if target is None:
+            self.blit(sprite, rect)
+        else:
+            target.blit(sprite, rect)
+
+    def get_disk_strip(self, disks, metrics):
+        # Pre-rendered run of DISK_LOD_CHUNK disks, bottom disk first.
+        # Deep parts of a stack rarely change, so these stay cached.
+        key = (metrics[0], disks)
+        strip = self.disk_strip_cache.get(key)
+        if strip is None:
+            sizes = [self.get_disk_size(disk, metrics) for disk in disks]
+            strip_w = max(w for w, _ in sizes)
+            disk_h = metrics[4]
+            strip = pygame.Surface((strip_w, disk_h * len(disks)), pygame.SRCALPHA)
+            
+            for j, (disk, (disk_w, _)) in enumerate(zip(disks, sizes)):
+                rect = pygame.Rect(0, 0, disk_w, disk_h)
+                rect.midbottom = (strip_w // 2, strip.get_height() - j * disk_h)
+                self.draw_disk(rect, disk, strip)
+                
+            strip = self.convert(strip)
+            self.disk_strip_cache.put(key, strip)
+        return strip
 
-    def draw_tower(self, x_pos, y_base, disks):
+    def draw_tower(self, x_pos, y_base, metrics, target):
+        tower_height = metrics[1]
+        
         # 1. Base (Marble slab)
         base_rect = pygame.Rect(x_pos - TOWER_BASE_WIDTH//2, y_base, TOWER_BASE_WIDTH, TOWER_BASE_HEIGHT)
-        pygame.draw.rect(self.screen, (100, 100, 100), base_rect, border_radius=2)
+        pygame.draw.rect(target, (100, 100, 100), base_rect, border_radius=2)
         # Top highlight
-        pygame.draw.line(self.screen, (200, 200, 200), base_rect.topleft, base_rect.topright, 2)
+        pygame.draw.line(target, (200, 200, 200), base_rect.topleft, base_rect.topright, 2)
         
         # 2. Rod (Polished Steel)
-        rod_rect = pygame.Rect(x_pos - TOWER_WIDTH//2, y_base - TOWER_HEIGHT, TOWER_WIDTH, TOWER_HEIGHT)
-        pygame.draw.rect(self.screen, (120, 120, 130), rod_rect, border_radius=TOWER_WIDTH//2)
+        rod_rect = pygame.Rect(x_pos - TOWER_WIDTH//2, y_base - tower_height, TOWER_WIDTH, tower_height)
+        pygame.draw.rect(target, (120, 120, 130), rod_rect, border_radius=TOWER_WIDTH//2)
         # Rod Shine
-        pygame.draw.line(self.screen, (200, 200, 210), (rod_rect.centerx - 3, rod_rect.top), (rod_rect.centerx - 3, rod_rect.bottom), 3)
+        pygame.draw.line(target, (200, 200, 210), (rod_rect.centerx - 3, rod_rect.top), (rod_rect.centerx - 3, rod_rect.bottom), 3)
+        
+    def draw_stack(self, x_pos, y_base, disks, metrics, target):
+        disk_h = metrics[4]
+        
+        # 3. Deep stack (cached strips)
+        count = len(disks)
+        detail_start = 0
+        if count > DISK_LOD_DETAIL:
+            chunks = (count - DISK_LOD_DETAIL) // DISK_LOD_CHUNK
+            for c in range(chunks):
+                start = c * DISK_LOD_CHUNK
+                chunk = tuple(islice(disks, start, start + DISK_LOD_CHUNK))
+                strip = self.get_disk_strip(chunk, metrics)
+                target.blit(strip, strip.get_rect(midbottom=(x_pos, y_base - start * disk_h)))
+            detail_start = chunks * DISK_LOD_CHUNK
         
         # 4. Disks
-        for j, disk in enumerate(disks):
-            # Calculate pos
-            disk_w = BASE_DISK_WIDTH - (disk - 1) * 35
-            rect = pygame.Rect(0, 0, disk_w, DISK_HEIGHT)
-            rect.center = (x_pos, y_base - (j + 1) * DISK_HEIGHT + DISK_HEIGHT//2)
-            
-            color = DISK_COLORS[(disk - 1) % len(DISK_COLORS)]
-            self.draw_metallic_disk(rect, color)
-            
-            # Label (Etched)
-            lbl = self.small_font.render(str(disk), True, (50, 50, 50))
-            self.screen.blit(lbl, lbl.get_rect(center=rect.center))
+        for j in range(detail_start, count):
+            disk = disks[j]
+            disk_w, _ = self.get_disk_size(disk, metrics)
+            rect = pygame.Rect(0, 0, disk_w, disk_h)
+            rect.midbottom = (x_pos, y_base - j * disk_h)
+            self.draw_disk(rect, disk, target)
 
-    def draw_game_screen(self, game_state):
-        self.create_background()
-        self.screen.blit(self.background_surface, (0,0))
-        
-        stage_ground_y = self.height // 2 + 150
-        
-        # HUD Panel
-        hud_panel = pygame.Rect(30, 30, 220, 90)
+    def get_static_layer(self, metrics):
+        # Background, floor, posts and labels: only change with the window size
+        key = (self.width, self.height, metrics[1])
+        if self.static_layer_key != key:
+            self.create_background()
+            layer = self.background_surface.copy()
+            layout = self.layout
+            
+            self.draw_floor(layout.stage_ground_y, layer)
+            for i, x in enumerate(layout.tower_x):
+                self.draw_tower(x, layout.stage_ground_y, metrics, layer)
+                
+                # Label
+                self.draw_text(f"POST {i+1}", self.font, COLOR_TEXT_DIM, layout.post_label_centers[i], target=layer)
+                
+            self.static_layer = layer
+            self.static_layer_key = key
+        return self.static_layer
+        
+    def get_board_layer(self, game_state, metrics):
+        # Static layer plus the stacked disks, rebuilt only when the towers
+        # change (TowerOfHanoiGame.board_version)
+        key = (metrics[0], id(game_state), game_state.board_version)
+        if self.board_layer_key != key:
+            static = self.get_static_layer(metrics)
+            if self.board_layer is None or self.board_layer.get_size() != static.get_size():
+                self.board_layer = static.copy()
+            else:
+                self.board_layer.blit(static, (0, 0))
+                
+            for i, x in enumerate(self.layout.tower_x):
+                self.draw_stack(x, self.layout.stage_ground_y, game_state.towers[i], metrics, self.board_layer)
+                
+            self.board_layer_key = key
+        return self.board_layer
+        
+    def panel_bounds(self, rect):
+        # Glass panels cast a shadow 4px down/right
+        return rect.union(rect.move(4, 4))
+        
+    def text_bounds(self, text, font, center_pos, shadow=True):
+        rect = pygame.Rect((0, 0), font.size(text))
+        rect.center = center_pos
+        return rect.union(rect.move(1, 1)) if shadow else rect
+        
+    def draw_hud(self, hud_panel, time_text, moves_text):
         self.draw_glass_panel(hud_panel)
+        self.draw_counter("TIME: ", time_text, self.font, COLOR_WHITE, self.layout.hud_time_center)
+        self.draw_counter("MOVES: ", moves_text, self.font, COLOR_WHITE, self.layout.hud_moves_center)
         
-        time_text = f"TIME: {game_state.elapsed_time:.1f}s"
-        self.draw_text(time_text, self.font, COLOR_WHITE, (hud_panel.centerx, hud_panel.top + 25), False)
+    def draw_message(self, msg_rect, message):
+        self.draw_glass_panel(msg_rect)
+        self.draw_text(message, self.font, (20, 20, 20), msg_rect.center, False)
         
-        moves_text = f"MOVES: {game_state.moves}"
-        self.draw_text(moves_text, self.font, COLOR_WHITE, (hud_panel.centerx, hud_panel.bottom - 25), False)
+    def draw_floor(self, stage_ground_y, target):
+        # Floor (Tabletop)
+        pygame.draw.rect(target, (220, 220, 225), (0, stage_ground_y + 10, self.width, self.height - stage_ground_y), 0)
+        pygame.draw.line(target, (180, 180, 185), (0, stage_ground_y + 10), (self.width, stage_ground_y + 10), 2)
         
-        # Message
-        now = time.time()
-        if game_state.action_message and now - game_state.action_message_time < ACTION_MESSAGE_DURATION:
-            msg_rect = pygame.Rect(0, 0, 600, 60)
-            msg_rect.center = (self.width//2, 60)
-            self.draw_glass_panel(msg_rect)
-            self.draw_text(game_state.action_message, self.font, (20, 20, 20), msg_rect.center, False)
-            
-        # Towers
-        tower_x_positions = [self.width//4, self.width//2, 3*self.width//4]
+    def draw_held_disk(self, rect, disk):
+        # Shadow below disk (floating effect)
+        shadow_rect = rect.copy()
+        shadow_rect.y += 20
+        key = ("shadow", rect.size)
+        s_surf = self.disk_sprites.get(key)
+        if s_surf is None:
+            s_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+            pygame.draw.ellipse(s_surf, (0, 0, 0, 50), s_surf.get_rect())
+            s_surf = self.convert(s_surf)
+            self.disk_sprites.put(key, s_surf)
+        self.blit(s_surf, shadow_rect)
+        
+        self.draw_disk(rect, disk)
+        
+    def draw_pinch_cursor(self, pos, color):
+        # Drawn opaque like on the screen (the color's alpha was never applied)
+        color = tuple(color[:3])
+        sprite = self.cursor_sprites.get(color)
+        if sprite is None:
+            sprite = pygame.Surface((42, 42), pygame.SRCALPHA)
+            # Elegant thin circle
+            pygame.draw.circle(sprite, color, (21, 21), 20, 2)
+            # Center dot
+            pygame.draw.circle(sprite, color, (21, 21), 4)
+            sprite = self.convert(sprite)
+            self.cursor_sprites.put(color, sprite)
+        self.blit(sprite, (pos[0] - 21, pos[1] - 21))
+        
+    def draw_win_panel(self, win_panel):
+        self.draw_glass_panel(win_panel)
+        
+        self.draw_text("SUCCESS", self.title_font, (50, 150, 50), self.layout.win_title_center)
+        self.draw_text("Sequence Completed", self.font, (50, 50, 50), self.layout.win_subtitle_center)
+        self.draw_text("Press 'R' to Restart", self.small_font, (100, 100, 100), self.layout.win_hint_center)
+
+    def build_game_widgets(self, game_state):
+        # Each widget is (name, bounds, key, draw). The key captures everything
+        # the widget depends on, so unchanged widgets cost nothing.
+        widgets = []
+        layout = self.layout
+        stage_ground_y = layout.stage_ground_y
+        clock = game_state.clock
         
-        # Floor (Tabletop)
-        pygame.draw.rect(self.screen, (220, 220, 225), (0, stage_ground_y + 10, self.width, self.height - stage_ground_y), 0)
-        pygame.draw.line(self.screen, (180, 180, 185), (0, stage_ground_y + 10), (self.width, stage_ground_y + 10), 2)
+        # HUD Panel
+        hud_panel = layout.hud_panel
+        time_text = f"{game_state.elapsed_time:.1f}s"
+        moves_text = str(game_state.moves)
+        widgets.append(("hud", self.panel_bounds(hud_panel), (time_text, moves_text),
+                        lambda: self.draw_hud(hud_panel, time_text, moves_text)))
         
-        for i, x in enumerate(tower_x_positions):
-            self.draw_tower(x, stage_ground_y, game_state.towers[i])
+        # Message
+        if game_state.action_message and clock.time - game_state.action_message_time < ACTION_MESSAGE_DURATION:
+            msg_rect = layout.message_panel
+            message = game_state.action_message
+            widgets.append(("message", self.panel_bounds(msg_rect), (message, game_state.action_message_time),
+                            lambda: self.draw_message(msg_rect, message)))
             
-            # Label
-            lbl_center = (x, stage_ground_y + 40)
-            self.draw_text(f"POST {i+1}", self.font, COLOR_TEXT_DIM, lbl_center)
+        # Towers live in the board layer; they only report damage so the
+        # layer is re-shown where a stack changed
+        metrics = self.get_disk_metrics(game_state.num_disks)
+        tower_height, max_w, disk_h = metrics[1], metrics[2], metrics[4]
+        
+        for i, x in enumerate(layout.tower_x):
+            tower = game_state.towers[i]
+            bounds_w = int(max(TOWER_BASE_WIDTH, max_w)) + 2
+            bounds_top = stage_ground_y - max(tower_height, len(tower) * disk_h)
+            bounds = pygame.Rect(x - bounds_w//2, bounds_top, bounds_w, stage_ground_y + TOWER_BASE_HEIGHT - bounds_top)
+            # Any pickup/place changes the height or the top disk
+            key = (metrics[0], len(tower), tower[-1] if tower else 0)
+            widgets.append((f"tower{i}", bounds, key, None))
             
+        # Latest camera sample, drawn as is (it only changes once per frame)
+        hand_position = game_state.hand_position
+        
         # Held Disk
-        if game_state.disk_in_hand is not None and game_state.hand_position is not None:
-             hx, hy = game_state.hand_position
-             
-             disk_w = BASE_DISK_WIDTH - (game_state.disk_in_hand - 1) * 35
-             rect = pygame.Rect(0, 0, disk_w, DISK_HEIGHT)
-             rect.center = (hx, hy)
-             
-             # Shadow below disk (floating effect)
-             shadow_rect = rect.copy()
-             shadow_rect.y += 20
-             s_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-             pygame.draw.ellipse(s_surf, (0, 0, 0, 50), s_surf.get_rect())
-             self.screen.blit(s_surf, shadow_rect)
-             
-             color = DISK_COLORS[(game_state.disk_in_hand - 1) % len(DISK_COLORS)]
-             self.draw_metallic_disk(rect, color)
-             
-             # Label
-             lbl = self.small_font.render(str(game_state.disk_in_hand), True, (50, 50, 50))
-             self.screen.blit(lbl, lbl.get_rect(center=rect.center))
+        if game_state.disk_in_hand is not None and hand_position is not None:
+             disk = game_state.disk_in_hand
+             disk_w, disk_h = self.get_disk_size(disk, metrics)
+             rect = pygame.Rect(0, 0, disk_w, disk_h)
+             rect.center = hand_position
+             widgets.append(("held", rect.union(rect.move(0, 20)), (disk, rect.topleft, rect.size),
+                             lambda: self.draw_held_disk(rect, disk)))
              
         # Pinch
-        if game_state.hand_position is not None:
-             hx, hy = game_state.hand_position
+        if hand_position is not None:
+             pos = (int(hand_position[0]), int(hand_position[1]))
              color = game_state.pinch_indicator_color
-             # Elegant thin circle
-             pygame.draw.circle(self.screen, color, (int(hx), int(hy)), 20, 2)
-             # Center dot
-             pygame.draw.circle(self.screen, color, (int(hx), int(hy)), 4)
+             widgets.append(("cursor", pygame.Rect(pos[0] - 21, pos[1] - 21, 43, 43), (pos, color),
+                             lambda: self.draw_pinch_cursor(pos, color)))
 
         # Win
         if game_state.game_won:
              if random.random() < 0.2:
-                 self.spawn_particles(random.randint(0, self.width), 0, (255, 215, 0))
+                 self.particles.spawn(random.randint(0, self.width), 0)
                  
-             win_panel = pygame.Rect(0, 0, 500, 250)
-             win_panel.center = (self.width//2, self.height//2)
-             self.draw_glass_panel(win_panel)
-             
-             self.draw_text("SUCCESS", self.title_font, (50, 150, 50), (self.width//2, self.height//2 - 50))
-             self.draw_text("Sequence Completed", self.font, (50, 50, 50), (self.width//2, self.height//2 + 10))
-             self.draw_text("Press 'R' to Restart", self.small_font, (100, 100, 100), (self.width//2, self.height//2 + 60))
+             win_panel = layout.win_panel
+             widgets.append(("win", self.panel_bounds(win_panel), None, lambda: self.draw_win_panel(win_panel)))
 
-        self.update_particles(1/60)
-        self.draw_particles()
-        self.draw_camera_preview()
+        # Player name (split screen)
+        if self.player_label:
+            label = self.player_label
+            center = layout.player_label_center
+            widgets.append(("player", self.text_bounds(label, self.font, center), label,
+                            lambda: self.draw_text(label, self.font, COLOR_TEXT_DIM, center)))
 
+        self.particles.update(clock.frame_dt)
+        bounds = self.particles.bounds()
+        if bounds is not None:
+            # Particles move every frame
+            widgets.append(("particles", bounds, clock.frame_count, self.draw_particles))
+            
+        self.add_camera_widget(widgets)
+        self.add_debug_widget(widgets)
+        return widgets
 
-    def draw_play_screen(self, game_state):
-        self.create_background()
-        self.screen.blit(self.background_surface, (0,0))
+    def draw_particles(self):
+        if self.gpu:
+            for sprite, pos in self.particles.blit_sequence():
+                self.gpu.blit(sprite, pos)
+        else:
+            self.particles.draw(self.screen)
+
+    def get_play_layer(self):
+        # Background plus the title/instructions panel, once per window size
+        key = ("play", self.width, self.height)
+        if self.play_layer_key != key:
+            self.create_background()
+            layer = self.background_surface.copy()
+            self.draw_play_panel(layer)
+            self.play_layer = layer
+            self.play_layer_key = key
+        return self.play_layer
+
+    def build_play_widgets(self, game_state):
+        widgets = []
+        layout = self.layout
+        
+        # Center Panel is drawn in the play layer
+        
+        # Button
+        button_rect = layout.play_button
+        mouse_pos = pygame.mouse.get_pos()
+        hover = button_rect.collidepoint(mouse_pos)
+        widgets.append(("button", button_rect, hover, lambda: self.draw_play_button(button_rect, hover)))
         
-        # Center Panel
-        panel_rect = pygame.Rect(0, 0, 700, 500)
-        panel_rect.center = (self.width//2, self.height//2)
-        self.draw_glass_panel(panel_rect, 15)
+        # Difficulty
+        diff_bg = layout.difficulty_panel
+        left = self.text_bounds("<", self.font, layout.difficulty_left_center, False)
+        right = self.text_bounds(">", self.font, layout.difficulty_right_center, False)
+        num_disks = game_state.num_disks
+        widgets.append(("difficulty", self.panel_bounds(diff_bg).union(left).union(right), num_disks,
+                        lambda: self.draw_difficulty(num_disks)))
+        
+        # Startup progress
+        if self.startup_status:
+            status = self.startup_status
+            center = layout.startup_status_center
+            widgets.append(("status", self.text_bounds(status, self.small_font, center, False), status,
+                            lambda: self.draw_text(status, self.small_font, COLOR_TEXT_DIM, center, False)))
+        
+        self.add_camera_widget(widgets)
+        self.add_debug_widget(widgets)
+        return widgets
+        
+    def add_camera_widget(self, widgets):
+        if self.camera_feed_surface and self.camera_visible:
+            # A new camera frame arrives every tick
+            widgets.append(("camera", self.panel_bounds(self.layout.camera_panel), self.camera_frame_id,
+                            self.draw_camera_preview))
+
+    def add_debug_widget(self, widgets):
+        if self.debug_lines:
+            if self.debug_font is None:
+                self.debug_font = self.load_font('Consolas,Courier New,monospace', 14)
+            lines = tuple(self.debug_lines)
+            line_h = self.debug_font.get_linesize()
+            width = max(self.debug_font.size(line)[0] for line in lines) + 20
+            panel = pygame.Rect(0, 0, width, line_h * len(lines) + 16)
+            panel.bottomleft = self.layout.debug_anchor
+            widgets.append(("debug", self.panel_bounds(panel), lines, lambda: self.draw_debug(panel, lines, line_h)))
+            
+    def draw_debug(self, panel, lines, line_h):
+        self.draw_glass_panel(panel, 6)
+        for i, line in enumerate(lines):
+            self.blit(self.get_text_surface(line, self.debug_font, (20, 20, 20)), (panel.x + 10, panel.y + 8 + i * line_h))
+
+    def draw_play_panel(self, target):
+        layout = self.layout
+        self.draw_glass_panel(layout.play_panel, 15, target)
         
         # Title
-        self.draw_text("TOWER OF HANOI", self.title_font, (20, 20, 40), (self.width//2, panel_rect.top + 70))
-        self.draw_text("GESTURE CONTROL EDITION", self.font, (80, 80, 90), (self.width//2, panel_rect.top + 130))
+        self.draw_text("TOWER OF HANOI", self.title_font, (20, 20, 40), layout.play_title_center, target=target)
+        self.draw_text("GESTURE CONTROL EDITION", self.font, (80, 80, 90), layout.play_subtitle_center, target=target)
         
         # Line
-        pygame.draw.line(self.screen, (200, 200, 200), (panel_rect.left + 80, panel_rect.top + 160), (panel_rect.right - 80, panel_rect.top + 160), 1)
+        pygame.draw.line(target, (200, 200, 200), *layout.play_rule, 1)
         
         # Instructions
-        instr_y = panel_rect.top + 200
+        instr_y = layout.play_instructions_y
         lines = [
             "INSTRUCTIONS",
             "• Pinch thumb & index finger to grasp objects",
@@ -316,33 +763,145 @@ class GameRenderer:
         for i, line in enumerate(lines):
              fnt = self.font if i == 0 else self.small_font
              col = (20, 20, 20)
-             self.draw_text(line, fnt, col, (self.width//2, instr_y + i*35), shadow=False)
-        
-        # Button
-        self.play_button_rect.center = (self.width//2, panel_rect.bottom - 110)
-        mouse_pos = pygame.mouse.get_pos()
-        hover = self.play_button_rect.collidepoint(mouse_pos)
-        
-        btn_col = (50, 100, 200) if hover else (70, 70, 80)
-        pygame.draw.rect(self.screen, btn_col, self.play_button_rect, border_radius=30)
-        self.draw_text("START SIMULATION", self.font, (255, 255, 255), self.play_button_rect.center, shadow=False)
-        
-        # Difficulty
-        diff_y = panel_rect.bottom - 45
-        diff_bg = pygame.Rect(0, 0, 260, 40)
-        diff_bg.center = (self.width//2, diff_y)
+             self.draw_text(line, fnt, col, (layout.play_panel.centerx, instr_y + i*35), shadow=False, target=target)
+        
+    def draw_play_button(self, button_rect, hover):
+        key = ("button", button_rect.size, hover)
+        sprite = self.panel_cache.get(key)
+        if sprite is None:
+            sprite = pygame.Surface(button_rect.size, pygame.SRCALPHA)
+            btn_col = (50, 100, 200) if hover else (70, 70, 80)
+            pygame.draw.rect(sprite, btn_col, sprite.get_rect(), border_radius=30)
+            self.draw_text("START SIMULATION", self.font, (255, 255, 255), sprite.get_rect().center, shadow=False, target=sprite)
+            sprite = self.convert(sprite)
+            self.panel_cache.put(key, sprite)
+        self.blit(sprite, button_rect)
+        
+    def draw_difficulty(self, num_disks):
+        diff_bg = self.layout.difficulty_panel
         self.draw_glass_panel(diff_bg, 20)
         
-        self.draw_text(f"Disks: {game_state.num_disks}", self.small_font, (20, 20, 20), diff_bg.center, False)
-        self.draw_text("<", self.font, (50, 50, 50), (diff_bg.left - 20, diff_y - 2), False)
-        self.draw_text(">", self.font, (50, 50, 50), (diff_bg.right + 20, diff_y - 2), False)
-        
-        self.draw_camera_preview()
+        self.draw_text(f"Disks: {num_disks}", self.small_font, (20, 20, 20), diff_bg.center, False)
+        self.draw_text("<", self.font, (50, 50, 50), self.layout.difficulty_left_center, False)
+        self.draw_text(">", self.font, (50, 50, 50), self.layout.difficulty_right_center, False)
+        
+    def merge_rects(self, rects):
+        # Overlapping damage is merged so each pixel is restored once
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen.get_rect())
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            i = 0
+            while i < len(merged):
+                if merged[i].colliderect(rect):
+                    rect = rect.union(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
+        
+    def composite(self, widgets, base_layer):
+        # Damage tracking: a widget is dirty if its key or bounds changed, and
+        # both its old and new bounds need repainting. Widgets without a draw
+        # function are regions of the base layer that only report damage.
+        # Returns the repainted rects, or None after a full redraw.
+        current = {}
+        damage = []
+        for name, bounds, key, _ in widgets:
+            current[name] = (bounds, key)
+            previous = self.widget_state.get(name)
+            if previous is None:
+                damage.append(bounds)
+            elif previous[1] != key or previous[0] != bounds:
+                damage.append(previous[0])
+                damage.append(bounds)
+        for name, (bounds, _) in self.widget_state.items():
+            if name not in current:
+                damage.append(bounds)
+        self.widget_state = current
+        
+        if self.full_redraw:
+            self.screen.blit(base_layer, (0, 0))
+            for _, _, _, draw in widgets:
+                if draw is not None:
+                    draw()
+            self.full_redraw = False
+            return None
+        
+        damage = self.merge_rects(damage)
+        for rect in damage:
+            # Restore the base layer, then repaint every widget touching the
+            # rect in z-order, clipped so untouched pixels are left alone
+            self.screen.set_clip(rect)
+            self.screen.blit(base_layer, rect, rect)
+            for _, bounds, _, draw in widgets:
+                if draw is not None and bounds.colliderect(rect):
+                    draw()
+        self.screen.set_clip(None)
+        return damage
+        
+    def present(self, damage):
+        # None means the whole screen was redrawn
+        if damage is None:
+            pygame.display.flip()
+        elif damage:
+            pygame.display.update(damage)
         
     def render(self, game_state):
+        screen_name = "play" if game_state.show_play_screen else "game"
+        if screen_name != self.current_screen:
+            # Screen transitions repaint everything
+            self.current_screen = screen_name
+            self.full_redraw = True
+            
+        # Layers: cached static/board scene + per-frame dynamic widgets
+        self.create_background()
         if game_state.show_play_screen:
-            self.draw_play_screen(game_state)
+            widgets = self.build_play_widgets(game_state)
+            base_layer = self.get_play_layer()
+            base_key = self.play_layer_key
+        else:
+            widgets = self.build_game_widgets(game_state)
+            base_layer = self.get_board_layer(game_state, self.get_disk_metrics(game_state.num_disks))
+            base_key = self.board_layer_key
+            
+        if self.gpu:
+            # Textures are cheap to recomposite, so every frame is a full one
+            self.gpu.begin(base_layer, base_key)
+            for _, _, _, draw in widgets:
+                if draw is not None:
+                    draw()
+            self.gpu.present()
         else:
-            self.draw_game_screen(game_state)
+            self.present(self.composite(widgets, base_layer))
+            for view in self.views:
+                view["full_redraw"] = True # The window covered the split screen
             
-        pygame.display.flip()
+    def render_split(self, games):
+        # All players' boards in one pass and one display update
+        if self.current_screen is not None:
+            # Coming from the full-window play screen
+            self.current_screen = None
+            for view in self.views:
+                view["full_redraw"] = True
+        
+        damage = []
+        debug_lines = self.debug_lines
+        for i, (view, game_state) in enumerate(zip(self.views, games)):
+            view["debug_lines"] = debug_lines if i == 0 else None
+            self.swap_view(view)
+            try:
+                self.create_background()
+                widgets = self.build_game_widgets(game_state)
+                base_layer = self.get_board_layer(game_state, self.get_disk_metrics(game_state.num_disks))
+                rects = self.composite(widgets, base_layer)
+            finally:
+                self.swap_view(view)
+            offset = view["screen"].get_offset()
+            if rects is None:
+                rects = [view["screen"].get_rect()]
+            damage.extend(rect.move(offset) for rect in rects)
+        if damage:
+            pygame.display.update(damage)